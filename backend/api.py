@@ -15,6 +15,7 @@ from fastapi.responses import RedirectResponse
 
 from backend.routes.breed import breed_router
 from backend.routes.case import case_router
+from backend.routes.search import search_router
 from backend.routes.sex import sex_router
 from backend.routes.species import species_router
 
@@ -32,6 +33,7 @@ tags_metadata = [
         "description": "Read-only endpoints for animal-related reference data (species, breeds, sex).",
     },
     {"name": "Cases", "description": "Endpoints for clinical case management."},
+    {"name": "Search", "description": "Endpoints reporting on the fuzzy case search."},
     {"name": "Panels", "description": "Endpoints to create and manipulate laboratory panels and measurements."},
     {"name": "Analysis", "description": "Endpoints for analysis management."},
 ]
@@ -51,6 +53,7 @@ api_router.include_router(breed_router, prefix="/breed", tags=["Animal Informati
 api_router.include_router(sex_router, prefix="/sex", tags=["Animal Information"])
 api_router.include_router(species_router, prefix="/species", tags=["Animal Information"])
 api_router.include_router(case_router, prefix="/case", tags=["Cases"])
+api_router.include_router(search_router, prefix="/search", tags=["Search"])
 
 #######################################################################################################################
 # End of file
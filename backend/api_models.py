@@ -5,9 +5,17 @@ API (Pydantic) models for the backend.
 Contains all SQLModel/Pydantic models NOT using table=True, for API schemas and validation.
 """
 
+from datetime import date, datetime
+from typing import Literal
+
 from sqlmodel import Field, SQLModel
 
-from database.core.models import Breed, Sex
+from database.core.models import Breed, Sex, Species
+
+DEFAULT_FUZZY_LIMIT = 50  # Number of matches returned by a fuzzy search when no limit is given
+MAX_PAGE_SIZE = 1000  # Largest limit a client may ask for
+NEXT_CURSOR_HEADER = "X-Next-Cursor"  # Response header holding the cursor of the next page of a listing
+MAX_BULK_ITEMS = 10_000  # Largest number of items a client may send in one bulk request
 
 
 # Case API models
@@ -38,6 +46,109 @@ class CaseRead(CaseBase):
     breed: Breed | None = Field(default=None, description="Breed object.")
 
 
+class CaseMatch(SQLModel):
+    """Details of how a case matched a fuzzy search."""
+
+    score: float = Field(..., description="Match score, from 0 to 100.")
+    field: Literal["name", "owner", "notes", "breed"] = Field(..., description="The field that matched best.")
+
+
+class CaseListItem(CaseRead):
+    """Fields for a case in a list of cases from the API."""
+
+    match: CaseMatch | None = Field(default=None, description="Fuzzy match details, only set for fuzzy searches.")
+
+
+class CaseListCompactItem(CaseBase):
+    """Fields for a case in a compact list of cases, which names its breed by breed_id only."""
+
+    id: int = Field(..., description="Case ID.")
+    match: CaseMatch | None = Field(default=None, description="Fuzzy match details, only present for fuzzy searches.")
+
+
+class CaseListCompact(SQLModel):
+    """A list of cases with each of their breeds given once, for shape=compact."""
+
+    cases: list[CaseListCompactItem] = Field(..., description="The cases, in list order.")
+    breeds: dict[int, Breed] = Field(..., description="The breed of each breed_id of the cases.")
+
+
+class CaseListColumns(SQLModel):
+    """A list of cases as an array per field, with each of their breeds given once, for shape=columns."""
+
+    cases: dict[str, list] = Field(
+        ..., description="The values of each CaseListCompactItem field, with an element per case in list order."
+    )
+    breeds: dict[int, Breed] = Field(..., description="The breed of each breed_id of the cases.")
+
+
+class CaseListQuery(SQLModel):
+    """Query parameters for listing cases via the API."""
+
+    fuzzy_match: str | None = Field(
+        default=None, description="Fuzzy search string to match against case name, owner, notes, or breed."
+    )
+    min_match_score: int | None = Field(
+        default=60, description="Cutoff matching score below which fuzzy matching does not report a case."
+    )
+    limit: int | None = Field(
+        default=None,
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description=f"Maximum number of cases to return. Fuzzy searches return {DEFAULT_FUZZY_LIMIT} by default.",
+    )
+    offset: int = Field(default=0, ge=0, description="Number of cases (or best fuzzy matches) to skip.")
+    sort: Literal["id", "name", "create_date", "birth_date"] = Field(
+        default="id", description="Field to sort cases by, ties in ID order. Ignored by fuzzy searches."
+    )
+    cursor: str | None = Field(
+        default=None,
+        description=f"Cursor of the page to return, from the {NEXT_CURSOR_HEADER} header of the previous page. "
+        "Cannot be combined with fuzzy_match.",
+    )
+    species: Species | None = Field(default=None, description="Only list cases of a breed of this species.")
+    breed_id: int | None = Field(default=None, description="Only list cases of this breed.")
+    sex: Sex | None = Field(default=None, description="Only list cases of this sex.")
+    owner: str | None = Field(default=None, description="Only list cases of this owner (exact match).")
+    created_from: date | None = Field(default=None, description="Only list cases created on or after this date.")
+    created_to: date | None = Field(default=None, description="Only list cases created on or before this date.")
+    born_from: date | None = Field(default=None, description="Only list cases born on or after this date.")
+    born_to: date | None = Field(default=None, description="Only list cases born on or before this date.")
+    fields: str | None = Field(
+        default=None,
+        description="Comma-separated case fields to return, such as name,owner. The id is always returned. All fields "
+        "by default.",
+    )
+    include: str | None = Field(
+        default=None,
+        description="Comma-separated relationships to return with each case: breed, the default, or none if empty.",
+    )
+    shape: Literal["full", "compact", "columns"] = Field(
+        default="full",
+        description="Shape of the response: a CaseListItem per case with its breed, a CaseListCompact with each breed "
+        "given once, or a CaseListColumns with an array per field.",
+    )
+
+
+# Search API models
+class SearchStatus(SQLModel):
+    """Readiness of the fuzzy search index."""
+
+    ready: bool = Field(..., description="True once a valid search index is loaded.")
+    cases: int = Field(..., description="Number of cases in the search index.")
+    generation: int = Field(..., description="Number of times the index has been rebuilt or loaded from a snapshot.")
+    rebuilt_at: datetime | None = Field(default=None, description="When the database was read for the current index.")
+    rebuild_seconds: float | None = Field(default=None, description="Time taken to build or load the current index.")
+    data_version: int | None = Field(
+        default=None, description="Database data version the index is up to date with, or None if it may be stale."
+    )
+    lag_seconds: float | None = Field(
+        default=None,
+        description="Time the last write took from commit to being searchable. For writes by other processes, found "
+        "by polling the data version, an upper bound measured from the last poll that found the index up to date.",
+    )
+
+
 class CaseUpdate(SQLModel):
     """Fields for updating a case via the API."""
 
@@ -52,6 +163,72 @@ class CaseUpdate(SQLModel):
     breed_id: int | None = Field(default=None, description="ID of the breed.")
 
 
+class CaseBulkUpdate(CaseUpdate):
+    """Fields for updating one case of a bulk update via the API."""
+
+    id: int = Field(..., description="Case ID.")
+
+
+class BulkResult(SQLModel):
+    """Outcome of one item of a bulk request."""
+
+    index: int = Field(..., description="Position of the item in the request.")
+    id: int | None = Field(default=None, description="Case ID, or None if the case was not created.")
+    status: int = Field(..., description="HTTP status of the item: 201, 200 or 204 on success, otherwise 404 or 422.")
+    detail: str | None = Field(default=None, description="Why the item failed, or None if it succeeded.")
+
+
+class CaseBatch(SQLModel):
+    """Cases fetched by ID, with the IDs of no case."""
+
+    cases: list[CaseRead] = Field(..., description="The cases found, in the order of the requested IDs.")
+    missing: list[int] = Field(..., description="The requested IDs of no case, in request order.")
+
+
+class ImportRowError(SQLModel):
+    """Why a row of an imported file was rejected."""
+
+    row: int = Field(..., description="Number of the row in the file, from 1, not counting the CSV header.")
+    detail: str = Field(..., description="The validation errors of the row.")
+
+
+class ImportResult(SQLModel):
+    """Outcome and throughput of a case import."""
+
+    rows: int = Field(..., description="Number of the last row read, including any skipped with start_row.")
+    imported: int = Field(..., description="Number of cases created.")
+    rejected: int = Field(..., description="Number of rows that failed validation.")
+    errors: list[ImportRowError] = Field(..., description="The first rejected rows and why they were rejected.")
+    seconds: float = Field(..., description="Time taken by the import.")
+    rows_per_second: float = Field(..., description="Rows read per second, valid or not.")
+
+
+# Breed API models
+class BreedResolveRequest(SQLModel):
+    """Free-text breed names to resolve to breeds."""
+
+    names: list[str] = Field(..., max_length=MAX_BULK_ITEMS, description="Free-text breed names, such as 'lab'.")
+    species: Species | None = Field(default=None, description="Only match breeds of this species.")
+
+
+class BreedCandidate(SQLModel):
+    """A breed matching a free-text breed name."""
+
+    breed_id: int = Field(..., description="Breed ID.")
+    name: str = Field(..., description="Breed name.")
+    score: float = Field(..., description="Match score, from 0 to 100.")
+
+
+class BreedResolution(SQLModel):
+    """The closest breeds to a free-text breed name."""
+
+    query: str = Field(..., description="The free-text breed name, as sent.")
+    breed_id: int | None = Field(default=None, description="ID of the closest breed, or None if there are no breeds.")
+    name: str | None = Field(default=None, description="Name of the closest breed.")
+    score: float | None = Field(default=None, description="Match score of the closest breed, from 0 to 100.")
+    runner_up: BreedCandidate | None = Field(default=None, description="The next closest breed.")
+
+
 #######################################################################################################################
 # End of file
 #######################################################################################################################
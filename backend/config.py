@@ -3,13 +3,16 @@
 Configuration module for backend.
 
 Defines the Config class for application settings using Pydantic's BaseSettings.
-Loads DATABASE_URL from environment or uses a default SQLite database.
+Loads DATABASE_URL from environment or uses a default SQLite database, and the case search backend and tuning settings.
 """
 
 #######################################################################################################################
 # Imports
 #######################################################################################################################
 
+from typing import Literal
+
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 #######################################################################################################################
@@ -29,10 +32,27 @@ class Config(BaseSettings):
     ----------
         DATABASE_URL (str): Database connection string. Loaded from the DATABASE_URL environment variable or
                             defaults to SQLite file.
+        SEARCH_BACKEND (str): Case search backend, "fuzzy" (the default) for the in-memory rapidfuzz index or "fts"
+                            for the SQLite FTS5 trigram table (see services/search.py). The table is created and
+                            filled when the "fts" backend first starts on a database, and kept from then on.
+        FUZZY_SHARDS (int): Number of worker processes the fuzzy search index is split across. 1 (the default)
+                            keeps the index in the application process.
+        FUZZY_SNAPSHOT_PATH (str | None): File the fuzzy search index is saved to after each full rebuild and
+                            loaded from at start-up. None disables snapshots.
+        FUZZY_MIN_GRAM_OVERLAP (float): Fraction of a query's character trigrams a case must share to be scored by
+                            the fuzzy search index. 0 (the default) scores every case. Above 0, queries are several
+                            times faster but miss weak matches: rapidfuzz's WRatio scores many strings that share few
+                            trigrams with the query above the default cutoff of 60. With 100,000 synthetic cases, 0.2
+                            finds about 78% of the matches scoring 60 or more, 99% of those scoring 75 or more and all
+                            of those scoring 90 or more, 5x faster (see benchmarks/fuzzy_prefilter.py).
 
     """
 
     DATABASE_URL: str = "sqlite:///./database/app.db"
+    SEARCH_BACKEND: Literal["fuzzy", "fts"] = "fuzzy"
+    FUZZY_SHARDS: int = 1
+    FUZZY_SNAPSHOT_PATH: str | None = "./database/fuzzy_index.snapshot"
+    FUZZY_MIN_GRAM_OVERLAP: float = Field(default=0.0, ge=0, le=1)
 
 
 config = Config()
@@ -0,0 +1,124 @@
+#######################################################################################################################
+"""
+MessagePack content negotiation for the API routes.
+
+JSON is the default. Clients that send Accept: application/msgpack get MessagePack responses, encoded from the same
+response models, and can send request bodies as MessagePack with Content-Type: application/msgpack:
+
+- accepts_msgpack:
+    Tells whether a request's Accept header prefers MessagePack to JSON.
+- MsgPackResponse:
+    Response encoding its content with msgpack.
+- negotiated_response:
+    Encodes content as MessagePack or JSON, for endpoints that build their own response.
+- MsgPackRoute:
+    APIRoute class of the API routers. It reads MessagePack request bodies as FastAPI reads JSON ones, and answers with
+    a MsgPackResponse when the client accepts MessagePack. Error responses, such as validation errors, stay JSON.
+"""
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = {MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+def _media_type(value: str) -> str:
+    """Return the media type of a Content-Type or Accept header item, without its parameters, in lower case."""
+    return value.split(";", 1)[0].strip().lower()
+
+
+def accepts_msgpack(request: Request) -> bool:
+    """Return True if a request's Accept header prefers MessagePack to JSON. Equal preferences go to MessagePack."""
+    qualities = {}
+    for item in request.headers.get("accept", "").split(","):
+        quality = 1.0
+        for parameter in item.split(";")[1:]:
+            name, _, value = parameter.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[_media_type(item)] = quality
+    msgpack_quality = max(qualities.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+    return msgpack_quality > 0 and msgpack_quality >= qualities.get("application/json", 0.0)
+
+
+class MsgPackResponse(Response):
+    """Response whose content is encoded with MessagePack."""
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        """Encode the content, which must already be in JSON form, as FastAPI passes it to a response class."""
+        return msgpack.packb(content)
+
+
+def negotiated_response(request: Request, content: Any, headers: dict[str, str] | None = None) -> Response:
+    """Return content encoded as MessagePack if the client prefers it, otherwise as JSON with orjson."""
+    response_class = MsgPackResponse if accepts_msgpack(request) else ORJSONResponse
+    return response_class(content, headers={**(headers or {}), "Vary": "Accept"})
+
+
+class _MsgPackRequest(Request):
+    """A request with a MessagePack body, presented to FastAPI as a JSON body that json() decodes."""
+
+    @classmethod
+    def of(cls, request: Request) -> "_MsgPackRequest":
+        """Return a MessagePack request reading the body of a request, with its Content-Type set to JSON."""
+        headers = [(name, value) for name, value in request.scope["headers"] if name != b"content-type"]
+        scope = {**request.scope, "headers": [*headers, (b"content-type", b"application/json")]}
+        return cls(scope, request.receive)
+
+    async def json(self) -> Any:
+        """Decode the body from MessagePack."""
+        if not hasattr(self, "_json"):
+            self._json = msgpack.unpackb(await self.body())
+        return self._json
+
+
+class MsgPackRoute(APIRoute):
+    """API route negotiating MessagePack request and response bodies."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        """Return a handler choosing between a JSON and a MessagePack request handler by the Accept header."""
+        json_handler = super().get_route_handler()
+        response_class = self.response_class
+        self.response_class = MsgPackResponse
+        try:
+            msgpack_handler = super().get_route_handler()
+        finally:
+            self.response_class = response_class
+
+        async def handler(request: Request) -> Response:
+            if _media_type(request.headers.get("content-type", "")) in MSGPACK_MEDIA_TYPES:
+                request = _MsgPackRequest.of(request)
+            response = await (msgpack_handler if accepts_msgpack(request) else json_handler)(request)
+            if "vary" not in response.headers:
+                response.headers["Vary"] = "Accept"
+            return response
+
+        return handler
+
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
@@ -0,0 +1,128 @@
+#######################################################################################################################
+"""
+Precomputed responses for the reference data endpoints.
+
+Species, sexes and breeds change only when the application is deployed or breeds are seeded, yet the frontend asks for
+them on every view. Their JSON is therefore serialised once and served as stored bytes with a strong ETag, so that
+browsers can cache them and revalidate with If-None-Match for a 304 Not Modified. Each is also kept encoded as
+MessagePack, with its own ETag, for clients that accept it (see backend/negotiation.py):
+
+- CachedJson, cache_json:
+    Serialised JSON and MessagePack bytes and their ETags.
+- cached_response:
+    Answers a request from a CachedJson in the encoding it accepts, with 304 if the client already has it.
+- SPECIES_JSON, SEX_JSON:
+    The species and sexes, serialised when the module is imported.
+- breeds_json:
+    All breeds, or the breeds of one species, serialised on first use and kept until the breed catalog
+    (services.breeds.breed_catalog) reloads, which it does when breeds change.
+"""
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import hashlib
+import json
+import threading
+from typing import Any, ClassVar, NamedTuple
+
+import msgpack
+from fastapi import Request, Response, status
+
+from backend.negotiation import MSGPACK_MEDIA_TYPE, accepts_msgpack
+from database.core.models import Sex, Species
+from services.breeds import BreedSnapshot, breed_catalog
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+REFERENCE_CACHE_CONTROL = "public, max-age=86400"  # Browsers reuse reference data for a day before revalidating
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+def _etag(body: bytes) -> str:
+    """Return a strong ETag for a response body, from a hash of its bytes."""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+class CachedJson(NamedTuple):
+    """A serialised JSON response body, the same content encoded as MessagePack, and their strong ETags."""
+
+    body: bytes
+    etag: str
+    packed: bytes
+    packed_etag: str
+
+
+def cache_json(content: Any) -> CachedJson:
+    """Serialise JSON content as FastAPI's JSONResponse does, and as MessagePack, and tag each with a hash of it."""
+    body = json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+    packed = msgpack.packb(content)
+    return CachedJson(body, _etag(body), packed, _etag(packed))
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    """Return True if an If-None-Match header names an ETag, comparing weakly as RFC 9110 requires."""
+    if if_none_match is None:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def cached_response(request: Request, cached: CachedJson) -> Response:
+    """
+    Answer a request with a precomputed body, in MessagePack if the client prefers it and otherwise in JSON.
+
+    Args:
+    ----
+        request (Request): The request, whose Accept and If-None-Match headers are checked.
+        cached (CachedJson): The bodies to send and their ETags.
+
+    Returns:
+    -------
+        Response: 304 Not Modified without a body if the client has the current ETag, otherwise the body.
+
+    """
+    if accepts_msgpack(request):
+        body, etag, media_type = cached.packed, cached.packed_etag, MSGPACK_MEDIA_TYPE
+    else:
+        body, etag, media_type = cached.body, cached.etag, "application/json"
+    headers = {"ETag": etag, "Cache-Control": REFERENCE_CACHE_CONTROL, "Vary": "Accept"}
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(body, media_type=media_type, headers=headers)
+
+
+SPECIES_JSON = cache_json([species.value for species in Species])
+SEX_JSON = cache_json([sex.value for sex in Sex])
+
+
+class _BreedBodies:
+    """The serialised breed lists of one breed catalog snapshot, by species filter."""
+
+    lock: ClassVar[threading.Lock] = threading.Lock()
+    snapshot: ClassVar[BreedSnapshot | None] = None
+    bodies: ClassVar[dict[Species | None, CachedJson]] = {}
+
+
+def breeds_json(species: Species | None = None) -> CachedJson:
+    """Return the serialised breeds, in name order, of one species or of all species if species is None."""
+    snapshot = breed_catalog.snapshot()
+    with _BreedBodies.lock:
+        if _BreedBodies.snapshot is not snapshot:
+            _BreedBodies.snapshot, _BreedBodies.bodies = snapshot, {}
+        bodies = _BreedBodies.bodies
+        if species not in bodies:
+            breeds = [breed for breed in snapshot.breeds if species is None or breed.species == species]
+            bodies[species] = cache_json([breed.model_dump(mode="json") for breed in breeds])
+        return bodies[species]
+
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
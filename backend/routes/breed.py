@@ -5,7 +5,14 @@ Breed API routes for backend.
 This module defines endpoints for retrieving breed data:
 
 - GET /breeds/:
-    List all breeds. Supports optional filtering by species via the 'species' query parameter.
+    List all breeds. Supports optional filtering by species via the 'species' query parameter. Served from JSON
+    serialised once per species and breed catalog load, with an ETag and Cache-Control (see backend/reference.py).
+- GET /breeds/suggest:
+    Suggest breeds for a partly typed breed name, for autocompletion, from an in-memory prefix index of the breed names.
+- POST /breeds/resolve:
+    Resolve a batch of free-text breed names to the closest breeds, with their match score and the runner-up.
+- GET /breeds/export:
+    Stream every breed as newline-delimited JSON, CSV or Apache Parquet.
 - GET /breeds/{breed_id}:
     Retrieve a single breed by its ID. Supports optional filtering by species via the 'species' query parameter.
 - GET /breeds/by_name/{breed_name}:
@@ -18,17 +25,25 @@ All endpoints use SQLModel for ORM access and FastAPI dependency injection for d
 # Imports
 #######################################################################################################################
 
-from fastapi import APIRouter, Depends, Path, Query
-from sqlmodel import Session, select
+from typing import Literal
 
+from fastapi import APIRouter, Depends, Path, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
+
+from backend.api_models import BreedCandidate, BreedResolution, BreedResolveRequest
+from backend.negotiation import MsgPackRoute
+from backend.reference import breeds_json, cached_response
 from database.core.models import Breed, Species
 from database.core.session import get_session
+from services.breeds import DEFAULT_SUGGESTIONS, breed_catalog
+from services.export import MEDIA_TYPES, export
 
 #######################################################################################################################
 # Globals
 #######################################################################################################################
 
-breed_router = APIRouter()
+breed_router = APIRouter(route_class=MsgPackRoute)
 
 #######################################################################################################################
 # Body
@@ -38,29 +53,108 @@ breed_router = APIRouter()
 @breed_router.get(
     "",  # Explicitly set path to /breeds/
     summary="List all breeds",
-    description="List all breeds, optionally filtered by species.",
+    description="List all breeds, optionally filtered by species. The response has a strong ETag and can be cached; "
+    "send it back in If-None-Match to get 304 Not Modified if the breeds have not changed.",
+    response_model=list[Breed],
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "The breeds have not changed"}},
 )
 def list_breeds(
+    request: Request,
     species: Species | None = Query(None, description="Filter by species"),
-    session: Session = Depends(get_session),
-) -> list[Breed]:
+) -> Response:
     """
     List all breeds, optionally filtered by species.
 
     Args:
     ----
+        request (Request): The request, for its If-None-Match header.
         species (Species | None): Optional species filter.
-        session (Session): Database session.
 
     Returns:
     -------
-        list[Breed]: List of breeds.
+        Response: The breeds in name order, as JSON, or 304 Not Modified.
+
+    """
+    return cached_response(request, breeds_json(species))
+
+
+@breed_router.get(
+    "/suggest",
+    summary="Suggest breeds for a partly typed name",
+    description="Suggest breeds for a partly typed breed name, ignoring case and punctuation. Breeds whose name starts "
+    "with the query come first, then breeds with a later word starting with it, each in name order and with score "
+    "100. If no breed name has a word starting with the query, the closest breeds by fuzzy match are suggested.",
+)
+def suggest_breeds(
+    q: str = Query("", description="Partly typed breed name."),
+    species: Species | None = Query(None, description="Only suggest breeds of this species."),
+    limit: int = Query(DEFAULT_SUGGESTIONS, ge=1, le=100, description="Maximum number of breeds to suggest."),
+) -> list[BreedCandidate]:
+    """
+    Suggest breeds for a partly typed breed name.
+
+    Args:
+    ----
+        q (str): Partly typed breed name.
+        species (Species | None): Optional species filter.
+        limit (int): Maximum number of breeds to suggest.
+
+    Returns:
+    -------
+        list[BreedCandidate]: The suggested breeds, best first.
 
     """
-    query = select(Breed).order_by(Breed.name)
-    if species:
-        query = query.where(Breed.species == species)
-    return list(session.exec(query).all())
+    return [BreedCandidate(**match._asdict()) for match in breed_catalog.suggest(q, species, limit)]
+
+
+@breed_router.post(
+    "/resolve",
+    summary="Resolve free-text breed names",
+    description="Find the closest breed to each of a batch of free-text breed names, such as 'lab' or 'G. Shepherd', "
+    "optionally only among the breeds of one species. Names are compared ignoring case and punctuation. Each name gets "
+    "the closest breed, its match score from 0 to 100 and the runner-up, in the order of the names.",
+)
+def resolve_breeds(request: BreedResolveRequest) -> list[BreedResolution]:
+    """
+    Resolve a batch of free-text breed names to the closest breeds.
+
+    Args:
+    ----
+        request (BreedResolveRequest): The names, and the species to match them against.
+
+    Returns:
+    -------
+        list[BreedResolution]: The closest breed and runner-up of each name.
+
+    """
+    resolutions = breed_catalog.resolve(request.names, request.species)
+    return [
+        BreedResolution(
+            query=query,
+            **({} if best is None else best._asdict()),
+            runner_up=None if runner_up is None else BreedCandidate(**runner_up._asdict()),
+        )
+        for query, (best, runner_up) in zip(request.names, resolutions, strict=True)
+    ]
+
+
+@breed_router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export all breeds",
+    description="Stream every breed, in ID order, as newline-delimited JSON (one object per line), CSV or Apache "
+    "Parquet.",
+    responses={status.HTTP_200_OK: {"content": {media_type: {} for media_type in MEDIA_TYPES.values()}}},
+)
+def export_breeds(
+    format: Literal["ndjson", "csv", "parquet"] = Query(default="ndjson", description="File format of the export."),
+):
+    """Stream every breed as newline-delimited JSON, CSV or Apache Parquet."""
+    return StreamingResponse(
+        export("breeds", format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="breeds.{format}"'},
+    )
 
 
 @breed_router.get(
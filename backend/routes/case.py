@@ -7,34 +7,91 @@ This module defines endpoints for creating, retrieving, updating, and deleting c
 - POST /case/:
     Create a new case. Accepts a CaseCreate payload and returns the created case.
 - GET /case/:
-    List all cases. Returns a list of CaseRead objects.
+    List all cases, or the best matches of a fuzzy search, a page at a time. Returns a list of CaseListItem objects, or
+    503 for a fuzzy search while the search index is still loading. Plain listings can be filtered by species, breed,
+    sex, owner and creation and birth date ranges, are sorted by id, name, create_date or birth_date and are paged with
+    an opaque cursor: when more cases follow, the X-Next-Cursor response header holds the cursor of the next page. The
+    list is built from row tuples of the case columns, without validating a model per case, and encoded with orjson to
+    the same bytes as a CaseListItem response_model. The opt-in shape=compact and shape=columns give each breed once for
+    the page instead of in every case, and shape=columns gives the cases as an array per field. The fields and include
+    parameters pick the case fields and relationships returned, and only the columns of those are read.
+- GET /case/export:
+    Stream every case, with its breed name, as newline-delimited JSON, CSV or Apache Parquet.
+- POST /case/bulk, PATCH /case/bulk, DELETE /case/bulk:
+    Create, update or delete a batch of cases in one transaction. Returns a BulkResult per item, in request order:
+    items naming a missing case or breed fail on their own with 404 or 422, and the rest are written.
+- POST /case/batch:
+    Retrieve the cases of a list of IDs, in chunked IN queries with one breed lookup. Returns a CaseBatch with the cases
+    in request order and the IDs of no case; fields and include work as for GET /case/{case_id}.
+- POST /case/import:
+    Import the cases of a CSV or newline-delimited JSON file sent as the request body, a chunk of rows per transaction.
+    Returns an ImportResult with the rows rejected and the import throughput.
 - GET /case/{case_id}:
-    Retrieve a single case by its ID. Returns a CaseRead object or 404 if not found.
+    Retrieve a single case by its ID. Returns a CaseRead object, or the fields and relationships asked for with fields
+    and include, or 404 if not found.
 - PUT /case/{case_id}:
     Update an existing case by its ID. Accepts a CaseUpdate payload and returns the updated case, or 404 if not found.
 - DELETE /case/{case_id}:
     Delete a case by its ID. Returns 204 on success or 404 if not found.
 
-All endpoints use SQLModel for ORM access and FastAPI dependency injection for database sessions.
+All endpoints use SQLModel for ORM access and FastAPI dependency injection for database sessions. Cases are returned
+with their breed looked up in the in-memory breed catalog (services.breeds) instead of loaded with a second query.
 """
 
 #######################################################################################################################
 # Imports
 #######################################################################################################################
 
-from fastapi import APIRouter, Depends, Query, status
-from sqlmodel import Session
+import tempfile
+from collections.abc import Iterable
+from typing import Annotated, Literal, NamedTuple
 
-from backend.api_models import CaseCreate, CaseRead, CaseUpdate
-from database.core.models import Case
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import literal_column
+from sqlmodel import Session, func, select
+
+from backend.api_models import (
+    DEFAULT_FUZZY_LIMIT,
+    MAX_BULK_ITEMS,
+    NEXT_CURSOR_HEADER,
+    BulkResult,
+    CaseBatch,
+    CaseBulkUpdate,
+    CaseCreate,
+    CaseListColumns,
+    CaseListCompact,
+    CaseListItem,
+    CaseListQuery,
+    CaseMatch,
+    CaseRead,
+    CaseUpdate,
+    ImportResult,
+)
+from backend.negotiation import MsgPackRoute, negotiated_response
+from database.core.helpers import decode_cursor, encode_cursor
+from database.core.models import Breed, Case
 from database.core.session import get_session
-from services.fuzzy import fuzzy_match_service
+from services.breeds import breed_catalog
+from services.export import MEDIA_TYPES, export
+from services.importer import IMPORT_MEDIA_TYPES, ImportInterruptedError, import_cases
+from services.search import search_service
 
 #######################################################################################################################
 # Globals
 #######################################################################################################################
 
-case_router = APIRouter()
+case_router = APIRouter(route_class=MsgPackRoute)
+
+RANGE_LIKELIHOOD = "0.01"  # Fraction of cases SQLite is told a date range filter matches, see case_filters
+IMPORT_SPOOL_SIZE = 16 * 2**20  # Number of bytes of an uploaded import file kept in memory before spilling to disk
+CASE_LIST_FIELDS = tuple(field for field in CaseListItem.model_fields if field not in ("breed", "match"))
+CASE_RELATIONSHIPS = ("breed",)
+DUPLICATE_ID = "Duplicate case ID"  # BulkResult detail of a case ID repeated in a bulk update or delete
+CASE_REQUIRED_FIELDS = tuple(  # Fields a case update cannot set to null
+    column.name for column in Case.__table__.columns if not column.nullable and not column.primary_key
+)
 
 
 #######################################################################################################################
@@ -42,66 +99,515 @@ case_router = APIRouter()
 #######################################################################################################################
 
 
+def case_filters(query: CaseListQuery) -> list:
+    """
+    Return the SQL filter expressions of the structured filters of a case list query.
+
+    Each filter is served by an index on its column (see models.Case). The species filter selects the breed IDs of the
+    species, so that it is served by the breed_id index like the breed filter. Without table statistics, SQLite would
+    rather walk the index of the sort field than sort the cases in an open-ended date range, which scans every case if
+    few are in the range, so the date ranges are marked as selective with likelihood().
+
+    Args:
+    ----
+        query (CaseListQuery): The case list query.
+
+    Returns:
+    -------
+        list: Filter expressions to pass to Case.get_all, empty if the query has no filters.
+
+    """
+    filters = []
+    if query.species is not None:
+        filters.append(Case.breed_id.in_(select(Breed.id).where(Breed.species == query.species)))
+    if query.breed_id is not None:
+        filters.append(Case.breed_id == query.breed_id)
+    if query.sex is not None:
+        filters.append(Case.sex == query.sex)
+    if query.owner is not None:
+        filters.append(Case.owner == query.owner)
+    ranges = (
+        (Case.create_date, query.created_from, query.created_to),
+        (Case.birth_date, query.born_from, query.born_to),
+    )
+    for field, start, end in ranges:
+        if start is not None:
+            filters.append(func.likelihood(field >= start.isoformat(), literal_column(RANGE_LIKELIHOOD)))
+        if end is not None:
+            filters.append(func.likelihood(field <= end.isoformat(), literal_column(RANGE_LIKELIHOOD)))
+    return filters
+
+
+def case_read(case: Case, model: type[CaseRead] = CaseRead, **fields) -> CaseRead:
+    """Return the API form of a case, with its breed from the breed catalog and any other fields given."""
+    return model.model_validate({**case.model_dump(), "breed": breed_catalog.get(case.breed_id), **fields})
+
+
+class CaseFieldset(NamedTuple):
+    """The case fields and relationships a request asks for."""
+
+    fields: tuple[str, ...]  # Case fields to return, in model order, always with id
+    breed: bool  # True to return the breed of each case
+
+    def columns(self, *extra: str) -> tuple:
+        """Return the columns to select: the fields, then breed_id if the breed is returned, then any extra fields."""
+        names = dict.fromkeys((*self.fields, *(("breed_id",) if self.breed else ()), *extra))
+        return tuple(getattr(Case, name) for name in names)
+
+
+DEFAULT_FIELDSET = CaseFieldset(CASE_LIST_FIELDS, breed=True)
+CASE_LIST_COLUMNS = DEFAULT_FIELDSET.columns()  # Every case field, as selected for case_list_content by default
+
+
+def case_fieldset(fields: str | None, include: str | None) -> CaseFieldset:
+    """
+    Return the fieldset of the fields and include query parameters of a request.
+
+    Args:
+    ----
+        fields (str | None): Comma-separated case fields to return, or None for all fields.
+        include (str | None): Comma-separated relationships to return, or None for the breed.
+
+    Returns:
+    -------
+        CaseFieldset: The fields, in model order and with the id, and whether to return the breed.
+
+    Raises:
+    ------
+        HTTPException: 400 if a field or relationship does not exist.
+
+    """
+    names = set(CASE_LIST_FIELDS) if fields is None else {name.strip() for name in fields.split(",") if name.strip()}
+    relationships = {"breed"} if include is None else {name.strip() for name in include.split(",") if name.strip()}
+    for kind, requested, known in (
+        ("field", names, CASE_LIST_FIELDS),
+        ("relationship", relationships, CASE_RELATIONSHIPS),
+    ):
+        if unknown := requested - set(known):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown case {kind} {', '.join(sorted(unknown))}, choose from {', '.join(known)}",
+            )
+    return CaseFieldset(
+        tuple(field for field in CASE_LIST_FIELDS if field in names or field == "id"), "breed" in relationships
+    )
+
+
+def breed_contents(breed_ids: Iterable[int]) -> dict[int, dict | None]:
+    """Return the JSON content of each distinct breed of some breed IDs, from the breed catalog, in first-seen order."""
+    contents = {}
+    for breed_id in breed_ids:
+        if breed_id not in contents:
+            breed = breed_catalog.get(breed_id)
+            contents[breed_id] = None if breed is None else breed.model_dump(mode="json")
+    return contents
+
+
+def case_contents(rows: list[tuple], fieldset: CaseFieldset = DEFAULT_FIELDSET) -> list[dict]:
+    """Return the JSON content of the CaseRead of each case row, with the fields of a fieldset and one breed lookup."""
+    cases = [dict(zip(fieldset.fields, row)) for row in rows]
+    if fieldset.breed:
+        breeds = breed_contents(row.breed_id for row in rows)
+        for case, row in zip(cases, rows, strict=True):
+            case["breed"] = breeds[row.breed_id]
+    return cases
+
+
+def case_list_content(
+    rows: list[tuple],
+    shape: str = "full",
+    matches: dict[int, dict] | None = None,
+    fieldset: CaseFieldset = DEFAULT_FIELDSET,
+) -> list | dict:
+    """
+    Return the JSON content of a list of cases from their rows, without validating a model per case.
+
+    The column values are already of the API field types, so the cases are built as dictionaries, or arrays, with the
+    fields in model order, and encode to the same JSON as the models. Each breed is dumped once per list.
+
+    Args:
+    ----
+        rows (list[tuple]): Row tuples of the columns of the fieldset.
+        shape (str): "full" for a CaseListItem per case, "compact" for a CaseListCompact or "columns" for a
+            CaseListColumns.
+        matches (dict[int, dict] | None): JSON content of the CaseMatch of each case ID, for fuzzy searches.
+        fieldset (CaseFieldset): The fields of the cases to return, and whether to return their breeds.
+
+    Returns:
+    -------
+        list | dict: The content of the list, with the cases in the order of the rows.
+
+    """
+    fields = fieldset.fields
+    if shape == "full":
+        cases = case_contents(rows, fieldset)
+        for case in cases:
+            case["match"] = None if matches is None else matches[case["id"]]
+        return cases
+    breeds = breed_contents(row.breed_id for row in rows) if fieldset.breed else {}
+    if shape == "columns":
+        columns = list(zip(*rows))[: len(fields)] or [()] * len(fields)
+        cases = {field: list(values) for field, values in zip(fields, columns, strict=True)}
+        if matches is not None:
+            cases["match"] = [matches[case_id] for case_id in cases["id"]]
+        return {"cases": cases, "breeds": {str(breed_id): breed for breed_id, breed in breeds.items()}}
+    cases = [dict(zip(fields, row)) for row in rows]
+    if matches is not None:
+        for case in cases:
+            case["match"] = matches[case["id"]]
+    return {"cases": cases, "breeds": {str(breed_id): breed for breed_id, breed in breeds.items()}}
+
+
+def existing_ids(session: Session, model: type, ids: set[int]) -> set[int]:
+    """Return those of a set of IDs that belong to a row of a model's table, in one query."""
+    return set(session.exec(select(model.id).where(model.id.in_(ids)))) if ids else set()
+
+
 @case_router.post("", response_model=CaseRead, status_code=status.HTTP_201_CREATED)
 def create_case(case: CaseCreate, session: Session = Depends(get_session)):
     """Create a new clinical case."""
     case = Case.model_validate(case)
-    return case.create(session)
+    return case_read(case.create(session))
 
 
 @case_router.get(
     "",
-    response_model=list[CaseRead],
+    response_model=list[CaseListItem] | CaseListCompact | CaseListColumns,
     summary="List all clinical cases",
-    description="List all clinical cases. Optionally filter by fuzzy search on name, owner, notes, or breed.",
+    description="List all clinical cases. Optionally filter by fuzzy search on name, owner, notes, or breed, in which "
+    "case the best matches are returned in ranked order with their score and the field that matched. Otherwise cases "
+    "can be filtered by species, breed, sex, owner and creation and birth date ranges, and are returned in sort order. "
+    f"When a limit is given and more cases follow, the {NEXT_CURSOR_HEADER} response "
+    "header holds the cursor of the next page. With shape=compact or shape=columns, cases give their breed_id only "
+    "and each breed is given once in a breeds object, and with shape=columns the cases are an array per field.",
 )
 def list_cases(
+    request: Request, query: Annotated[CaseListQuery, Query()], session: Session = Depends(get_session)
+) -> Response:
+    """
+    List all clinical cases.
+
+    Args:
+    ----
+        request (Request): The request, whose Accept header chooses between JSON and MessagePack.
+        query (CaseListQuery): Fuzzy search string, filters, sort order and page to return.
+        session (Session): The database session.
+
+    Returns:
+    -------
+        Response: List of cases matching the criteria, best matches first for fuzzy searches.
+
+    """
+    filters = case_filters(query)
+    fieldset = case_fieldset(query.fields, query.include)
+    if not query.fuzzy_match:
+        sort_field = getattr(Case, query.sort)
+        after = None if query.cursor is None else decode_cursor(query.cursor, sort_field)
+        rows = Case.get_all(
+            session,
+            additional_filters=filters,
+            sort_field=sort_field,
+            limit=query.limit,
+            offset=query.offset,
+            after=after,
+            columns=fieldset.columns(query.sort),
+        )
+        headers = {}
+        if query.limit is not None and len(rows) == query.limit:
+            last = rows[-1]
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(query.sort, getattr(last, query.sort), last.id)
+        return negotiated_response(request, case_list_content(rows, query.shape, fieldset=fieldset), headers)
+
+    if query.cursor is not None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Fuzzy searches are paged with offset")
+    if filters:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Fuzzy searches cannot be filtered")
+    if not search_service.ready:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Search index is not ready")
+    limit = query.limit or DEFAULT_FUZZY_LIMIT
+    hits = search_service.fuzzy_match(query.fuzzy_match, query.min_match_score, limit, query.offset)
+    filt = (Case.id.in_([hit.case_id for hit in hits]),)
+    rows = {row.id: row for row in Case.get_all(session, additional_filters=filt, columns=fieldset.columns())}
+    matches = {hit.case_id: CaseMatch(score=hit.score, field=hit.field).model_dump() for hit in hits}
+    rows = [rows[hit.case_id] for hit in hits if hit.case_id in rows]
+    return negotiated_response(request, case_list_content(rows, query.shape, matches, fieldset))
+
+
+@case_router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export all clinical cases",
+    description="Stream every case, in ID order, with the case fields and the name of its breed, as newline-delimited "
+    "JSON (one object per line), CSV or Apache Parquet. The response is sent as the rows are read, so its size is not "
+    "limited by memory.",
+    responses={status.HTTP_200_OK: {"content": {media_type: {} for media_type in MEDIA_TYPES.values()}}},
+)
+def export_cases(
+    format: Literal["ndjson", "csv", "parquet"] = Query(default="ndjson", description="File format of the export."),
+):
+    """Stream every clinical case as newline-delimited JSON, CSV or Apache Parquet."""
+    return StreamingResponse(
+        export("cases", format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="cases.{format}"'},
+    )
+
+
+@case_router.post("/bulk", response_model=list[BulkResult])
+def create_cases(
+    cases: Annotated[list[CaseCreate], Body(max_length=MAX_BULK_ITEMS)], session: Session = Depends(get_session)
+):
+    """
+    Create a batch of clinical cases in one transaction.
+
+    Args:
+    ----
+        cases (list[CaseCreate]): The cases to create.
+        session (Session): The database session.
+
+    Returns:
+    -------
+        list[BulkResult]: The new case ID and status 201 of each case, or status 422 if its breed does not exist.
+
+    """
+    breeds = existing_ids(session, Breed, {case.breed_id for case in cases})
+    valid = [case.model_dump() for case in cases if case.breed_id in breeds]
+    ids = iter(Case.bulk_create(session, valid))
+    return [
+        BulkResult(index=i, id=next(ids), status=status.HTTP_201_CREATED)
+        if case.breed_id in breeds
+        else BulkResult(index=i, status=status.HTTP_422_UNPROCESSABLE_CONTENT, detail="Breed not found")
+        for i, case in enumerate(cases)
+    ]
+
+
+@case_router.patch("/bulk", response_model=list[BulkResult])
+def update_cases(
+    cases: Annotated[list[CaseBulkUpdate], Body(max_length=MAX_BULK_ITEMS)], session: Session = Depends(get_session)
+):
+    """
+    Update a batch of clinical cases in one transaction.
+
+    Only the fields given for a case are changed. A case setting any of the CASE_REQUIRED_FIELDS to null is rejected
+    on its own, so that it does not fail the update of the whole batch. So is any repeat of a case ID earlier in the
+    batch, rather than letting the last update of the case silently win.
+
+    Args:
+    ----
+        cases (list[CaseBulkUpdate]): The ID and changed fields of each case.
+        session (Session): The database session.
+
+    Returns:
+    -------
+        list[BulkResult]: Status 200 for each updated case, 404 if it does not exist, or 422 if its ID is repeated,
+            it sets a required field to null or its breed does not exist.
+
+    """
+    found = existing_ids(session, Case, {case.id for case in cases})
+    breeds = existing_ids(session, Breed, {case.breed_id for case in cases if case.breed_id is not None})
+    results, records, seen = [], [], set()
+    for i, case in enumerate(cases):
+        changes = case.model_dump(exclude_unset=True)
+        nulls = [field for field in CASE_REQUIRED_FIELDS if field in changes and changes[field] is None]
+        if case.id in seen:
+            results.append(
+                BulkResult(index=i, id=case.id, status=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=DUPLICATE_ID)
+            )
+        elif case.id not in found:
+            results.append(BulkResult(index=i, id=case.id, status=status.HTTP_404_NOT_FOUND, detail="Case not found"))
+        elif nulls:
+            detail = f"Cannot be null: {', '.join(nulls)}"
+            results.append(BulkResult(index=i, id=case.id, status=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=detail))
+        elif case.breed_id is not None and case.breed_id not in breeds:
+            results.append(
+                BulkResult(index=i, id=case.id, status=status.HTTP_422_UNPROCESSABLE_CONTENT, detail="Breed not found")
+            )
+        else:
+            records.append(changes | {"id": case.id})
+            results.append(BulkResult(index=i, id=case.id, status=status.HTTP_200_OK))
+        seen.add(case.id)
+    Case.bulk_update(session, records)
+    return results
+
+
+@case_router.delete("/bulk", response_model=list[BulkResult])
+def delete_cases(ids: Annotated[list[int], Body(max_length=MAX_BULK_ITEMS)], session: Session = Depends(get_session)):
+    """
+    Delete a batch of clinical cases in one transaction.
+
+    Args:
+    ----
+        ids (list[int]): IDs of the cases to delete.
+        session (Session): The database session.
+
+    Returns:
+    -------
+        list[BulkResult]: Status 204 for each deleted case, 404 if it does not exist, or 422 if its ID is repeated.
+
+    """
+    deleted = Case.bulk_delete(session, ids)
+    results, seen = [], set()
+    for i, id in enumerate(ids):
+        if id in seen:
+            results.append(
+                BulkResult(index=i, id=id, status=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=DUPLICATE_ID)
+            )
+        elif id in deleted:
+            results.append(BulkResult(index=i, id=id, status=status.HTTP_204_NO_CONTENT))
+        else:
+            results.append(BulkResult(index=i, id=id, status=status.HTTP_404_NOT_FOUND, detail="Case not found"))
+        seen.add(id)
+    return results
+
+
+@case_router.post(
+    "/batch",
+    response_model=CaseBatch,
+    summary="Retrieve clinical cases by ID",
+    description="Retrieve the clinical cases of a list of IDs, in the order of the list, with the IDs of no case "
+    "listed in missing. Repeated IDs are returned once. Takes fields and include as GET /api/case/{case_id} does.",
+)
+def get_cases(
+    request: Request,
+    ids: Annotated[list[int], Body(max_length=MAX_BULK_ITEMS)],
+    fields: str | None = Query(default=None, description=CaseListQuery.model_fields["fields"].description),
+    include: str | None = Query(default=None, description=CaseListQuery.model_fields["include"].description),
     session: Session = Depends(get_session),
-    fuzzy_match: str | None = Query(
-        default=None, description="Fuzzy search string to match against case name, owner, notes, or breed."
-    ),
-    min_match_score: int | None = Query(
-        default=60,
-        description="Cutoff matching score below which fuzzy matching does not report a case.",
+) -> Response:
+    """
+    Retrieve a batch of clinical cases by ID.
+
+    The cases are read a chunk of IDs per query, in one session, and their breeds are looked up once for the batch.
+
+    Args:
+    ----
+        request (Request): The request, whose Accept header chooses between JSON and MessagePack.
+        ids (list[int]): IDs of the cases to retrieve.
+        fields (str | None): Comma-separated case fields to return, or None for all fields.
+        include (str | None): Comma-separated relationships to return, or None for the breed.
+        session (Session): The database session.
+
+    Returns:
+    -------
+        Response: The cases found and the IDs of no case, encoded as the CaseBatch model would be.
+
+    """
+    fieldset = case_fieldset(fields, include)
+    rows = Case.get_by_ids(session, ids, columns=fieldset.columns())
+    ids = list(dict.fromkeys(ids))
+    content = {
+        "cases": case_contents([rows[id] for id in ids if id in rows], fieldset),
+        "missing": [id for id in ids if id not in rows],
+    }
+    return negotiated_response(request, content)
+
+
+@case_router.post(
+    "/import",
+    response_model=ImportResult,
+    summary="Import clinical cases from a file",
+    description="Import the cases of a CSV file with a header line, or of a newline-delimited JSON file, sent as the "
+    "request body. Each row gives the CaseCreate fields, and either a breed_id or a breed_name (matched ignoring case "
+    "and punctuation) with an optional species. Valid rows are committed a chunk at a time; invalid rows are reported "
+    "and skipped. If writing a chunk fails, the error gives the start_row to send the file again with.",
+    openapi_extra={"requestBody": {"required": True, "content": {media_type: {} for media_type in IMPORT_MEDIA_TYPES}}},
+)
+async def import_case_file(
+    request: Request,
+    format: Literal["csv", "jsonl"] | None = Query(
+        default=None, description="File format, from Content-Type if unset."
     ),
+    start_row: int = Query(default=0, ge=0, description="Number of rows to skip, to resume an interrupted import."),
 ):
     """
-    List all clinical cases.
+    Import the cases of a file sent as the request body.
+
+    The body is spooled to a temporary file as it arrives, then imported in a worker thread. The first
+    IMPORT_SPOOL_SIZE bytes are kept in memory; once the spool rolls over to disk, chunks are written in a worker
+    thread too, so that a large upload does not block the event loop on disk writes.
 
     Args:
     ----
-        session (Session): The database session.
-        fuzzy_match (str | None): Optional fuzzy search string.
-        min_match_score (int | None): Cutoff matching score below which fuzzy matching does not report a case.
+        request (Request): The request, whose body is the file.
+        format (str | None): File format, "csv" or "jsonl".
+        start_row (int): Number of rows at the start of the file to skip.
 
     Returns:
     -------
-        list[CaseRead]: List of cases matching the criteria.
+        ImportResult: The number of rows read, cases created and rows rejected, and the import throughput.
 
     """
-    filt = (Case.id.in_(fuzzy_match_service.fuzzy_match_ids(fuzzy_match, min_match_score)),) if fuzzy_match else None
-    return Case.get_all(session, greedy_fields=["breed"], additional_filters=filt)
+    fmt = format or IMPORT_MEDIA_TYPES.get(request.headers.get("content-type", "").split(";")[0].strip())
+    if fmt is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Send text/csv or application/x-ndjson"
+        )
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_SIZE) as file:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > IMPORT_SPOOL_SIZE:  # This chunk rolls the spool over to disk, or it already has
+                await run_in_threadpool(file.write, chunk)
+            else:
+                file.write(chunk)
+        file.seek(0)
+        try:
+            report = await run_in_threadpool(import_cases, file, fmt, start_row=start_row)
+        except ImportInterruptedError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Import interrupted, send the file again with start_row={e.report.rows}",
+            ) from e
+    return ImportResult.model_validate(report._asdict() | {"errors": [error._asdict() for error in report.errors]})
+
+
+@case_router.get(
+    "/{case_id}",
+    response_model=CaseRead,
+    summary="Retrieve a clinical case by ID",
+    description="Retrieve a clinical case by ID, with only the fields and relationships asked for if fields or include "
+    "are given. Only the columns of the fields returned are read.",
+)
+def get_case(
+    request: Request,
+    case_id: int,
+    fields: str | None = Query(default=None, description=CaseListQuery.model_fields["fields"].description),
+    include: str | None = Query(default=None, description=CaseListQuery.model_fields["include"].description),
+    session: Session = Depends(get_session),
+) -> Response:
+    """
+    Retrieve a clinical case by ID.
 
+    Args:
+    ----
+        request (Request): The request, whose Accept header chooses between JSON and MessagePack.
+        case_id (int): The case's ID.
+        fields (str | None): Comma-separated case fields to return, or None for all fields.
+        include (str | None): Comma-separated relationships to return, or None for the breed.
+        session (Session): The database session.
 
-@case_router.get("/{case_id}", response_model=CaseRead)
-def get_case(case_id: int, session: Session = Depends(get_session)):
-    """Retrieve a clinical case by ID."""
-    return Case.get_by_id_or_404(session, case_id, greedy_fields=["breed"])
+    Returns:
+    -------
+        Response: The fields of the case, encoded as the CaseRead model would be.
+
+    """
+    fieldset = case_fieldset(fields, include)
+    row = Case.get_by_id_or_404(session, case_id, columns=fieldset.columns())
+    return negotiated_response(request, case_contents([row], fieldset)[0])
 
 
 @case_router.put("/{case_id}", response_model=CaseRead)
 def update_case(case_id: int, case_data: CaseUpdate, session: Session = Depends(get_session)):
     """Update a clinical case by ID."""
     db_case = Case.get_by_id_or_404(session, case_id)
-    return db_case.update(session, case_data)
+    return case_read(db_case.update(session, case_data))
 
 
 @case_router.delete("/{case_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_case(case_id: int, session: Session = Depends(get_session)):
     """Delete a clinical case by ID."""
     db_case = Case.get_by_id_or_404(session, case_id)
-    session.delete(db_case)
-    session.commit()
+    db_case.delete(session)
 
 
 #######################################################################################################################
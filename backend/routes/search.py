@@ -0,0 +1,51 @@
+#######################################################################################################################
+"""
+Search API routes.
+
+This module defines endpoints reporting on the fuzzy case search:
+
+- GET /search/status:
+    Report whether the search index is loaded and how fresh it is. Returns a SearchStatus object, with status 503 until
+    the index is ready so that it can be used as a readiness probe.
+"""
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+from fastapi import APIRouter, Response, status
+
+from backend.api_models import SearchStatus
+from backend.negotiation import MsgPackRoute
+from services.search import search_service
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+search_router = APIRouter(route_class=MsgPackRoute)
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+@search_router.get(
+    "/status",
+    response_model=SearchStatus,
+    summary="Report the readiness of the fuzzy search",
+    description="Returns whether the fuzzy search index is loaded, how many cases it holds, how long its last rebuild "
+    "took and how quickly writes become searchable. Responds with status 503 until a valid index is loaded.",
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": SearchStatus, "description": "Index not ready."}},
+)
+def get_search_status(response: Response):
+    """Report whether the fuzzy search index is ready, and how fresh it is."""
+    index_status = search_service.status()
+    if not index_status.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return SearchStatus(**index_status._asdict())
+
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
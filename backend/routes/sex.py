@@ -12,15 +12,16 @@ This module defines endpoints for retrieving all possible values of SexEnum.
 # Imports
 #######################################################################################################################
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response, status
 
-from database.core.models import Sex
+from backend.negotiation import MsgPackRoute
+from backend.reference import SEX_JSON, cached_response
 
 #######################################################################################################################
 # Globals
 #######################################################################################################################
 
-sex_router = APIRouter()
+sex_router = APIRouter(route_class=MsgPackRoute)
 
 #######################################################################################################################
 # Body
@@ -32,10 +33,11 @@ sex_router = APIRouter()
     summary="List all possible animal sexes",
     description="Returns all possible values for animal sex as defined in the SexEnum.",
     response_model=list[str],
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "The values have not changed"}},
 )
-def get_sexes():
+def get_sexes(request: Request) -> Response:
     """Retrieve all possible animal sex values."""
-    return Sex
+    return cached_response(request, SEX_JSON)
 
 
 #######################################################################################################################
@@ -12,15 +12,16 @@ This module defines endpoints for retrieving all possible values of Species enum
 # Imports
 #######################################################################################################################
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response, status
 
-from database.core.models import Species
+from backend.negotiation import MsgPackRoute
+from backend.reference import SPECIES_JSON, cached_response
 
 #######################################################################################################################
 # Globals
 #######################################################################################################################
 
-species_router = APIRouter()
+species_router = APIRouter(route_class=MsgPackRoute)
 
 #######################################################################################################################
 # Body
@@ -32,10 +33,11 @@ species_router = APIRouter()
     summary="List all possible animal species",
     description="Returns all possible values for animal species as defined in the Species enum.",
     response_model=list[str],
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "The values have not changed"}},
 )
-def get_species():
+def get_species(request: Request) -> Response:
     """Retrieve all possible animal species values."""
-    return Species
+    return cached_response(request, SPECIES_JSON)
 
 
 #######################################################################################################################
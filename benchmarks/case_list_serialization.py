@@ -0,0 +1,107 @@
+#######################################################################################################################
+"""
+Benchmark of the serialisation of case lists.
+
+Fills a scratch SQLite database with synthetic cases, then builds the body of a GET /api/case response for the first N
+cases in two ways, checks that they are the same bytes and prints the time taken by each:
+
+- model: reads Case objects, validates a CaseListItem per case against the response_model and encodes it with the
+  standard library json module, as FastAPI does for a returned list of models.
+- rows: reads row tuples of the case columns and encodes them with orjson (backend.routes.case.case_list_content).
+
+It then prints the size of the body in each shape=full, compact and columns, and the time the standard library json
+module takes to parse it, as a stand-in for the time a client takes.
+
+Run from the repository root:
+
+    python -m benchmarks.case_list_serialization --rows 10000 100000 1000000
+"""
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import argparse
+import json
+import tempfile
+import time
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+from sqlmodel import Session
+
+from backend.api_models import CaseListItem
+from backend.routes.case import CASE_LIST_COLUMNS, case_list_content, case_read
+from benchmarks.export import fill_database
+from database.core import session as db_session
+from database.core.models import Case
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+SHAPES = ("full", "compact", "columns")
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+def model_body(session: Session, rows: int) -> bytes:
+    """Return the response body of the first cases, validated against the response_model and encoded with json."""
+    cases = [case_read(case, CaseListItem) for case in Case.get_all(session, sort_field=Case.id, limit=rows)]
+    adapter = TypeAdapter(list[CaseListItem])
+    return JSONResponse(adapter.dump_python(adapter.validate_python(cases), mode="json")).body
+
+
+def rows_body(session: Session, rows: int, shape: str = "full") -> bytes:
+    """Return the response body of the first cases in a shape, built from row tuples and encoded with orjson."""
+    return ORJSONResponse(
+        case_list_content(Case.get_all(session, sort_field=Case.id, limit=rows, columns=CASE_LIST_COLUMNS), shape)
+    ).body
+
+
+def timed(body, session: Session, rows: int) -> tuple[bytes, float]:
+    """Return a response body and the seconds taken to build it, with a fresh session so that nothing is cached."""
+    session.expunge_all()
+    start = time.perf_counter()
+    result = body(session, rows)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="List lengths.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/cases.db"
+        fill_database(url, max(args.rows))
+        db_session.engine = db_session.create_db_engine(url)
+        with Session(db_session.engine) as session:
+            rows_body(session, 1)  # Load the breed catalog
+            for rows in args.rows:
+                model, model_seconds = timed(model_body, session, rows)
+                fast, rows_seconds = timed(rows_body, session, rows)
+                assert fast == model, "Bodies differ"
+                print(
+                    f"{rows:>9,} rows, {len(fast) / 2**20:6.1f} MB: model {model_seconds * 1000:8.0f} ms, "
+                    f"rows {rows_seconds * 1000:7.0f} ms ({model_seconds / rows_seconds:.1f}x faster)"
+                )
+                for shape in SHAPES:
+                    body = fast if shape == "full" else rows_body(session, rows, shape)
+                    start = time.perf_counter()
+                    json.loads(body)
+                    print(
+                        f"    shape={shape:8s} {len(body) / 2**20:6.1f} MB ({len(body) / len(fast):4.0%}), "
+                        f"parsed in {(time.perf_counter() - start) * 1000:6.0f} ms"
+                    )
+
+
+if __name__ == "__main__":
+    main()
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
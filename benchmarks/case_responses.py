@@ -0,0 +1,111 @@
+#######################################################################################################################
+"""
+Benchmark of the case list and detail endpoints.
+
+Fills a scratch SQLite database with synthetic cases, starts the app on it and times requests to GET /api/case and
+GET /api/case/{case_id} through the FastAPI test client, printing the SQL statements run per request, the mean size of
+the responses and the median and 99th percentile latency. POST /api/case/batch is timed as often as the other
+endpoints, each request fetching its own sample of BATCH_SIZE random IDs. Run from the repository root:
+
+    python -m benchmarks.case_responses --cases 100000
+"""
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import argparse
+import random
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from benchmarks.export import fill_database
+from database.core import session as db_session
+from main import get_app
+from services.search import search_service
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+WARMUP_REQUESTS = 50  # Requests per endpoint before timing starts
+BATCH_SIZE = 1000  # IDs per POST /api/case/batch request
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+def time_requests(
+    client: TestClient, requests: list[tuple[str, list | None]], statements: list
+) -> tuple[float, float, float, float]:
+    """
+    Make each request, a GET of a URL or a POST of a JSON body to it, in turn after a warm-up.
+
+    Returns
+    -------
+        tuple: Mean SQL statements per request, mean response size in kilobytes, and the median and 99th percentile
+            latency in milliseconds.
+
+    """
+    for url, body in requests[:WARMUP_REQUESTS]:
+        client.request("GET" if body is None else "POST", url, json=body)
+    statements.clear()
+    latencies, size = [], 0
+    for url, body in requests:
+        start = time.perf_counter()
+        response = client.request("GET" if body is None else "POST", url, json=body)
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        size += len(response.content)
+    latencies.sort()
+    p50, p99 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+    return len(statements) / len(requests), size / len(requests) / 1024, p50, p99
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=100_000, help="Number of synthetic cases.")
+    parser.add_argument("--requests", type=int, default=500, help="Number of timed requests per endpoint.")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/cases.db"
+        fill_database(url, args.cases)
+        db_session.engine = db_session.create_db_engine(url)
+        statements = []
+        event.listen(db_session.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        ids = [rng.randint(1, args.cases) for _ in range(args.requests)]
+        batch_size = min(BATCH_SIZE, args.cases)
+        endpoints = {
+            "list, 100 cases": [("/api/case?limit=100", None)] * args.requests,
+            "list, 1000 cases": [("/api/case?limit=1000", None)] * args.requests,
+            "list, 1000 names": [("/api/case?limit=1000&fields=name&include=", None)] * args.requests,
+            "detail": [(f"/api/case/{id}", None) for id in ids],
+            f"batch, {batch_size} ids": [
+                ("/api/case/batch", rng.sample(range(1, args.cases + 1), batch_size)) for _ in range(args.requests)
+            ],
+        }
+        with TestClient(get_app()) as client:
+            while not search_service.ready:
+                time.sleep(0.1)
+            print(f"cases: {args.cases}, requests per endpoint: {args.requests}")
+            for name, requests in endpoints.items():
+                per_request, size, p50, p99 = time_requests(client, requests, statements)
+                print(
+                    f"{name:18s} {per_request:4.1f} statements/request, {size:7.1f} kB, "
+                    f"p50 {p50:7.2f} ms, p99 {p99:7.2f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
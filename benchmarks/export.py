@@ -0,0 +1,114 @@
+#######################################################################################################################
+"""
+Throughput and memory benchmark of the bulk case export.
+
+Fills a scratch SQLite database with synthetic cases, then exports them in each file format from a fresh process and
+prints the rows per second and the peak resident set size of that process, before and during the export. The peak
+should not grow with the number of cases. Run from the repository root:
+
+    python -m benchmarks.export --cases 1000000
+"""
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import argparse
+import multiprocessing
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlmodel import SQLModel
+
+from benchmarks.synthetic import BREEDS, synthetic_cases
+from database.core import session as db_session
+from database.core.models import Breed, Case, Species
+from services.export import EXPORT_FORMATS, export
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+INSERT_BATCH_SIZE = 50_000  # Number of cases inserted per statement when filling the database
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+def fill_database(url: str, cases: int) -> None:
+    """Create the schema in a new database and insert the synthetic breeds and cases."""
+    engine = db_session.create_db_engine(url)
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Breed), [{"id": i, "name": name, "species": Species.CANINE} for i, name in enumerate(BREEDS, 1)]
+        )
+        batch = []
+        for record in synthetic_cases(cases):
+            batch.append({**record, "create_date": "2025-01-01"})
+            del batch[-1]["breed_name"]
+            if len(batch) == INSERT_BATCH_SIZE:
+                connection.execute(insert(Case), batch)
+                batch.clear()
+        if batch:
+            connection.execute(insert(Case), batch)
+    engine.dispose()
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in megabytes."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_export(url: str, fmt: str, output: Path) -> tuple[int, float, float, float]:
+    """
+    Export every case to a file, in a worker process.
+
+    Returns
+    -------
+        tuple: Bytes written, seconds taken, and the peak RSS in megabytes before and after the export.
+
+    """
+    db_session.engine = db_session.create_db_engine(url)
+    before = peak_rss_mb()
+    start = time.perf_counter()
+    size = 0
+    with output.open("wb") as file:
+        for chunk in export("cases", fmt):
+            size += file.write(chunk)
+    return size, time.perf_counter() - start, before, peak_rss_mb()
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=1_000_000, help="Number of synthetic cases.")
+    parser.add_argument("--formats", nargs="+", choices=EXPORT_FORMATS, default=EXPORT_FORMATS, help="Formats.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/export.db"
+        start = time.perf_counter()
+        fill_database(url, args.cases)
+        print(f"cases: {args.cases}, database filled in {time.perf_counter() - start:.1f} s")
+        for fmt in args.formats:
+            output = Path(directory) / f"cases.{fmt}"
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                size, seconds, before, after = pool.submit(run_export, url, fmt, output).result()
+            print(
+                f"{fmt:8s} {args.cases / seconds:10,.0f} rows/s, {size / 2**20:7.1f} MB written, "
+                f"peak RSS {before:6.1f} MB before and {after:6.1f} MB after the export"
+            )
+
+
+if __name__ == "__main__":
+    main()
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
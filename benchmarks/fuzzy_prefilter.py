@@ -0,0 +1,76 @@
+#######################################################################################################################
+"""
+Recall-versus-latency benchmark of the n-gram candidate pre-filter of the fuzzy search index.
+
+For a range of minimum n-gram overlaps (Config.FUZZY_MIN_GRAM_OVERLAP), compares the pre-filtered search with the
+exhaustive search over the same index and prints the mean time per query and the recall (fraction of the exhaustive
+matches that the pre-filter also finds). Recall is broken down by match score, since WRatio reports many weak matches
+just above the default cutoff of 60 that share little text with the query. Run from the repository root:
+
+    python -m benchmarks.fuzzy_prefilter --cases 400000
+"""
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import argparse
+import time
+
+from backend.config import config
+from benchmarks.fuzzy_search import MIN_MATCH_SCORE, time_per_query
+from benchmarks.synthetic import QUERIES, search_strings, synthetic_cases
+from services.fuzzy import FuzzyIndex
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+OVERLAPS = (0.2, 0.35, 0.5, 0.65, 0.8)
+SCORE_BANDS = (60, 75, 90)
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+def recall(index: FuzzyIndex, exhaustive: dict[str, dict[int, float]]) -> str:
+    """Return, per score band, the fraction of the exhaustive matches found by the pre-filtered search."""
+    found = {q: {hit.case_id for hit in index.search(q, MIN_MATCH_SCORE)} for q in QUERIES}
+    bands = []
+    for band in SCORE_BANDS:
+        expected = [(q, case_id) for q in QUERIES for case_id, score in exhaustive[q].items() if score >= band]
+        hits = sum(case_id in found[q] for q, case_id in expected)
+        bands.append(f">={band}: {hits / len(expected) if expected else 1.0:.3f}")
+    return ", ".join(bands)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=100_000, help="Number of synthetic cases.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of passes over the benchmark queries.")
+    args = parser.parse_args()
+
+    field_map = {record["id"]: search_strings(record) for record in synthetic_cases(args.cases)}
+    start = time.perf_counter()
+    index = FuzzyIndex(field_map.items())
+    print(f"cases: {args.cases}, index build: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    exhaustive = {
+        q: {hit.case_id: hit.score for hit in index.search(q, MIN_MATCH_SCORE, exhaustive=True)} for q in QUERIES
+    }
+    full_ms = time_per_query(lambda q: index.search(q, MIN_MATCH_SCORE, exhaustive=True), args.repeat)
+    print(f"exhaustive:       {full_ms:8.2f} ms/query")
+    for overlap in OVERLAPS:
+        config.FUZZY_MIN_GRAM_OVERLAP = overlap
+        ms = time_per_query(lambda q: index.search(q, MIN_MATCH_SCORE), args.repeat)
+        print(f"overlap >= {overlap:.2f}: {ms:8.2f} ms/query, recall {recall(index, exhaustive)}")
+
+
+if __name__ == "__main__":
+    main()
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
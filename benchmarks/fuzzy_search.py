@@ -0,0 +1,84 @@
+#######################################################################################################################
+"""
+Benchmark of the vectorised fuzzy search index against the original per-case loop.
+
+Builds both search structures over synthetic cases, checks that they return the same matches and prints the mean time
+per query. The index is searched exhaustively, without its n-gram pre-filter (see benchmarks/fuzzy_prefilter.py).
+Run from the repository root:
+
+    python -m benchmarks.fuzzy_search --cases 400000
+"""
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import argparse
+import time
+
+from rapidfuzz import process
+
+from benchmarks.synthetic import QUERIES, search_strings, synthetic_cases
+from services.fuzzy import FuzzyIndex
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+MIN_MATCH_SCORE = 60
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+def per_case_loop(field_map: dict[int, dict[str, str]], query: str, min_match_score: int) -> list[int]:
+    """Reproduce the original search: one ``extractOne`` call per case followed by a full sort."""
+    results = [
+        (case_id, process.extractOne(query, fields, score_cutoff=min_match_score))
+        for case_id, fields in field_map.items()
+    ]
+    results = [r for r in results if r[1] is not None]
+    results = sorted(results, key=lambda r: r[1][1], reverse=True)
+    return [r[0] for r in results]
+
+
+def time_per_query(search, repeat: int) -> float:
+    """Return the mean wall-clock time in milliseconds of one call of ``search`` per benchmark query."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            search(query)
+    return (time.perf_counter() - start) * 1000 / (repeat * len(QUERIES))
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=100_000, help="Number of synthetic cases.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of passes over the benchmark queries.")
+    args = parser.parse_args()
+
+    field_map = {record["id"]: search_strings(record) for record in synthetic_cases(args.cases)}
+
+    start = time.perf_counter()
+    index = FuzzyIndex(field_map.items())
+    build_ms = (time.perf_counter() - start) * 1000
+
+    for query in QUERIES:
+        matches = {hit.case_id for hit in index.search(query, MIN_MATCH_SCORE, exhaustive=True)}
+        assert matches == set(per_case_loop(field_map, query, MIN_MATCH_SCORE))
+
+    loop_ms = time_per_query(lambda q: per_case_loop(field_map, q, MIN_MATCH_SCORE), args.repeat)
+    index_ms = time_per_query(lambda q: index.search(q, MIN_MATCH_SCORE, exhaustive=True), args.repeat)
+    print(f"cases: {args.cases}, index build: {build_ms:.1f} ms")
+    print(f"per-case loop:   {loop_ms:8.2f} ms/query")
+    print(f"flattened index: {index_ms:8.2f} ms/query ({loop_ms / index_ms:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
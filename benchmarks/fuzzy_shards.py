@@ -0,0 +1,68 @@
+#######################################################################################################################
+"""
+Scaling benchmark of the fuzzy search index sharded across worker processes.
+
+Builds the in-process index and sharded indexes with a range of shard counts over the same synthetic cases, checks that
+they return the same matches and prints the mean time per query. Sharding only pays off with as many free cores as
+shards; on fewer cores the workers compete with each other and the IPC overhead dominates. Run from the repository root:
+
+    python -m benchmarks.fuzzy_shards --cases 400000 --shards 1 2 4 8 16
+"""
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import argparse
+import os
+import time
+
+from benchmarks.fuzzy_search import MIN_MATCH_SCORE, time_per_query
+from benchmarks.synthetic import QUERIES, search_strings, synthetic_cases
+from services.fuzzy import FuzzyIndex, ShardedFuzzyIndex
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+SHARDS = (2, 4, 8, 16)
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=100_000, help="Number of synthetic cases.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of passes over the benchmark queries.")
+    parser.add_argument("--shards", type=int, nargs="+", default=SHARDS, help="Shard counts to benchmark.")
+    args = parser.parse_args()
+
+    field_map = {record["id"]: search_strings(record) for record in synthetic_cases(args.cases)}
+    index = FuzzyIndex(field_map.items())
+    expected = {q: index.search(q, MIN_MATCH_SCORE, exhaustive=True) for q in QUERIES}
+    single_ms = time_per_query(lambda q: index.search(q, MIN_MATCH_SCORE, exhaustive=True), args.repeat)
+    print(f"cases: {args.cases}, cores: {os.cpu_count()}")
+    print(f"in-process:  {single_ms:8.2f} ms/query")
+
+    for shards in args.shards:
+        start = time.perf_counter()
+        sharded = ShardedFuzzyIndex(field_map.items(), shards=shards)
+        build_ms = (time.perf_counter() - start) * 1000
+        try:
+            for query in QUERIES:
+                assert sharded.search(query, MIN_MATCH_SCORE, exhaustive=True) == expected[query]
+            ms = time_per_query(lambda q: sharded.search(q, MIN_MATCH_SCORE, exhaustive=True), args.repeat)
+        finally:
+            sharded.close()
+        print(f"{shards:2d} shards:   {ms:8.2f} ms/query ({single_ms / ms:.1f}x), start-up {build_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
@@ -0,0 +1,104 @@
+#######################################################################################################################
+"""
+Memory benchmark of fuzzy index snapshots loaded by several worker processes.
+
+Builds the index over synthetic cases and saves it to a snapshot file, then starts worker processes that each load the
+snapshot and stay alive until all of them have loaded it. Each worker prints how much its memory grew while loading,
+split into pages shared with other processes and pages private to it, as read from /proc/self/smaps_rollup (so this
+benchmark only runs on Linux). The numeric arrays and n-gram postings stay in the shared, memory-mapped file; the
+string table is decoded into Python strings for rapidfuzz, and those are private to each worker. Run from the
+repository root:
+
+    python -m benchmarks.fuzzy_snapshot --cases 400000 --workers 4
+"""
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from multiprocessing.connection import Connection
+from pathlib import Path
+
+from benchmarks.synthetic import search_strings, synthetic_cases
+from services.fuzzy import FuzzyIndex
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+FINGERPRINT = "benchmark"
+MEMORY_FIELDS = ("Rss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+def memory() -> dict[str, int]:
+    """Return the memory of this process in kilobytes, by /proc/self/smaps_rollup field."""
+    fields = {}
+    for line in Path("/proc/self/smaps_rollup").read_text().splitlines()[1:]:
+        name, value = line.split(":", 1)
+        fields[name] = int(value.split()[0])
+    return {name: fields.get(name, 0) for name in MEMORY_FIELDS}
+
+
+def load_snapshot(path: Path, conn: Connection) -> None:
+    """Load the snapshot, send the memory growth and load time, and wait for the parent before exiting."""
+    before, start = memory(), time.perf_counter()
+    index = FuzzyIndex.load(path, FINGERPRINT)
+    seconds = time.perf_counter() - start
+    conn.send(seconds)
+    conn.recv()  # Every worker has loaded the snapshot, so that the pages they map together count as shared
+    after = memory()
+    conn.send(({name: after[name] - before[name] for name in MEMORY_FIELDS}, len(index)))
+    conn.recv()
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=100_000, help="Number of synthetic cases.")
+    parser.add_argument("--workers", type=int, default=4, help="Number of worker processes loading the snapshot.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "index.snapshot"
+        FuzzyIndex((record["id"], search_strings(record)) for record in synthetic_cases(args.cases)).save(
+            path, FINGERPRINT
+        )
+        print(f"cases: {args.cases}, snapshot: {path.stat().st_size / 2**20:.1f} MB")
+        context = multiprocessing.get_context("spawn")
+        conns, workers = [], []
+        for _ in range(args.workers):
+            conn, worker_conn = context.Pipe()
+            worker = context.Process(target=load_snapshot, args=(path, worker_conn))
+            worker.start()
+            conns.append(conn)
+            workers.append(worker)
+        load_seconds = [conn.recv() for conn in conns]
+        for conn in conns:
+            conn.send(None)
+        for i, (conn, seconds) in enumerate(zip(conns, load_seconds, strict=True)):
+            growth, cases = conn.recv()
+            shared = (growth["Shared_Clean"] + growth["Shared_Dirty"]) / 1024
+            private = (growth["Private_Clean"] + growth["Private_Dirty"]) / 1024
+            print(
+                f"worker {i}: {cases} cases loaded in {seconds * 1000:6.0f} ms, RSS +{growth['Rss'] / 1024:6.1f} MB "
+                f"(shared {shared:6.1f} MB, private {private:6.1f} MB)"
+            )
+        for conn, worker in zip(conns, workers, strict=True):
+            conn.send(None)
+            worker.join()
+
+
+if __name__ == "__main__":
+    main()
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
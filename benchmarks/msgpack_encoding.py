@@ -0,0 +1,92 @@
+#######################################################################################################################
+"""
+Benchmark of MessagePack against JSON for case list responses.
+
+Builds the content of a GET /api/case response for synthetic cases, in the full and the column shape, and prints the
+encoded size and the encode and decode times of the standard library json module (which FastAPI uses by default),
+orjson (used by the case list) and msgpack (used when a client sends Accept: application/msgpack). Run from the
+repository root:
+
+    python -m benchmarks.msgpack_encoding --cases 100000
+"""
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import argparse
+import json
+import time
+
+import msgpack
+import orjson
+
+from backend.routes.case import CASE_LIST_FIELDS
+from benchmarks.synthetic import synthetic_cases
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+CODECS = {
+    "json": (
+        lambda content: json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode(),
+        json.loads,
+    ),
+    "orjson": (orjson.dumps, orjson.loads),
+    "msgpack": (msgpack.packb, msgpack.unpackb),
+}
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+def case_list(count: int) -> tuple[list[dict], dict]:
+    """Return the content of a list of synthetic cases, as a CaseListItem per case and as CaseListColumns."""
+    breeds, cases = {}, []
+    for record in synthetic_cases(count):
+        breed_id = record["breed_id"]
+        breeds.setdefault(str(breed_id), {"id": breed_id, "name": record["breed_name"], "species": "Canine"})
+        case = {field: record.get(field) for field in CASE_LIST_FIELDS}
+        cases.append({**case, "sex": "Unknown", "create_date": "2025-01-01"})
+    full = [{**case, "breed": breeds[str(case["breed_id"])], "match": None} for case in cases]
+    columns = {field: [case[field] for case in cases] for field in CASE_LIST_FIELDS}
+    return full, {"cases": columns, "breeds": breeds}
+
+
+def best_time(function, argument, repeat: int) -> float:
+    """Return the shortest wall-clock time in milliseconds of a few calls of a function."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(argument)
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=100_000, help="Number of synthetic cases.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of times each codec is timed.")
+    args = parser.parse_args()
+
+    print(f"cases: {args.cases}")
+    for shape, content in zip(("full", "columns"), case_list(args.cases), strict=True):
+        for name, (encode, decode) in CODECS.items():
+            body = encode(content)
+            assert decode(body) == content
+            print(
+                f"shape={shape:8s} {name:8s} {len(body) / 2**20:7.1f} MB, "
+                f"encode {best_time(encode, content, args.repeat):7.1f} ms, "
+                f"decode {best_time(decode, body, args.repeat):7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
@@ -0,0 +1,71 @@
+#######################################################################################################################
+"""
+Synthetic data generators shared by the benchmark scripts.
+
+Produces deterministic, realistic-looking case records (names, owners, notes and breeds) without touching the database,
+so benchmarks can be run at sizes far beyond the bundled development database.
+"""
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import random
+from collections.abc import Iterator
+
+from services.fuzzy import case_search_strings
+from services.static_data.breeds.canine import DOG_BREEDS
+from services.static_data.breeds.equine import HORSE_BREEDS
+from services.static_data.breeds.feline import CAT_BREEDS
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+BREEDS = DOG_BREEDS + CAT_BREEDS + HORSE_BREEDS
+SYLLABLES = ("ba", "be", "bel", "la", "ma", "max", "mi", "lo", "ro", "sa", "ty", "ki", "do", "ra", "zu", "fi", "no")
+FIRST_NAMES = ("Alice", "Alicia", "Bob", "Carol", "Dave", "Erin", "Frank", "Grace", "Heidi", "Ivan", "Judy", "Mallory")
+SURNAMES = ("Smith", "Jones", "Taylor", "Brown", "Williams", "Wilson", "Johnson", "Davies", "Robinson", "Wright")
+NOTE_WORDS = ("healthy", "sick", "recovered", "lame", "vaccinated", "follow-up", "bloods", "x-ray", "diet", "weight")
+QUERIES = ("bella", "alic", "smith", "labrador", "healt", "max", "shepherd", "zzzzzz")
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+def synthetic_cases(count: int, seed: int = 0) -> Iterator[dict]:
+    """
+    Generate synthetic case records.
+
+    Args:
+    ----
+        count (int): Number of cases to generate.
+        seed (int): Random seed, so that runs are reproducible.
+
+    Returns:
+    -------
+        Iterator[dict]: Case records with id, name, owner, notes, breed_id and breed_name keys.
+
+    """
+    rng = random.Random(seed)
+    for case_id in range(1, count + 1):
+        breed_id = rng.randrange(len(BREEDS))
+        yield {
+            "id": case_id,
+            "name": "".join(rng.choices(SYLLABLES, k=rng.randint(2, 3))).capitalize(),
+            "owner": f"{rng.choice(FIRST_NAMES)} {rng.choice(SURNAMES)}",
+            "notes": " ".join(rng.choices(NOTE_WORDS, k=rng.randint(0, 4))) or None,
+            "breed_id": breed_id + 1,
+            "breed_name": BREEDS[breed_id],
+        }
+
+
+def search_strings(record: dict) -> dict[str, str]:
+    """Return the lowercased searchable strings of a synthetic case record, as the fuzzy service indexes them."""
+    return case_search_strings(record["name"], record["owner"], record["notes"], record["breed_name"])
+
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
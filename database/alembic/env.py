@@ -20,6 +20,16 @@ if config.config_file_name is not None:
 # This will include all SQLModel models
 target_metadata = SQLModel.metadata
 
+# Tables maintained by hand-written migrations rather than autogenerated from the models: the case_search FTS5 table
+# and the shadow tables SQLite creates for it
+UNMANAGED_TABLE_PREFIXES = ("case_search",)
+
+
+def include_name(name, type_, parent_names) -> bool:
+    """Leave the UNMANAGED_TABLE_PREFIXES tables out of autogenerated migrations."""
+    return not (type_ == "table" and name.startswith(UNMANAGED_TABLE_PREFIXES))
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -43,6 +53,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -66,7 +77,7 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(connection=connection, target_metadata=target_metadata, include_name=include_name)
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,60 @@
+"""
+case search.
+
+Adds the case_search FTS5 trigram table used by the "fts" search backend, fills it from the existing cases and adds the
+triggers that keep it in step with the case and breed tables.
+
+Revision ID: 3c91d4a7e2b6
+Revises: 5287ef7f8805
+Create Date: 2026-10-17 10:04:52.118734
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c91d4a7e2b6"
+down_revision: str | Sequence[str] | None = "5287ef7f8805"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+COLUMNS = "rowid, name, owner, notes, breed"
+VALUES = "new.id, new.name, new.owner, new.notes, (SELECT name FROM breed WHERE id = new.breed_id)"
+TRIGGERS = ("case_insert_search", "case_update_search", "case_delete_search", "breed_update_search")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE VIRTUAL TABLE case_search USING fts5(name, owner, notes, breed, tokenize='trigram')")
+    op.execute(
+        f"INSERT INTO case_search ({COLUMNS}) "
+        'SELECT "case".id, "case".name, "case".owner, "case".notes, breed.name FROM "case" '
+        'LEFT JOIN breed ON breed.id = "case".breed_id'
+    )
+    op.execute(
+        'CREATE TRIGGER IF NOT EXISTS case_insert_search AFTER INSERT ON "case" '
+        f"BEGIN INSERT INTO case_search ({COLUMNS}) VALUES ({VALUES}); END"
+    )
+    op.execute(
+        'CREATE TRIGGER IF NOT EXISTS case_update_search AFTER UPDATE OF id, name, owner, notes, breed_id ON "case" '
+        "BEGIN DELETE FROM case_search WHERE rowid = old.id; "
+        f"INSERT INTO case_search ({COLUMNS}) VALUES ({VALUES}); END"
+    )
+    op.execute(
+        'CREATE TRIGGER IF NOT EXISTS case_delete_search AFTER DELETE ON "case" '
+        "BEGIN DELETE FROM case_search WHERE rowid = old.id; END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS breed_update_search AFTER UPDATE OF name ON breed "
+        'BEGIN UPDATE case_search SET breed = new.name WHERE rowid IN (SELECT id FROM "case" WHERE breed_id = new.id); '
+        "END"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS case_search")
@@ -0,0 +1,49 @@
+"""
+data version.
+
+Adds the single-row data_version counter and the triggers that bump it on every write to the breed and case tables.
+
+Revision ID: 5287ef7f8805
+Revises: be260f0e121c
+Create Date: 2026-10-17 09:12:31.402118
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5287ef7f8805"
+down_revision: str | Sequence[str] | None = "be260f0e121c"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+VERSIONED_TABLES = ("breed", "case")
+OPERATIONS = ("INSERT", "UPDATE", "DELETE")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "data_version",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute("INSERT INTO data_version (id, version) VALUES (1, 0)")
+    for table in VERSIONED_TABLES:
+        for operation in OPERATIONS:
+            op.execute(
+                f'CREATE TRIGGER IF NOT EXISTS {table}_{operation.lower()}_data_version AFTER {operation} ON "{table}" '
+                "BEGIN UPDATE data_version SET version = version + 1 WHERE id = 1; END"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in VERSIONED_TABLES:
+        for operation in OPERATIONS:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_{operation.lower()}_data_version")
+    op.drop_table("data_version")
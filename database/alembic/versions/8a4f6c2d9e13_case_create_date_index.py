@@ -0,0 +1,30 @@
+"""
+case create_date index.
+
+Indexes case.create_date so that case listings sorted by creation date are paged without sorting the whole table.
+
+Revision ID: 8a4f6c2d9e13
+Revises: 3c91d4a7e2b6
+Create Date: 2026-10-17 11:26:08.530417
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8a4f6c2d9e13"
+down_revision: str | Sequence[str] | None = "3c91d4a7e2b6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f("ix_case_create_date"), "case", ["create_date"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_case_create_date"), table_name="case")
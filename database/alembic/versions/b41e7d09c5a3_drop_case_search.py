@@ -0,0 +1,63 @@
+"""
+drop case search.
+
+Drops the case_search FTS5 table and its triggers, which made every case write cost about twice as much for an index
+only the "fts" search backend reads. That backend now creates and fills the table when it starts on a database.
+
+Revision ID: b41e7d09c5a3
+Revises: f3a9c61b7d25
+Create Date: 2026-10-17 18:22:40.631957
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b41e7d09c5a3"
+down_revision: str | Sequence[str] | None = "f3a9c61b7d25"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+COLUMNS = "rowid, name, owner, notes, breed"
+VALUES = "new.id, new.name, new.owner, new.notes, (SELECT name FROM breed WHERE id = new.breed_id)"
+TRIGGERS = ("case_insert_search", "case_update_search", "case_delete_search", "breed_update_search")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS case_search")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS case_search USING fts5(name, owner, notes, breed, tokenize='trigram')"
+    )
+    op.execute("DELETE FROM case_search")
+    op.execute(
+        f"INSERT INTO case_search ({COLUMNS}) "
+        'SELECT "case".id, "case".name, "case".owner, "case".notes, breed.name FROM "case" '
+        'LEFT JOIN breed ON breed.id = "case".breed_id'
+    )
+    op.execute(
+        'CREATE TRIGGER IF NOT EXISTS case_insert_search AFTER INSERT ON "case" '
+        f"BEGIN INSERT INTO case_search ({COLUMNS}) VALUES ({VALUES}); END"
+    )
+    op.execute(
+        'CREATE TRIGGER IF NOT EXISTS case_update_search AFTER UPDATE OF id, name, owner, notes, breed_id ON "case" '
+        "BEGIN DELETE FROM case_search WHERE rowid = old.id; "
+        f"INSERT INTO case_search ({COLUMNS}) VALUES ({VALUES}); END"
+    )
+    op.execute(
+        'CREATE TRIGGER IF NOT EXISTS case_delete_search AFTER DELETE ON "case" '
+        "BEGIN DELETE FROM case_search WHERE rowid = old.id; END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS breed_update_search AFTER UPDATE OF name ON breed "
+        'BEGIN UPDATE case_search SET breed = new.name WHERE rowid IN (SELECT id FROM "case" WHERE breed_id = new.id); '
+        "END"
+    )
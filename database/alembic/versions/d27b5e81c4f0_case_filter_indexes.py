@@ -0,0 +1,37 @@
+"""
+case filter indexes.
+
+Adds the indexes serving the structured filters of the case listing: breed, sex and owner, each followed by
+create_date for date ranges and sorting, and birth_date.
+
+Revision ID: d27b5e81c4f0
+Revises: 8a4f6c2d9e13
+Create Date: 2026-10-17 12:41:55.907312
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d27b5e81c4f0"
+down_revision: str | Sequence[str] | None = "8a4f6c2d9e13"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f("ix_case_birth_date"), "case", ["birth_date"], unique=False)
+    op.create_index("ix_case_breed_id_create_date", "case", ["breed_id", "create_date"], unique=False)
+    op.create_index("ix_case_sex_create_date", "case", ["sex", "create_date"], unique=False)
+    op.create_index("ix_case_owner_create_date", "case", ["owner", "create_date"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_case_owner_create_date", table_name="case")
+    op.drop_index("ix_case_sex_create_date", table_name="case")
+    op.drop_index("ix_case_breed_id_create_date", table_name="case")
+    op.drop_index(op.f("ix_case_birth_date"), table_name="case")
@@ -0,0 +1,63 @@
+"""
+data version write id.
+
+Adds a random write_id to the data_version row, set now and replaced by the data version triggers on every write, so
+that the data version together with it identifies the contents of this database rather than of any database.
+
+Revision ID: f3a9c61b7d25
+Revises: d27b5e81c4f0
+Create Date: 2026-10-17 16:05:12.518304
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a9c61b7d25"
+down_revision: str | Sequence[str] | None = "d27b5e81c4f0"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+VERSIONED_TABLES = ("breed", "case")
+OPERATIONS = ("INSERT", "UPDATE", "DELETE")
+NEW_WRITE_ID = "lower(hex(randomblob(8)))"
+
+
+def _drop_triggers() -> None:
+    """Drop the data version triggers."""
+    for table in VERSIONED_TABLES:
+        for operation in OPERATIONS:
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_{operation.lower()}_data_version")
+
+
+def _create_triggers(assignments: str) -> None:
+    """Create the data version triggers, making the given assignments to the data_version row."""
+    for table in VERSIONED_TABLES:
+        for operation in OPERATIONS:
+            op.execute(
+                f'CREATE TRIGGER {table}_{operation.lower()}_data_version AFTER {operation} ON "{table}" '
+                f"BEGIN UPDATE data_version SET {assignments} WHERE id = 1; END"
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "data_version",
+        sa.Column("write_id", sqlmodel.sql.sqltypes.AutoString(), nullable=False, server_default=""),
+    )
+    op.execute(f"UPDATE data_version SET write_id = {NEW_WRITE_ID}")
+    _drop_triggers()
+    _create_triggers(f"version = version + 1, write_id = {NEW_WRITE_ID}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _drop_triggers()  # The batch operation renames a copy of the table, which fails while triggers refer to it
+    with op.batch_alter_table("data_version") as batch_op:
+        batch_op.drop_column("write_id")
+    _create_triggers("version = version + 1")
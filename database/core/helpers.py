@@ -9,10 +9,16 @@ Contains all SQLModel ORM models (table=True), enums, and mixins used for databa
 #######################################################################################################################
 # Imports
 #######################################################################################################################
-from collections.abc import Iterable
+import base64
+import binascii
+import json
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from typing import Any, NamedTuple
 
 from fastapi import HTTPException
-from sqlalchemy import ColumnElement
+from sqlalchemy import ColumnElement, Integer, String, delete, event, insert, or_, tuple_, update
 from sqlalchemy.orm import selectinload
 from sqlmodel import Session, and_, select
 
@@ -20,18 +26,171 @@ from sqlmodel import Session, and_, select
 # Globals
 #######################################################################################################################
 
+PENDING_CHANGES_KEY = "pending_changes"  # Session.info key holding the changes made in the current transaction
+DATA_VERSIONS_KEY = "data_versions"  # Session.info key holding the data versions before and after the transaction
+BULK_CHUNK_SIZE = 500  # Number of records (or IDs) per statement of the bulk helpers and get_by_ids
+
 #######################################################################################################################
 # Body
 #######################################################################################################################
 
 
+class RecordChange(NamedTuple):
+    """A committed insert, update or deletion of a database record."""
+
+    model: type
+    id: Any
+    data: dict[str, Any] | None  # Column values after the write, or None if the record was deleted
+    committed_at: float | None = None  # time.time() of the commit, set when the change is passed to the listeners
+
+
+class DataVersions(NamedTuple):
+    """The data version before and after the writes of a committed transaction (see models.DataVersion)."""
+
+    before: int | None
+    after: int | None
+
+
+CommitListener = Callable[[list[RecordChange], DataVersions | None], None]
+
+_commit_listeners: dict[type, list[CommitListener]] = defaultdict(list)
+
+
+def record_change(session: Session, obj, deleted: bool = False) -> None:
+    """
+    Remember a write to an object so that commit listeners are told about it once the transaction commits.
+
+    Args:
+    ----
+        session: The database session the write was made in.
+        obj: The written object. Its columns must be loaded unless it is being deleted.
+        deleted: True if the object is being deleted.
+
+    """
+    _remember(session, RecordChange(type(obj), obj.id, None if deleted else obj.model_dump()))
+
+
+def _remember(session: Session, change: RecordChange) -> None:
+    """Add a change to those reported to the commit listeners once the session's transaction commits."""
+    session.info.setdefault(PENDING_CHANGES_KEY, {})[(change.model, change.id)] = change
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_changes(session: Session) -> None:
+    """
+    Pass the changes of a committed transaction, and its data versions, to the commit listeners of each model.
+
+    Every change carries the time of the commit, taken before any listener runs, so that listeners can tell how long
+    the changes took to reach them.
+    """
+    committed_at = time.time()
+    changes = session.info.pop(PENDING_CHANGES_KEY, None)
+    versions = session.info.pop(DATA_VERSIONS_KEY, None)
+    if not changes:
+        return
+    versions = None if versions is None else DataVersions(*versions)
+    by_model = defaultdict(list)
+    for change in changes.values():
+        by_model[change.model].append(change._replace(committed_at=committed_at))
+    for model, model_changes in by_model.items():
+        for listener in _commit_listeners.get(model, ()):
+            listener(model_changes, versions)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    """Forget the changes of a rolled back transaction."""
+    session.info.pop(PENDING_CHANGES_KEY, None)
+    session.info.pop(DATA_VERSIONS_KEY, None)
+
+
+def encode_cursor(sort: str, value: Any, id: Any) -> str:
+    """
+    Return an opaque pagination cursor pointing after an object.
+
+    Args:
+    ----
+        sort: Name of the field the pages are sorted by.
+        value: Value of the sort field of the last object of the page.
+        id: ID of the last object of the page.
+
+    Returns:
+    -------
+        URL-safe string to pass back as the cursor of the next page.
+
+    """
+    return base64.urlsafe_b64encode(json.dumps([sort, value, id]).encode()).decode().rstrip("=")
+
+
+def _fits_column(value: Any, column: ColumnElement) -> bool:
+    """Return whether a value decoded from JSON can be compared with a column: NULL, an integer or a string."""
+    if value is None:
+        return bool(column.nullable)
+    if isinstance(column.type, Integer):
+        return isinstance(value, int) and not isinstance(value, bool)
+    if isinstance(column.type, String):
+        return isinstance(value, str)
+    return isinstance(value, int | float | str) and not isinstance(value, bool)
+
+
+def decode_cursor(cursor: str, sort_field: ColumnElement) -> tuple[Any, int]:
+    """
+    Decode a pagination cursor made by encode_cursor.
+
+    Args:
+    ----
+        cursor: The cursor passed by the client.
+        sort_field: The field the requested page is sorted by (should be a SQLModel field).
+
+    Returns:
+    -------
+        The sort field value and ID of the last object of the previous page.
+
+    Raises:
+    ------
+        HTTPException: 400 if the cursor is malformed, holds values that do not fit the sort field and the ID, or was
+            made for another sort field.
+
+    """
+    try:
+        cursor_sort, value, id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+    if cursor_sort != sort_field.key:
+        raise HTTPException(status_code=400, detail=f"Cursor was made for sort={cursor_sort}")
+    if isinstance(id, bool) or not isinstance(id, int) or not _fits_column(value, sort_field):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value, id
+
+
 # Helper Mixin classes
 class HelperMixin:
     """Mixin providing common database helper methods for database models."""
 
+    @classmethod
+    def add_commit_listener(cls, listener: CommitListener) -> None:
+        """
+        Register a callback to be told about committed writes made through this mixin.
+
+        The listener is called after every commit that created, updated or deleted objects of this class, with the list
+        of changes made in that transaction and the data versions before and after them (None if unknown). The session
+        can no longer emit SQL at that point.
+
+        Args:
+        ----
+            listener: Callable taking a list of RecordChange and a DataVersions or None.
+
+        """
+        _commit_listeners[cls].append(listener)
+
     @classmethod
     def get_by_id_or_404(
-        cls, session: Session, id, greedy_fields: Iterable[str] = tuple(), additional_filters: Iterable = tuple()
+        cls,
+        session: Session,
+        id,
+        greedy_fields: Iterable[str] = tuple(),
+        additional_filters: Iterable = tuple(),
+        columns: Iterable[ColumnElement] = tuple(),
     ):
         """
         Get an object by its ID or raise 404 if not found.
@@ -42,17 +201,18 @@ class HelperMixin:
             id: The primary key value to search for.
             greedy_fields: Iterable of related fields to eagerly load.
             additional_filters: Iterable of additional SQLAlchemy filter expressions to apply.
+            columns: Optional columns to select instead of the whole object, for reads that do not need the ORM.
 
         Returns:
         -------
-            The object instance if found.
+            The object instance if found, or a row tuple of the columns if columns are given.
 
         Raises:
         ------
             HTTPException: If the object is not found.
 
         """
-        stmt = select(cls).where(cls.id == id)
+        stmt = (select(*columns) if columns else select(cls)).where(cls.id == id)
         if additional_filters:
             stmt = stmt.where(and_(*additional_filters))
         for field in greedy_fields:
@@ -96,41 +256,180 @@ class HelperMixin:
         return obj
 
     @classmethod
-    def get_all(
+    def get_all(  # noqa: PLR0913
         cls,
         session: Session,
         greedy_fields: Iterable[str] = tuple(),
         additional_filters: Iterable = tuple(),
         sort_field: ColumnElement = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        after: tuple[Any, Any] | None = None,
+        columns: Iterable[ColumnElement] = tuple(),
     ):
         """
         Get all objects of this class from the database.
 
+        Objects with equal sort_field values are ordered by ID. For keyset pagination, pass the sort field value and ID
+        of the last object of the previous page as ``after``: with an index on the sort field, every page then costs the
+        same as the first, where an offset has to step over all the skipped rows.
+
         Args:
         ----
             session: The database session to use for the query.
             greedy_fields: Iterable of related fields to eagerly load.
             additional_filters: Iterable of additional SQLAlchemy filter expressions to apply.
             sort_field: Optional field to sort the results by (should be a SQLModel field).
+            limit: Optional maximum number of objects to return.
+            offset: Optional number of objects to skip. Use with sort_field to get a stable order.
+            after: Optional (sort_field value, ID) pair. Only objects sorted after it are returned. Needs sort_field.
+            columns: Optional columns to select instead of whole objects, for reads that do not need the ORM.
 
         Returns:
         -------
-            List of all object instances of this class.
+            List of all object instances of this class, or of row tuples of the columns if columns are given.
 
         """
-        stmt = select(cls)
+        stmt = select(*columns) if columns else select(cls)
         if additional_filters:
             stmt = stmt.where(and_(*additional_filters))
-        if sort_field:
-            stmt = stmt.order_by(sort_field)
+        if after is not None:
+            stmt = stmt.where(cls._after(sort_field, *after))
+        if sort_field is not None:
+            stmt = stmt.order_by(sort_field) if sort_field is cls.id else stmt.order_by(sort_field, cls.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        if offset:
+            stmt = stmt.offset(offset)
         for field in greedy_fields:
             stmt = stmt.options(selectinload(getattr(cls, field)))
         return session.exec(stmt).all()
 
+    @classmethod
+    def get_by_ids(
+        cls,
+        session: Session,
+        ids: Iterable,
+        columns: Iterable[ColumnElement] = tuple(),
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> dict:
+        """
+        Get many objects by ID, a chunk of IDs per IN query.
+
+        Args:
+        ----
+            session: The database session to use for the queries.
+            ids: The primary key values to search for. IDs that do not exist are ignored.
+            columns: Optional columns to select instead of whole objects. Must include the ID column.
+            chunk_size: Number of IDs per query.
+
+        Returns:
+        -------
+            Dictionary of the object instances found, or of row tuples of the columns if columns are given, by ID.
+
+        """
+        ids = list(dict.fromkeys(ids))
+        found = {}
+        for start in range(0, len(ids), chunk_size):
+            filters = (cls.id.in_(ids[start : start + chunk_size]),)
+            found.update((obj.id, obj) for obj in cls.get_all(session, additional_filters=filters, columns=columns))
+        return found
+
+    @classmethod
+    def _after(cls, sort_field: ColumnElement, value: Any, id: Any) -> ColumnElement:
+        """Return a filter selecting the objects sorted after (value, id) in (sort_field, id) order, NULLs first."""
+        if sort_field is cls.id:
+            return cls.id > id
+        if value is None:
+            return or_(sort_field.is_not(None), and_(sort_field.is_(None), cls.id > id))
+        return tuple_(sort_field, cls.id) > tuple_(value, id)
+
+    @classmethod
+    def bulk_create(cls, session: Session, records: list[dict], chunk_size: int = BULK_CHUNK_SIZE) -> list:
+        """
+        Insert many new records with executemany-style statements, without building objects.
+
+        The records are inserted a chunk at a time, in the session's transaction, and reported to the commit listeners
+        of this class together once it commits.
+
+        Args:
+        ----
+            session: The database session to use for the operation.
+            records: Column values of each new record, with every column the listeners need, and without an ID.
+            chunk_size: Number of records inserted per statement.
+
+        Returns:
+        -------
+            The IDs of the new records, in the order of the records.
+
+        """
+        # Without render_nulls, the records are split into one statement per combination of the columns that are None.
+        # Asking for the IDs in parameter order would insert one row per statement; SQLite gives each new row an ID one
+        # above the largest in the table, so sorting the IDs of a statement puts them in the order of its records.
+        statement = insert(cls).returning(cls.id).execution_options(render_nulls=True)
+        ids = []
+        for start in range(0, len(records), chunk_size):
+            ids += sorted(session.scalars(statement, records[start : start + chunk_size]))
+        for id, record in zip(ids, records, strict=True):
+            _remember(session, RecordChange(cls, id, {**record, "id": id}))
+        return ids
+
+    @classmethod
+    def bulk_update(cls, session: Session, records: list[dict], chunk_size: int = BULK_CHUNK_SIZE) -> None:
+        """
+        Update many existing records by ID with executemany-style statements, without loading objects.
+
+        The records are updated a chunk at a time, in the session's transaction, then read back to report their new
+        column values to the commit listeners of this class together once it commits.
+
+        Args:
+        ----
+            session: The database session to use for the operation.
+            records: The ID of each record to update and the new values of the fields to change. IDs that do not
+                exist are ignored.
+            chunk_size: Number of records updated per statement.
+
+        """
+        columns = cls.__table__.columns
+        for start in range(0, len(records), chunk_size):
+            chunk = records[start : start + chunk_size]
+            session.execute(update(cls), chunk)
+            rows = session.execute(select(*columns).where(cls.id.in_([record["id"] for record in chunk])))
+            for row in rows.mappings():
+                _remember(session, RecordChange(cls, row["id"], dict(row)))
+
+    @classmethod
+    def bulk_delete(cls, session: Session, ids: list, chunk_size: int = BULK_CHUNK_SIZE) -> set:
+        """
+        Delete many records by ID, a chunk of IDs per statement, without loading objects.
+
+        The deletions are reported to the commit listeners of this class together once the transaction commits.
+
+        Args:
+        ----
+            session: The database session to use for the operation.
+            ids: IDs of the records to delete. IDs that do not exist are ignored.
+            chunk_size: Number of IDs deleted per statement.
+
+        Returns:
+        -------
+            The IDs of the records that were deleted.
+
+        """
+        deleted = set()
+        for start in range(0, len(ids), chunk_size):
+            statement = delete(cls).where(cls.id.in_(ids[start : start + chunk_size])).returning(cls.id)
+            deleted.update(session.scalars(statement))
+        for id in deleted:
+            _remember(session, RecordChange(cls, id, None))
+        return deleted
+
     def create(self, session):
         """
         Add and flush a new object to the database.
 
+        The new object is reported to the commit listeners of its class once the transaction commits.
+
         Args:
         ----
             session: The database session to use for the operation.
@@ -143,12 +442,15 @@ class HelperMixin:
         session.add(self)
         session.flush()
         session.refresh(self)
+        record_change(session, self)
         return self
 
     def update(self, session: Session, update_data: dict | object):
         """
         Update an object with new data and flush changes.
 
+        The update is reported to the commit listeners of its class once the transaction commits.
+
         Args:
         ----
             session: The database session to use for the operation.
@@ -166,17 +468,21 @@ class HelperMixin:
         session.add(self)
         session.flush()
         session.refresh(self)
+        record_change(session, self)
         return self
 
     def delete(self, session) -> None:
         """
         Delete an object from the database and flush changes.
 
+        The deletion is reported to the commit listeners of its class once the transaction commits.
+
         Args:
         ----
             session: The database session to use for the operation.
 
         """
+        record_change(session, self, deleted=True)
         session.delete(self)
         session.flush()
 
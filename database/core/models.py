@@ -10,10 +10,13 @@ Contains all SQLModel ORM models (table=True), enums, and mixins used for databa
 # Imports
 #######################################################################################################################
 from enum import Enum
+from itertools import chain
 
-from sqlmodel import Field, Relationship, SQLModel
+from sqlalchemy import DDL, Connection, Index, event, select, text
+from sqlalchemy.orm import ORMExecuteState
+from sqlmodel import Field, Relationship, Session, SQLModel
 
-from .helpers import HelperMixin
+from .helpers import DATA_VERSIONS_KEY, HelperMixin
 
 #######################################################################################################################
 # Globals
@@ -21,6 +24,10 @@ from .helpers import HelperMixin
 
 NAME_LENGTH = 80
 PANEL_CLASS_LENGTH = 32
+VERSIONED_TABLES = ("breed", "case")  # Tables whose writes bump the data version
+NEW_WRITE_ID = "lower(hex(randomblob(8)))"  # SQL expression of a random DataVersion.write_id
+CASE_SEARCH_TABLE = "case_search"  # FTS5 trigram index of the searchable case fields, see create_case_search
+CASE_SEARCH_COLUMNS = "rowid, name, owner, notes, breed"
 
 #######################################################################################################################
 # Body
@@ -59,19 +66,195 @@ class Case(HelperMixin, SQLModel, table=True):
     """Database model for animal cases."""
 
     __tablename__ = "case"
+    __table_args__ = (  # Serve the case list filters, each followed by the create_date range and sort
+        Index("ix_case_breed_id_create_date", "breed_id", "create_date"),
+        Index("ix_case_sex_create_date", "sex", "create_date"),
+        Index("ix_case_owner_create_date", "owner", "create_date"),
+    )
     id: int = Field(default=None, primary_key=True, index=True, description="Case ID.")
     name: str = Field(index=True, nullable=False, max_length=NAME_LENGTH, description="Case name.")
     owner: str | None = Field(default=None, description="Owner of the animal.")
     practice_animal_id: str | None = Field(default=None, description="Practice animal ID.")
     chip_id: str | None = Field(default=None, description="Microchip ID.")
     sex: Sex = Field(default=Sex.UNKNOWN, description="Sex of the animal.")
-    birth_date: str | None = Field(default=None, description="Birth date (YYYY-MM-DD).")
-    create_date: str | None = Field(default=None, description="Case creation date (YYYY-MM-DD).")
+    birth_date: str | None = Field(default=None, index=True, description="Birth date (YYYY-MM-DD).")
+    create_date: str | None = Field(default=None, index=True, description="Case creation date (YYYY-MM-DD).")
     notes: str | None = Field(default=None, description="Additional notes.")
     breed_id: int = Field(foreign_key="breed.id", description="ID of the breed.")
     breed: Breed | None = Relationship()
 
 
+class DataVersion(SQLModel, table=True):
+    """
+    Single-row counter of the writes made to the VERSIONED_TABLES.
+
+    Triggers on those tables bump the counter on every inserted, updated or deleted row, whichever process or tool
+    made the write, so a reader can tell whether anything changed since it last looked with one primary key lookup.
+    They also replace write_id with a random ID, which is set when the database is created too. The version alone only
+    identifies contents within one database history: a recreated database, or a restored backup written to since, can
+    reach the same version with other contents, but not the same write_id.
+    """
+
+    __tablename__ = "data_version"
+    id: int = Field(default=1, primary_key=True, description="Always 1.")
+    version: int = Field(default=0, nullable=False, description="Number of writes made to the versioned tables.")
+    write_id: str = Field(default="", nullable=False, description="Random ID of the database's last write.")
+
+    @classmethod
+    def current(cls, connection: Connection) -> int | None:
+        """
+        Return the current data version.
+
+        Args:
+        ----
+            connection: The database connection to read the version with, e.g. ``session.connection()``.
+
+        Returns:
+        -------
+            int | None: The data version, or None if the database has no data version row.
+
+        """
+        return connection.execute(select(cls.version).where(cls.id == 1)).scalar()
+
+    @classmethod
+    def current_fingerprint(cls, connection: Connection) -> tuple[int | None, str | None]:
+        """
+        Return the current data version and a fingerprint of the contents of the versioned tables, read together.
+
+        Args:
+        ----
+            connection: The database connection to read them with, e.g. ``session.connection()``.
+
+        Returns:
+        -------
+            tuple[int | None, str | None]: The data version and the fingerprint, made of the version and write_id, or
+                (None, None) if the database has no data version row.
+
+        """
+        row = connection.execute(select(cls.version, cls.write_id).where(cls.id == 1)).first()
+        return (None, None) if row is None else (row.version, f"{row.version}-{row.write_id}")
+
+
+def _data_version_triggers(table: str) -> list[str]:
+    """Return the statements creating the triggers that bump the data version on writes to a table."""
+    return [
+        f'CREATE TRIGGER IF NOT EXISTS {table}_{op.lower()}_data_version AFTER {op} ON "{table}" '
+        f"BEGIN UPDATE data_version SET version = version + 1, write_id = {NEW_WRITE_ID} WHERE id = 1; END"
+        for op in ("INSERT", "UPDATE", "DELETE")
+    ]
+
+
+def _case_search_ddl() -> list[str]:
+    """
+    Return the statements creating the CASE_SEARCH_TABLE and the triggers that keep it in step with cases and breeds.
+
+    The table holds one row per case, with the case ID as its rowid, and the case's name, owner, notes and breed name.
+    """
+    columns = CASE_SEARCH_COLUMNS
+    values = "new.id, new.name, new.owner, new.notes, (SELECT name FROM breed WHERE id = new.breed_id)"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {CASE_SEARCH_TABLE} USING fts5(name, owner, notes, breed, "
+        "tokenize='trigram')",
+        f'CREATE TRIGGER IF NOT EXISTS case_insert_search AFTER INSERT ON "case" '
+        f"BEGIN INSERT INTO {CASE_SEARCH_TABLE} ({columns}) VALUES ({values}); END",
+        f'CREATE TRIGGER IF NOT EXISTS case_update_search AFTER UPDATE OF id, name, owner, notes, breed_id ON "case" '
+        f"BEGIN DELETE FROM {CASE_SEARCH_TABLE} WHERE rowid = old.id; "
+        f"INSERT INTO {CASE_SEARCH_TABLE} ({columns}) VALUES ({values}); END",
+        f'CREATE TRIGGER IF NOT EXISTS case_delete_search AFTER DELETE ON "case" '
+        f"BEGIN DELETE FROM {CASE_SEARCH_TABLE} WHERE rowid = old.id; END",
+        "CREATE TRIGGER IF NOT EXISTS breed_update_search AFTER UPDATE OF name ON breed "
+        f"BEGIN UPDATE {CASE_SEARCH_TABLE} SET breed = new.name "
+        'WHERE rowid IN (SELECT id FROM "case" WHERE breed_id = new.id); END',
+    ]
+
+
+event.listen(
+    DataVersion.__table__,
+    "after_create",
+    DDL(f"INSERT INTO data_version (id, version, write_id) VALUES (1, 0, {NEW_WRITE_ID})"),
+)
+for _table in VERSIONED_TABLES:
+    for _trigger in _data_version_triggers(_table):
+        event.listen(SQLModel.metadata.tables[_table], "after_create", DDL(_trigger))
+
+
+def create_case_search(connection: Connection) -> bool:
+    """
+    Create the CASE_SEARCH_TABLE, filled from the current cases, and its triggers, unless the table already exists.
+
+    The table is only kept for the "fts" search backend, which calls this when it starts: its triggers make every case
+    write cost about twice as much. A no-op update of the data version row first takes the database write lock, so
+    that processes starting together do not both fill the table.
+
+    Args:
+    ----
+        connection: The database connection to create the table with, e.g. ``session.connection()``.
+
+    Returns:
+    -------
+        bool: True if the table was created.
+
+    """
+    connection.execute(text("UPDATE data_version SET version = version WHERE id = 1"))
+    exists = text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name")
+    if connection.execute(exists, {"name": CASE_SEARCH_TABLE}).first() is not None:
+        return False
+    create_table, *triggers = _case_search_ddl()
+    connection.execute(text(create_table))
+    connection.execute(
+        text(
+            f"INSERT INTO {CASE_SEARCH_TABLE} ({CASE_SEARCH_COLUMNS}) "
+            'SELECT "case".id, "case".name, "case".owner, "case".notes, breed.name FROM "case" '
+            'LEFT JOIN breed ON breed.id = "case".breed_id'
+        )
+    )
+    for trigger in triggers:
+        connection.execute(text(trigger))
+    return True
+
+
+def _lock_data_version(session: Session) -> None:
+    """
+    Read the data version before the first write of a transaction to the versioned tables.
+
+    A no-op update of the data version row first takes the database write lock, so no other writer can commit between
+    this read and the end of the transaction. The versions before and after the transaction's own writes are then
+    handed to the commit listeners, which can tell from them whether they missed writes made by anyone else.
+    """
+    if DATA_VERSIONS_KEY in session.info:
+        return
+    connection = session.connection()
+    connection.execute(text("UPDATE data_version SET version = version WHERE id = 1"))
+    session.info[DATA_VERSIONS_KEY] = (DataVersion.current(connection), None)
+
+
+@event.listens_for(Session, "before_flush")
+def _start_versioned_write(session: Session, flush_context, instances) -> None:
+    """Lock the data version before flushing writes of objects of the versioned tables."""
+    if any(
+        getattr(obj, "__tablename__", None) in VERSIONED_TABLES
+        for obj in chain(session.new, session.dirty, session.deleted)
+    ):
+        _lock_data_version(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _start_versioned_statement(orm_execute_state: ORMExecuteState) -> None:
+    """Lock the data version before an ORM insert, update or delete statement on a versioned table."""
+    state = orm_execute_state
+    if (state.is_insert or state.is_update or state.is_delete) and state.statement.table.name in VERSIONED_TABLES:
+        _lock_data_version(state.session)
+
+
+@event.listens_for(Session, "before_commit")
+def _end_versioned_write(session: Session) -> None:
+    """Read the data version after the last write of a transaction to the versioned tables."""
+    session.flush()
+    versions = session.info.get(DATA_VERSIONS_KEY)
+    if versions is not None:
+        session.info[DATA_VERSIONS_KEY] = (versions[0], DataVersion.current(session.connection()))
+
+
 #######################################################################################################################
 # End of file
 #######################################################################################################################
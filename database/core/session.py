@@ -3,7 +3,7 @@
 Database setup and session management for the backend.
 
 - Creates the SQLAlchemy engine using the configured DATABASE_URL.
-- Ensures SQLite foreign key enforcement if using SQLite.
+- Ensures SQLite foreign key enforcement if using SQLite, for this engine and any other made by create_db_engine.
 - Provides a session generator for dependency injection.
 """
 
@@ -14,17 +14,11 @@ from fastapi import HTTPException
 #######################################################################################################################
 # Imports
 #######################################################################################################################
-from sqlalchemy import create_engine, event
+from sqlalchemy import Engine, create_engine, event
 from sqlmodel import Session
 
 from backend.config import config
 
-#######################################################################################################################
-# Globals
-#######################################################################################################################
-
-engine = create_engine(config.DATABASE_URL)  # Set echo=True for lots of debug output
-
 #######################################################################################################################
 # Body
 #######################################################################################################################
@@ -39,6 +33,26 @@ def _enable_sqlite_foreign_keys(dbapi_con, con_record):
     dbapi_con.execute("PRAGMA foreign_keys=ON")
 
 
+def create_db_engine(url: str, **kwargs) -> Engine:
+    """
+    Create a SQLAlchemy engine set up as the app's own, with foreign key enforcement for SQLite.
+
+    Args:
+    ----
+        url: The database URL.
+        **kwargs: Further arguments of sqlalchemy.create_engine.
+
+    Returns:
+    -------
+        Engine: The new engine.
+
+    """
+    new_engine = create_engine(url, **kwargs)
+    if url.startswith("sqlite"):
+        event.listen(new_engine, "connect", _enable_sqlite_foreign_keys)
+    return new_engine
+
+
 def get_session():
     """
     Dependency generator that yields a SQLModel Session bound to the app engine.
@@ -94,9 +108,7 @@ def needs_session(func):
     return wrapper
 
 
-if config.DATABASE_URL.startswith("sqlite"):
-    # Enable foreign key enforcement for SQLite
-    event.listen(engine, "connect", _enable_sqlite_foreign_keys)
+engine = create_db_engine(config.DATABASE_URL)  # Pass echo=True for lots of debug output
 
 #######################################################################################################################
 # End of file
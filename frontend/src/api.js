@@ -52,6 +52,13 @@ export async function fetchBreedByName(breedName) {
   return res.data;
 }
 
+export async function suggestBreeds(q, species = '', limit = 10) {
+  const params = { q, limit };
+  if (species) params.species = species;
+  const res = await axiosInstance.get('/api/breed/suggest', { params });
+  return res.data;
+}
+
 // SEXES
 export async function fetchSexes() {
   const res = await axiosInstance.get('/api/sex');
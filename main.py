@@ -7,7 +7,7 @@ This module defines the FastAPI app factory, registers all API routers, and atta
 Run this file directly to start the application with Uvicorn.
 
 - Defines get_app(), which creates and configures the FastAPI app.
-- Registers all API routers (root, case, breed).
+- Registers all API routers (root, case, breed, search).
 - Attaches the lifespan context manager from backend.app.
 - Runs the app with Uvicorn if executed as __main__.
 """
@@ -28,7 +28,8 @@ from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
 from backend.api import api_router, tags_metadata
-from services.fuzzy import fuzzy_match_service
+from services.breeds import breed_catalog
+from services.search import search_service
 from services.static_data.breeds import ensure_cat_breeds, ensure_dog_breeds, ensure_horse_breeds
 
 #######################################################################################################################
@@ -54,9 +55,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     ensure_dog_breeds()
     ensure_cat_breeds()
     ensure_horse_breeds()
+    breed_catalog.invalidate()  # The breeds are seeded without going through the Breed commit listener
+    breed_catalog.snapshot()  # Build the breed indexes before the first request needs them
 
-    # Start fuzzy match refresh loop
-    refresh_task = asyncio.create_task(fuzzy_match_service.refresh_loop())
+    # Start the search refresh loop
+    refresh_task = asyncio.create_task(search_service.refresh_loop())
     app.setup_complete = True
 
     yield
@@ -67,6 +70,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         await refresh_task
     except asyncio.CancelledError:
         pass
+    search_service.close()
 
 
 def get_app() -> FastAPI:
@@ -0,0 +1,244 @@
+#######################################################################################################################
+"""
+In-memory breed reference data.
+
+The breed table is small and only changes when breeds are seeded, so it is read once into memory and shared by every
+request until breeds change:
+
+- normalise_breed_name:
+    Puts a free-text breed name in the form breed names are compared in: lower case, with runs of spaces and punctuation
+    replaced by a single space.
+- BreedCatalog:
+    Holds every breed and a normalised copy of its name, loaded on first use and dropped by invalidate() when breeds
+    are written. get() looks a breed up by ID, so that case responses get their breed without a query. resolve() maps
+    a batch of free-text names to their closest breeds with one rapidfuzz cdist pass over the normalised names.
+    suggest() completes a partly typed name from a sorted index of the name prefixes, falling back to a fuzzy match
+    when no breed name has a word starting with it.
+- breed_catalog:
+    The catalog used by the API, invalidated by the commit listener of Breed.
+"""
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import re
+import threading
+from bisect import bisect_left
+from collections.abc import Iterable
+from itertools import islice
+from typing import NamedTuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+from sqlmodel import Session, select
+
+from database.core.models import Breed, Species
+from database.core.session import needs_session
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+DEFAULT_SUGGESTIONS = 10  # Number of breeds suggested when no limit is given
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+def normalise_breed_name(name: str) -> str:
+    """Return a breed name in lower case with runs of spaces and punctuation replaced by a single space."""
+    return " ".join(re.sub(r"[\W_]+", " ", name.casefold()).split())
+
+
+class BreedMatch(NamedTuple):
+    """A breed matching a free-text breed name."""
+
+    breed_id: int
+    name: str
+    score: float  # rapidfuzz WRatio of the normalised names, from 0 to 100
+
+
+class BreedResolution(NamedTuple):
+    """The closest breeds to a free-text breed name."""
+
+    best: BreedMatch | None  # None if there are no breeds to match against
+    runner_up: BreedMatch | None  # The next closest breed, None if there is only one breed
+
+
+class BreedSnapshot(NamedTuple):
+    """
+    The breeds loaded by a BreedCatalog, sorted by name.
+
+    The prefix index holds each normalised name from each of its words onwards, so "german shepherd dog" is indexed as
+    itself, "shepherd dog" and "dog". Sorted, the entries starting with a prefix are next to each other.
+    """
+
+    breeds: tuple[Breed, ...]
+    by_id: dict[int, Breed]  # Identity map of the breeds
+    names: list[str]  # Normalised name of each breed
+    species: np.ndarray  # Species value of each breed
+    prefixes: list[str]  # Sorted prefix index
+    prefix_breeds: list[tuple[int, int]]  # Number of the word each prefix index entry starts at, and its breed's index
+
+
+class BreedCatalog:
+    """
+    In-memory copy of the breed table.
+
+    The breeds are read on first use and kept until invalidate() is called, by the commit listener of Breed or after
+    breeds are seeded. The loaded Breed objects are detached from their session and must not be modified.
+    """
+
+    def __init__(self):
+        """Start with nothing loaded."""
+        self._lock = threading.Lock()
+        self._snapshot: BreedSnapshot | None = None
+        self._generation = 0  # Number of invalidations, so that a load racing one is not kept
+
+    def invalidate(self, *args) -> None:
+        """Drop the loaded breeds, so that they are read again on next use. Takes and ignores commit listener args."""
+        self._generation += 1
+        self._snapshot = None
+
+    @needs_session
+    def _load(self, session: Session) -> BreedSnapshot:
+        """Read every breed, sorted by name."""
+        breeds = tuple(session.exec(select(Breed).order_by(Breed.name, Breed.id)).all())
+        session.expunge_all()
+        names = [normalise_breed_name(breed.name) for breed in breeds]
+        entries = sorted(
+            (" ".join(words[word:]), word, i)
+            for i, words in enumerate(name.split() for name in names)
+            for word in range(max(len(words), 1))
+        )
+        return BreedSnapshot(
+            breeds,
+            {breed.id: breed for breed in breeds},
+            names,
+            np.array([breed.species.value for breed in breeds]),
+            [prefix for prefix, _, _ in entries],
+            [(word, i) for _, word, i in entries],
+        )
+
+    def snapshot(self) -> BreedSnapshot:
+        """Return the loaded breeds, reading them first if they are not loaded."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    generation = self._generation
+                    snapshot = self._load()
+                    if generation == self._generation:
+                        self._snapshot = snapshot
+        return snapshot
+
+    def get(self, breed_id: int) -> Breed | None:
+        """
+        Return the breed with an ID, without a query if it is loaded.
+
+        A breed written since the breeds were loaded, such as by another process, is not loaded yet: the breeds are read
+        again once if the ID is not found.
+
+        Returns
+        -------
+            Breed | None: The breed, or None if there is no breed with the ID.
+
+        """
+        breed = self.snapshot().by_id.get(breed_id)
+        if breed is None:
+            self.invalidate()
+            breed = self.snapshot().by_id.get(breed_id)
+        return breed
+
+    def resolve(self, names: Iterable[str], species: Species | None = None) -> list[BreedResolution]:
+        """
+        Find the closest breeds to a batch of free-text breed names.
+
+        Each distinct normalised name is scored once against every breed, in a single cdist pass using all CPU cores.
+        Ties go to the breed whose name sorts first.
+
+        Args:
+        ----
+            names (Iterable[str]): Free-text breed names, such as "lab" or "G. Shepherd".
+            species (Species | None): Only match breeds of this species.
+
+        Returns:
+        -------
+            list[BreedResolution]: The best and runner-up breed of each name, in the order of the names.
+
+        """
+        snapshot = self.snapshot()
+        normalised = [normalise_breed_name(name) for name in names]
+        queries = list(dict.fromkeys(normalised))
+        columns = np.arange(len(snapshot.breeds))
+        if species is not None:
+            columns = columns[snapshot.species == species.value]
+        if not queries or not len(columns):
+            return [BreedResolution(None, None)] * len(normalised)
+        breeds = [snapshot.breeds[i] for i in columns]
+        scores = process.cdist(
+            queries, [snapshot.names[i] for i in columns], scorer=fuzz.WRatio, processor=None, workers=-1
+        )
+        ranks = np.argsort(-scores, axis=1, kind="stable")[:, :2]
+        resolutions = {}
+        for row, query in enumerate(queries):
+            best, *runner_up = (BreedMatch(breeds[i].id, breeds[i].name, float(scores[row, i])) for i in ranks[row])
+            resolutions[query] = BreedResolution(best, runner_up[0] if runner_up else None)
+        return [resolutions[name] for name in normalised]
+
+    def suggest(self, query: str, species: Species | None = None, limit: int = DEFAULT_SUGGESTIONS) -> list[BreedMatch]:
+        """
+        Suggest breeds for a partly typed breed name.
+
+        The breeds with a word of their name starting with the normalised query are found by bisecting the sorted prefix
+        index. Those whose name starts with it come first, then those with a later word starting with it, each in name
+        order, all with score 100. If no breed has a word starting with the query, the breeds are ranked by rapidfuzz
+        WRatio instead.
+
+        Args:
+        ----
+            query (str): The partly typed breed name. An empty query suggests the first breeds in name order.
+            species (Species | None): Only suggest breeds of this species.
+            limit (int): Maximum number of breeds to suggest.
+
+        Returns:
+        -------
+            list[BreedMatch]: The suggested breeds, best first.
+
+        """
+        snapshot = self.snapshot()
+        query = normalise_breed_name(query)
+        if not query:
+            ranked = (i for i, breed in enumerate(snapshot.breeds) if species is None or breed.species == species)
+            return [BreedMatch(snapshot.breeds[i].id, snapshot.breeds[i].name, 100.0) for i in islice(ranked, limit)]
+        first_words: dict[int, int] = {}
+        for position in range(bisect_left(snapshot.prefixes, query), len(snapshot.prefixes)):
+            if not snapshot.prefixes[position].startswith(query):
+                break
+            word, i = snapshot.prefix_breeds[position]
+            if species is None or snapshot.species[i] == species.value:
+                first_words[i] = min(word, first_words.get(i, word))
+        if first_words:
+            ranked = sorted(first_words, key=lambda i: (first_words[i], i))[:limit]
+            return [BreedMatch(snapshot.breeds[i].id, snapshot.breeds[i].name, 100.0) for i in ranked]
+        columns = range(len(snapshot.breeds))
+        if species is not None:
+            columns = np.flatnonzero(snapshot.species == species.value)
+        matches = process.extract(
+            query, [snapshot.names[i] for i in columns], scorer=fuzz.WRatio, processor=None, limit=limit
+        )
+        return [
+            BreedMatch(snapshot.breeds[columns[j]].id, snapshot.breeds[columns[j]].name, float(score))
+            for _, score, j in matches
+        ]
+
+
+breed_catalog = BreedCatalog()
+Breed.add_commit_listener(breed_catalog.invalidate)
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
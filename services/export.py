@@ -0,0 +1,204 @@
+#######################################################################################################################
+"""
+Bulk export of clinical cases and breeds.
+
+Exports stream rows straight from a database cursor, a batch at a time, without building ORM objects, so memory use
+does not grow with the number of rows and the first batch is ready before the query has finished:
+
+- EXPORT_QUERIES:
+    The exportable tables: "cases", with the breed name of each case joined in SQL, and "breeds".
+- export:
+    Yields a table as newline-delimited JSON, CSV or Apache Parquet, one chunk of bytes per batch. Each batch is read
+    from the cursor into one list per column; a Parquet export writes each batch as a row group.
+
+Exports can also be written to a file from the command line, from the repository root:
+
+    python -m services.export cases --format parquet --output cases.parquet
+"""
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import argparse
+import csv
+import io
+import json
+import sys
+from collections.abc import Callable, Iterator
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Enum, Integer, Select, select
+
+from database.core import session as db_session
+from database.core.models import Breed, Case
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+EXPORT_BATCH_SIZE = 1000  # Number of rows fetched from the database cursor at a time
+ROW_GROUP_SIZE = 65536  # Number of rows fetched at a time, and written per row group, by Parquet exports
+EXPORT_FORMATS = ("ndjson", "csv", "parquet")
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+def case_export_query() -> Select:
+    """Return the query selecting every case column and the case's breed name, in ID order."""
+    return (
+        select(*Case.__table__.columns, Breed.name.label("breed_name"))
+        .join_from(Case, Breed, Case.breed_id == Breed.id, isouter=True)
+        .order_by(Case.id)
+    )
+
+
+def breed_export_query() -> Select:
+    """Return the query selecting every breed column, in ID order."""
+    return select(*Breed.__table__.columns).order_by(Breed.id)
+
+
+EXPORT_QUERIES: dict[str, Callable[[], Select]] = {"cases": case_export_query, "breeds": breed_export_query}
+
+
+def read_columns(query: Select, batch_size: int) -> Iterator[list[list]]:
+    """
+    Run a query and yield its rows a batch at a time, as one list of values per column.
+
+    The rows are read from a cursor of their own connection, so the generator can outlive the request's session.
+    Enumerations are replaced by their values.
+
+    Args:
+    ----
+        query (Select): Query to run.
+        batch_size (int): Number of rows fetched from the cursor at a time.
+
+    Yields:
+    ------
+        list[list]: The values of each selected column for a batch of rows.
+
+    """
+    enums = [i for i, column in enumerate(query.selected_columns) if isinstance(column.type, Enum)]
+    with db_session.engine.connect() as connection:
+        result = connection.execution_options(yield_per=batch_size).execute(query)
+        for rows in result.partitions():
+            columns = [list(column) for column in zip(*rows, strict=True)]
+            for i in enums:
+                columns[i] = [None if value is None else value.value for value in columns[i]]
+            yield columns
+
+
+def _ndjson(query: Select, batch_size: int) -> Iterator[bytes]:
+    """Yield the rows of a query as newline-delimited JSON objects, a batch at a time."""
+    names = [column.name for column in query.selected_columns]
+    for columns in read_columns(query, batch_size):
+        yield "".join(json.dumps(dict(zip(names, row, strict=True))) + "\n" for row in zip(*columns)).encode()
+
+
+def _csv(query: Select, batch_size: int) -> Iterator[bytes]:
+    """Yield the rows of a query as CSV with a header line, a batch at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(column.name for column in query.selected_columns)
+    for columns in read_columns(query, batch_size):
+        writer.writerows(zip(*columns))
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+class _Chunks(io.RawIOBase):
+    """Write-only file collecting what is written to it until it is drained, for streaming a Parquet file."""
+
+    def __init__(self):
+        """Start with nothing written."""
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        """Return True: the file can be written to."""
+        return True
+
+    def write(self, data) -> int:
+        """Collect some bytes and return their length."""
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        """Return the number of bytes written so far, drained or not. Parquet records offsets from it."""
+        return self._position
+
+    def drain(self) -> bytes:
+        """Return and forget the bytes written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet(query: Select, batch_size: int) -> Iterator[bytes]:
+    """Yield the rows of a query as an Apache Parquet file with one row group per batch, a row group at a time."""
+    schema = pa.schema(
+        (column.name, pa.int64() if isinstance(column.type, Integer) else pa.string())
+        for column in query.selected_columns
+    )
+    sink = _Chunks()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for columns in read_columns(query, batch_size):
+            writer.write_batch(pa.record_batch(columns, schema=schema), row_group_size=batch_size)
+            yield sink.drain()
+    yield sink.drain()
+
+
+EXPORT_WRITERS: dict[str, Callable[[Select, int], Iterator[bytes]]] = {
+    "ndjson": _ndjson,
+    "csv": _csv,
+    "parquet": _parquet,
+}
+
+
+def export(table: str = "cases", fmt: str = "ndjson", batch_size: int | None = None) -> Iterator[bytes]:
+    """
+    Yield every row of an exportable table in a file format.
+
+    Args:
+    ----
+        table (str): Table to export, one of EXPORT_QUERIES.
+        fmt (str): File format, one of EXPORT_FORMATS.
+        batch_size (int | None): Number of rows fetched, and encoded, at a time. Defaults to ROW_GROUP_SIZE for Parquet
+            and EXPORT_BATCH_SIZE otherwise.
+
+    Yields:
+    ------
+        bytes: Consecutive chunks of the exported file, one per batch of rows.
+
+    """
+    if batch_size is None:
+        batch_size = ROW_GROUP_SIZE if fmt == "parquet" else EXPORT_BATCH_SIZE
+    return EXPORT_WRITERS[fmt](EXPORT_QUERIES[table](), batch_size)
+
+
+def main() -> None:
+    """Write an export to a file or to standard output."""
+    parser = argparse.ArgumentParser(description="Export clinical cases or breeds.")
+    parser.add_argument("table", choices=EXPORT_QUERIES, help="Table to export.")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson", help="File format.")
+    parser.add_argument("--output", type=argparse.FileType("wb"), default=sys.stdout.buffer, help="Output file.")
+    parser.add_argument("--batch-size", type=int, default=None, help="Number of rows fetched at a time.")
+    args = parser.parse_args()
+    with args.output:
+        for chunk in export(args.table, args.format, args.batch_size):
+            args.output.write(chunk)
+
+
+if __name__ == "__main__":
+    main()
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
@@ -0,0 +1,151 @@
+#######################################################################################################################
+"""
+Full-text search service for clinical cases.
+
+An alternative to services.fuzzy that keeps no copy of the cases in the application process. Searches run against the
+case_search SQLite FTS5 table (models.CASE_SEARCH_TABLE), which uses the trigram tokenizer and is kept in step with
+the case and breed tables by triggers, so every process and tool sees the same, always current, index. The table and
+its triggers are only created, from the current cases, when the service first starts on a database:
+
+- FtsSearchService:
+    Looks up the cases sharing character trigrams with the query, best bm25 rank first, and scores only those
+    candidates with the same rapidfuzz scorer as the in-memory index. Enabled by setting Config.SEARCH_BACKEND to "fts".
+"""
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import asyncio
+import threading
+
+from rapidfuzz import fuzz, process
+from sqlalchemy import text
+from sqlmodel import Session
+
+from database.core.models import CASE_SEARCH_TABLE, DataVersion, create_case_search
+from database.core.session import needs_session
+from services.fuzzy import FuzzyHit, IndexStatus, case_search_strings, ngrams
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+CANDIDATE_FACTOR = 10  # Number of FTS candidates fetched per requested match
+MIN_CANDIDATES = 200  # Smallest number of FTS candidates fetched for a query
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+def _quote(term: str) -> str:
+    """Return a term quoted as an FTS5 string, so that it is matched literally."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _escape_like(term: str) -> str:
+    """Return a term with the LIKE wildcards escaped with a backslash."""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class FtsSearchService:
+    """
+    Service for fuzzy matching clinical cases inside the database.
+
+    Once created, the FTS5 table is updated by triggers in the same transaction as each write, so it never needs
+    rebuilding. A case is only reported if it shares at least one trigram with the query (or, for queries shorter than
+    a trigram, contains the query), which loses some of the misspelt matches the in-memory index finds.
+    """
+
+    def __init__(self):
+        """Initialise the service, not ready until the search table is known to exist."""
+        self._ready = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        """Return True once the search table exists. From then on, the triggers keep it up to date."""
+        return self._ready.is_set()
+
+    @needs_session
+    def create_table(self, session: Session) -> bool:
+        """Create and fill the search table and its triggers unless they exist, and return True if they were created."""
+        created = create_case_search(session.connection())
+        session.commit()
+        self._ready.set()
+        return created
+
+    @needs_session
+    def status(self, session: Session) -> IndexStatus:
+        """Return the readiness and freshness of the search table."""
+        connection = session.connection()
+        ready = self.ready
+        return IndexStatus(
+            ready=ready,
+            cases=connection.execute(text(f"SELECT count(*) FROM {CASE_SEARCH_TABLE}")).scalar() if ready else 0,
+            generation=0,
+            rebuilt_at=None,
+            rebuild_seconds=None,
+            data_version=DataVersion.current(connection),
+            lag_seconds=0.0,
+        )
+
+    async def reset(self):
+        """Do nothing: there is no cache or index to rebuild."""
+
+    async def refresh_loop(self):
+        """Create the search table if it does not exist yet, then return: the triggers keep it up to date."""
+        await asyncio.to_thread(self.create_table)
+
+    def close(self) -> None:
+        """Release nothing: the search table lives in the database."""
+
+    @needs_session
+    def _candidates(self, query: str, limit: int | None, session: Session) -> list[tuple]:
+        """Return the ID and searchable fields of the cases worth scoring against the query, best candidates first."""
+        grams = ngrams([query])
+        columns = f"SELECT rowid, name, owner, notes, breed FROM {CASE_SEARCH_TABLE}"
+        if grams:
+            statement = text(f"{columns} WHERE {CASE_SEARCH_TABLE} MATCH :match ORDER BY rank LIMIT :limit")
+            params = {"match": " OR ".join(_quote(gram) for gram in sorted(grams)), "limit": limit or -1}
+        else:
+            statement = text(
+                f"{columns} WHERE name LIKE :pattern ESCAPE '\\' OR owner LIKE :pattern ESCAPE '\\' "
+                "OR notes LIKE :pattern ESCAPE '\\' OR breed LIKE :pattern ESCAPE '\\' LIMIT :limit"
+            )
+            params = {"pattern": f"%{_escape_like(query)}%", "limit": limit or -1}
+        return session.connection().execute(statement, params).all()
+
+    def fuzzy_match(
+        self, query: str, min_match_score: int | None, limit: int | None = None, offset: int = 0
+    ) -> list[FuzzyHit]:
+        """
+        Perform a fuzzy search for cases based on the query string.
+
+        Args:
+        ----
+            query (str): String to search for.
+            min_match_score (int | None): Cutoff matching score below which fuzzy matching does not report a case.
+            limit (int | None): Maximum number of matches to return, or None for all matches.
+            offset (int): Number of best matches to skip.
+
+        Returns:
+        -------
+            list[FuzzyHit]: The cases that best match the query in descending order of match quality.
+
+        """
+        query = query.lower()
+        wanted = None if limit is None else max(MIN_CANDIDATES, CANDIDATE_FACTOR * (offset + limit))
+        hits = []
+        for case_id, name, owner, notes, breed in self._candidates(query, wanted):
+            fields = case_search_strings(name, owner, notes, breed)
+            best = process.extractOne(query, fields, scorer=fuzz.WRatio, score_cutoff=min_match_score or 0)
+            if best is not None:
+                hits.append(FuzzyHit(case_id, float(best[1]), best[2]))
+        hits.sort(key=lambda hit: (-hit.score, hit.case_id))
+        return hits[offset:] if limit is None else hits[offset : offset + limit]
+
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
@@ -1,32 +1,59 @@
 #######################################################################################################################
 """
-Case API routes.
-
-This module defines endpoints for creating, retrieving, updating, and deleting clinical cases:
-
-- POST /case/:
-    Create a new case. Accepts a CaseCreate payload and returns the created case.
-- GET /case/:
-    List all cases. Returns a list of CaseRead objects.
-- GET /case/{case_id}:
-    Retrieve a single case by its ID. Returns a CaseRead object or 404 if not found.
-- PUT /case/{case_id}:
-    Update an existing case by its ID. Accepts a CaseUpdate payload and returns the updated case, or 404 if not found.
-- DELETE /case/{case_id}:
-    Delete a case by its ID. Returns 204 on success or 404 if not found.
-
-All endpoints use SQLModel for ORM access and FastAPI dependency injection for database sessions.
+Fuzzy matching service for clinical cases.
+
+This module keeps an in-memory search index of the free-text fields of every case (name, owner, notes and breed name)
+and answers fuzzy queries against it:
+
+- NgramIndex:
+    Inverted index from character trigrams to sorted arrays of case IDs, used to pre-filter candidates.
+- FuzzyIndex:
+    Flattened, vectorised index. The per-case strings live in one contiguous list with a parallel array of group
+    offsets and owning case IDs, so the candidates of a query are scored with a single batched rapidfuzz call. Breed
+    names are stored once and scored once per query. Cases can be upserted and removed in place.
+- ShardedFuzzyIndex:
+    Same interface, with the cases split across FuzzyIndex shards living in worker processes so that queries use
+    several cores. Enabled by setting Config.FUZZY_SHARDS above 1.
+- FuzzyMatchService:
+    Owns the current index and caches query results. Queries are scored outside the service lock, so they run
+    alongside each other and only wait for the writes being applied to the index. Case writes are pushed into the
+    index after they commit, and a full rebuild, run in a worker thread when the data version shows writes made
+    outside this process, reconciles the index with them. Every full rebuild is saved as a snapshot file
+    (Config.FUZZY_SNAPSHOT_PATH) that is memory-mapped at the next start-up, so that the service is ready straight
+    away if the database has not changed in between.
 """
 
 import asyncio
+import heapq
+import itertools
+import json
+import logging
+import math
+import mmap
+import multiprocessing
+import os
+import struct
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import NamedTuple
 
 #######################################################################################################################
 # Imports
 #######################################################################################################################
-from cachetools import TTLCache, cached
-from rapidfuzz import process
+import numpy as np
+from cachetools import LRUCache
+from rapidfuzz import fuzz, process
+from sqlmodel import Session
 
-from database.core.models import Case
+from backend.config import config
+from database.core.helpers import DataVersions, RecordChange
+from database.core.models import Breed, Case, DataVersion
 from database.core.session import needs_session
 
 #######################################################################################################################
@@ -34,94 +61,1111 @@ from database.core.session import needs_session
 #######################################################################################################################
 
 CACHE_SIZE = 128
-REFRESH_INTERVAL = 5  # Number of seconds between cache refreshes
+INVALIDATE_MAX_PAIRS = 16384  # Cached queries times new strings above which a write clears the cache, not re-scores it
+SEARCH_FIELDS = ("name", "owner", "notes", "breed")  # Searchable case fields, in the order they are indexed
+POLL_INTERVAL = 5  # Number of seconds between checks of the data version for writes made by other processes
+COMPACT_MIN_DEAD = 1024  # Minimum number of removed cases before the index is compacted
+COMPACT_RATIO = 0.25  # Fraction of removed cases to live cases above which the index is compacted
+NGRAM = 3  # Length of the character n-grams used to pre-filter candidates
+FULL_SCAN_RATIO = 0.5  # Fraction of the index above which candidates are not worth gathering and every case is scored
+NGRAM_PENDING_LIMIT = 65536  # Number of pending postings above which they are merged into the posting arrays
+WORKER_STOP_TIMEOUT = 5  # Number of seconds to wait for a shard worker process to stop before terminating it
+SNAPSHOT_MAGIC = b"FZIX"  # First bytes of an index snapshot file
+SNAPSHOT_VERSION = 2  # Bumped whenever the snapshot layout changes, so that older snapshots are rebuilt
+SNAPSHOT_ALIGN = 8  # Byte alignment of the arrays in a snapshot file
+
+logger = logging.getLogger(__name__)
 
 #######################################################################################################################
 # Body
 #######################################################################################################################
 
 
+class FuzzyHit(NamedTuple):
+    """A case matching a fuzzy query."""
+
+    case_id: int
+    score: float
+    field: str  # The searchable field that matched best, one of SEARCH_FIELDS
+
+
+def case_search_strings(
+    name: str | None, owner: str | None, notes: str | None, breed_name: str | None
+) -> dict[str, str]:
+    """
+    Return the lowercased searchable strings of a case.
+
+    Args:
+    ----
+        name (str | None): Case name.
+        owner (str | None): Owner of the animal.
+        notes (str | None): Additional notes.
+        breed_name (str | None): Name of the case's breed.
+
+    Returns:
+    -------
+        dict[str, str]: The non-empty fields, lowercased, keyed by their name in SEARCH_FIELDS.
+
+    """
+    values = (name, owner, notes, breed_name)
+    return {field: value.lower() for field, value in zip(SEARCH_FIELDS, values, strict=True) if value}
+
+
+def ngrams(strings: Iterable[str]) -> set[str]:
+    """
+    Return the distinct character n-grams of some strings.
+
+    Args:
+    ----
+        strings (Iterable[str]): Lowercased strings.
+
+    Returns:
+    -------
+        set[str]: Every substring of length NGRAM. Strings shorter than NGRAM contribute nothing.
+
+    """
+    return {string[i : i + NGRAM] for string in strings for i in range(len(string) - NGRAM + 1)}
+
+
+def _pack_strings(strings: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Return the UTF-8 encoded concatenation of some strings and the character offsets of their boundaries."""
+    lengths = np.fromiter((len(string) for string in strings), dtype=np.int64, count=len(strings))
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    return np.frombuffer("".join(strings).encode(), dtype=np.uint8), offsets
+
+
+def _unpack_strings(data: np.ndarray, offsets: np.ndarray) -> list[str]:
+    """Return the strings packed by _pack_strings."""
+    text = data.tobytes().decode()
+    bounds = offsets.tolist()
+    return [text[start:end] for start, end in itertools.pairwise(bounds)]
+
+
+def write_snapshot(path: Path, fingerprint: str, arrays: dict[str, np.ndarray]) -> None:
+    """
+    Write named arrays to a snapshot file that read_snapshot can memory-map.
+
+    The file holds SNAPSHOT_MAGIC, the length of a JSON header, the header itself (version, database fingerprint and the
+    dtype, offset and length of each array) and then the raw arrays, each aligned to SNAPSHOT_ALIGN bytes. It is written
+    to a temporary file that then replaces ``path``, so readers never see a partial snapshot.
+
+    Args:
+    ----
+        path (Path): Snapshot file to write.
+        fingerprint (str): Fingerprint of the database contents the arrays were built from.
+        arrays (dict[str, np.ndarray]): One-dimensional arrays to save, by name.
+
+    """
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        offset = -(-offset // SNAPSHOT_ALIGN) * SNAPSHOT_ALIGN
+        layout[name] = (array.dtype.str, offset, len(array))
+        offset += array.nbytes
+    header = json.dumps({"version": SNAPSHOT_VERSION, "fingerprint": fingerprint, "arrays": layout}).encode()
+    prefix = SNAPSHOT_MAGIC + struct.pack("<I", len(header)) + header
+    data_start = -(-len(prefix) // SNAPSHOT_ALIGN) * SNAPSHOT_ALIGN
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tmp_path.open("wb") as file:
+        file.write(prefix.ljust(data_start, b"\0"))
+        for name, array in arrays.items():
+            file.seek(data_start + layout[name][1])
+            file.write(np.ascontiguousarray(array).tobytes())
+    tmp_path.replace(path)
+
+
+def read_snapshot(path: Path, fingerprint: str) -> dict[str, np.ndarray] | None:
+    """
+    Memory-map a snapshot file written by write_snapshot.
+
+    The file is mapped copy-on-write: the arrays share the operating system's page cache with every other process that
+    maps the same snapshot, and writing to an array only copies the touched pages into this process. Callers that turn
+    the arrays into Python objects, such as FuzzyIndex.load decoding the string table, hold private copies of them.
+
+    Args:
+    ----
+        path (Path): Snapshot file to read.
+        fingerprint (str): Fingerprint of the current database contents.
+
+    Returns:
+    -------
+        dict[str, np.ndarray] | None: The saved arrays by name, or None if the file is missing, unreadable, from another
+            SNAPSHOT_VERSION or built from different database contents.
+
+    """
+    try:
+        with path.open("rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        if buffer[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            return None
+        (header_length,) = struct.unpack_from("<I", buffer, len(SNAPSHOT_MAGIC))
+        header_start = len(SNAPSHOT_MAGIC) + struct.calcsize("<I")
+        header = json.loads(buffer[header_start : header_start + header_length])
+        if header["version"] != SNAPSHOT_VERSION or header["fingerprint"] != fingerprint:
+            return None
+        data_start = -(-(header_start + header_length) // SNAPSHOT_ALIGN) * SNAPSHOT_ALIGN
+        return {
+            name: np.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + offset)
+            for name, (dtype, offset, count) in header["arrays"].items()
+        }
+    except (OSError, ValueError, KeyError, struct.error):  # Missing, truncated or corrupt snapshots are rebuilt
+        return None
+
+
+class NgramIndex:
+    """
+    Inverted index from character n-grams to the IDs of the cases whose strings contain them.
+
+    Each posting list is a compact sorted int32 array. Cases added after the last freeze are kept in small pending lists
+    that are merged into the arrays in batches. Postings are never removed: callers must discard candidates that are no
+    longer live, and rebuild the index to drop stale postings.
+    """
+
+    def __init__(self):
+        """Initialise an empty index."""
+        self._postings: dict[str, np.ndarray] = {}
+        self._pending: dict[str, list[int]] = defaultdict(list)
+        self._pending_count = 0
+
+    def add(self, case_id: int, strings: list[str]) -> None:
+        """
+        Add the n-grams of a case's strings to the index.
+
+        Args:
+        ----
+            case_id (int): The case ID.
+            strings (list[str]): Lowercased searchable strings of the case.
+
+        """
+        for gram in ngrams(strings):
+            self._pending[gram].append(case_id)
+            self._pending_count += 1
+
+    @property
+    def pending_count(self) -> int:
+        """Return the number of postings not yet merged into the posting arrays."""
+        return self._pending_count
+
+    def freeze(self) -> None:
+        """Merge the pending postings into the sorted posting arrays."""
+        for gram, case_ids in self._pending.items():
+            added = np.asarray(case_ids, dtype=np.int32)
+            posting = self._postings.get(gram)
+            self._postings[gram] = np.unique(added) if posting is None else np.union1d(posting, added)
+        self._pending.clear()
+        self._pending_count = 0
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Freeze the index and return it as flat arrays, for saving in a snapshot."""
+        self.freeze()
+        grams, gram_offsets = _pack_strings(list(self._postings))
+        lengths = np.fromiter((len(posting) for posting in self._postings.values()), dtype=np.int64)
+        return {
+            "grams": grams,
+            "gram_offsets": gram_offsets,
+            "posting_offsets": np.concatenate(([0], np.cumsum(lengths))),
+            "postings": np.concatenate([np.empty(0, dtype=np.int32), *self._postings.values()]),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray]) -> "NgramIndex":
+        """Rebuild an index from the arrays returned by to_arrays. The posting arrays are views into them."""
+        index = cls()
+        grams = _unpack_strings(arrays["grams"], arrays["gram_offsets"])
+        offsets, postings = arrays["posting_offsets"].tolist(), arrays["postings"]
+        index._postings = {
+            gram: postings[start:end] for gram, (start, end) in zip(grams, itertools.pairwise(offsets), strict=True)
+        }
+        return index
+
+    def candidates(self, grams: set[str], min_shared: int) -> np.ndarray:
+        """
+        Return the IDs of the cases that share at least ``min_shared`` of the given n-grams.
+
+        Args:
+        ----
+            grams (set[str]): N-grams of the query.
+            min_shared (int): Minimum number of n-grams a case must share with the query.
+
+        Returns:
+        -------
+            np.ndarray: Sorted candidate case IDs.
+
+        """
+        postings = []
+        for gram in grams:
+            posting = self._postings.get(gram, np.empty(0, dtype=np.int32))
+            if gram in self._pending:
+                posting = np.union1d(posting, np.asarray(self._pending[gram], dtype=np.int32))
+            postings.append(posting)
+        if not postings:
+            return np.empty(0, dtype=np.int32)
+        case_ids, counts = np.unique(np.concatenate(postings), return_counts=True)
+        return case_ids[counts >= min_shared]
+
+
+class FuzzyIndex:
+    """
+    Vectorised fuzzy search index over the searchable strings of many cases.
+
+    The per-case strings (name, owner and notes) of each case are stored contiguously in a single flat list, with a
+    parallel ``_field_codes`` array recording which field each string came from. ``_starts`` and ``_ends`` hold the
+    offsets of the strings of every case and ``_case_ids`` the owning case ID, so the per-case best score can be
+    computed with a single ``np.maximum.reduceat`` over the flat score vector.
+
+    Breed names are shared by many cases, so each distinct breed name is stored once in ``_breed_strings`` and every
+    case only holds the code of its breed in ``_breed_codes``. A query scores the few hundred breed names once, and the
+    breed scores are spread to the cases by indexing with their breed codes.
+
+    An n-gram index built alongside the per-case strings can narrow a query down to the cases sharing at least
+    Config.FUZZY_MIN_GRAM_OVERLAP of its n-grams, so only those are scored, plus the cases of every matching breed. This
+    pre-filter misses weak matches, so it is off unless that setting is above 0. Queries too short to have n-grams, or
+    whose candidates cover most of the index, are scored against every case.
+
+    Upserts append a new group and removals mark the old group's case ID as -1. Dead groups are never reported, and are
+    dropped when the index is compacted.
+
+    The index can be saved to a snapshot file and loaded back with its arrays memory-mapped, which is much faster than
+    building it. Processes loading the same snapshot share the pages of the numeric arrays and n-gram postings, but
+    rapidfuzz scores Python strings, so each process decodes its own copy of the string table and builds its own slot
+    and n-gram dictionaries: most of a loaded index is private to its process (see benchmarks/fuzzy_snapshot.py).
+    """
+
+    def __init__(self, entries: Iterable[tuple[int, dict[str, str]]] = ()):
+        """
+        Build the index.
+
+        Args:
+        ----
+            entries (Iterable[tuple[int, dict[str, str]]]): Pairs of case ID and lowercased searchable strings keyed by
+                field name, as returned by case_search_strings. Cases without any searchable string are skipped.
+
+        """
+        self._clear()
+        for case_id, fields in entries:
+            self._append(case_id, fields)
+        self._grams.freeze()
+
+    def _clear(self) -> None:
+        """Empty the index."""
+        self._strings: list[str] = []
+        self._field_codes = bytearray()
+        self._starts = np.empty(0, dtype=np.int64)
+        self._ends = np.empty(0, dtype=np.int64)
+        self._case_ids = np.empty(0, dtype=np.int64)
+        self._breed_codes = np.empty(0, dtype=np.int32)  # Index into _breed_strings, or -1 for cases without a breed
+        self._breed_strings: list[str] = []
+        self._breeds: dict[str, int] = {}  # Breed code of each breed string
+        self._groups = 0
+        self._slots: dict[int, int] = {}
+        self._grams = NgramIndex()
+
+    def __len__(self) -> int:
+        """Return the number of cases in the index."""
+        return len(self._slots)
+
+    def __contains__(self, case_id: int) -> bool:
+        """Return True if the case is in the index."""
+        return case_id in self._slots
+
+    def entries(self) -> Iterator[tuple[int, dict[str, str]]]:
+        """Yield the case ID and searchable strings of every case in the index."""
+        for slot in sorted(self._slots.values()):
+            start, end = self._starts[slot], self._ends[slot]
+            codes = self._field_codes[start:end]
+            fields = dict(zip((SEARCH_FIELDS[code] for code in codes), self._strings[start:end], strict=True))
+            if self._breed_codes[slot] >= 0:
+                fields["breed"] = self._breed_strings[self._breed_codes[slot]]
+            yield int(self._case_ids[slot]), fields
+
+    def upsert(self, case_id: int, fields: dict[str, str]) -> None:
+        """
+        Add a case to the index, or replace its strings if it is already present.
+
+        Args:
+        ----
+            case_id (int): The case ID.
+            fields (dict[str, str]): Lowercased searchable strings keyed by field name. An empty dict removes the case.
+
+        """
+        self.remove(case_id)
+        self._append(case_id, fields)
+        if self._grams.pending_count > NGRAM_PENDING_LIMIT:
+            self._grams.freeze()
+
+    def _append(self, case_id: int, fields: dict[str, str]) -> None:
+        """Append the strings of a case that is not in the index as a new group."""
+        if not fields:
+            return
+        if self._groups == len(self._starts):
+            capacity = max(2 * self._groups, 1024)
+            self._starts = np.resize(self._starts, capacity)
+            self._ends = np.resize(self._ends, capacity)
+            self._case_ids = np.resize(self._case_ids, capacity)
+            self._breed_codes = np.resize(self._breed_codes, capacity)
+        texts = {field: string for field, string in fields.items() if field != "breed"}
+        breed = fields.get("breed")
+        if breed is not None and breed not in self._breeds:
+            self._breeds[breed] = len(self._breed_strings)
+            self._breed_strings.append(breed)
+        self._starts[self._groups] = len(self._strings)
+        self._ends[self._groups] = len(self._strings) + len(texts)
+        self._case_ids[self._groups] = case_id
+        self._breed_codes[self._groups] = -1 if breed is None else self._breeds[breed]
+        self._slots[case_id] = self._groups
+        self._groups += 1
+        self._strings.extend(texts.values())
+        self._field_codes.extend(SEARCH_FIELDS.index(field) for field in texts)
+        self._grams.add(case_id, list(texts.values()))
+
+    def remove(self, case_id: int) -> None:
+        """
+        Remove a case from the index, if present.
+
+        Args:
+        ----
+            case_id (int): The case ID.
+
+        """
+        slot = self._slots.pop(case_id, None)
+        if slot is None:
+            return
+        self._case_ids[slot] = -1
+        dead = self._groups - len(self._slots)
+        if dead > max(COMPACT_MIN_DEAD, COMPACT_RATIO * len(self._slots)):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rebuild the flat arrays and n-gram index without the strings of removed cases."""
+        entries = list(self.entries())
+        self._clear()
+        for case_id, fields in entries:
+            self._append(case_id, fields)
+        self._grams.freeze()
+
+    def save(self, path: Path, fingerprint: str) -> None:
+        """
+        Save the index to a snapshot file, compacting it first.
+
+        Args:
+        ----
+            path (Path): Snapshot file to write.
+            fingerprint (str): Fingerprint of the database contents the index was built from.
+
+        """
+        if self._groups > len(self._slots):
+            self._compact()
+        strings, string_offsets = _pack_strings(self._strings)
+        breed_strings, breed_string_offsets = _pack_strings(self._breed_strings)
+        arrays = {
+            "strings": strings,
+            "string_offsets": string_offsets,
+            "field_codes": np.frombuffer(bytes(self._field_codes), dtype=np.uint8),
+            "starts": self._starts[: self._groups],
+            "ends": self._ends[: self._groups],
+            "case_ids": self._case_ids[: self._groups],
+            "breed_codes": self._breed_codes[: self._groups],
+            "breed_strings": breed_strings,
+            "breed_string_offsets": breed_string_offsets,
+        }
+        write_snapshot(path, fingerprint, arrays | self._grams.to_arrays())
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: str) -> "FuzzyIndex | None":
+        """
+        Load an index saved by save, if it was built from the current database contents.
+
+        Args:
+        ----
+            path (Path): Snapshot file to read.
+            fingerprint (str): Fingerprint of the current database contents.
+
+        Returns:
+        -------
+            FuzzyIndex | None: The index, or None if there is no valid snapshot for this fingerprint.
+
+        """
+        arrays = read_snapshot(path, fingerprint)
+        if arrays is None:
+            return None
+        index = cls()
+        index._strings = _unpack_strings(arrays["strings"], arrays["string_offsets"])
+        index._field_codes = bytearray(arrays["field_codes"])
+        index._starts, index._ends, index._case_ids = arrays["starts"], arrays["ends"], arrays["case_ids"]
+        index._breed_codes = arrays["breed_codes"]
+        index._breed_strings = _unpack_strings(arrays["breed_strings"], arrays["breed_string_offsets"])
+        index._breeds = {breed: code for code, breed in enumerate(index._breed_strings)}
+        index._groups = len(index._case_ids)
+        index._slots = dict(zip(index._case_ids.tolist(), range(index._groups), strict=True))
+        index._grams = NgramIndex.from_arrays(arrays)
+        return index
+
+    def _candidate_slots(self, query: str, cutoff: float) -> np.ndarray | None:
+        """Return the slots of the cases worth scoring against the query, or None if every case should be scored."""
+        grams = ngrams([query])
+        if not grams or not cutoff or not config.FUZZY_MIN_GRAM_OVERLAP:
+            return None
+        min_shared = max(1, math.ceil(len(grams) * config.FUZZY_MIN_GRAM_OVERLAP))
+        slots = [self._slots.get(case_id) for case_id in self._grams.candidates(grams, min_shared).tolist()]
+        if len(slots) > FULL_SCAN_RATIO * len(self._slots):
+            return None
+        return np.asarray([slot for slot in slots if slot is not None], dtype=np.int64)
+
+    def _score_breeds(self, query: str, cutoff: float) -> np.ndarray:
+        """Return the score of every breed string against the query, followed by a 0 for cases without a breed."""
+        scores = np.zeros(len(self._breed_strings) + 1, dtype=np.float32)
+        if self._breed_strings:
+            scores[:-1] = process.cdist(
+                [query], self._breed_strings, scorer=fuzz.WRatio, score_cutoff=cutoff, dtype=np.float32
+            )[0]
+        return scores
+
+    def close(self) -> None:
+        """Release the resources held by the index. An in-process index holds none."""
+
+    def search(
+        self, query: str, min_match_score: float | None = None, limit: int | None = None, exhaustive: bool = False
+    ) -> list[FuzzyHit]:
+        """
+        Score the cases against the query and return the best matches.
+
+        Args:
+        ----
+            query (str): Lowercased string to search for.
+            min_match_score (float | None): Cutoff score below which a case is not reported.
+            limit (int | None): Maximum number of matches to return, or None for all matches.
+            exhaustive (bool): Score every case even if Config.FUZZY_MIN_GRAM_OVERLAP enables the n-gram pre-filter.
+
+        Returns:
+        -------
+            list[FuzzyHit]: Matching cases in descending order of match quality, ties in ascending case ID order. With a
+                limit, the first ``limit`` matches of that order, so that longer limits extend shorter ones.
+
+        """
+        if not self._slots:
+            return []
+        cutoff = min_match_score or 0
+        breed_scores = self._score_breeds(query, cutoff)
+        slots = None if exhaustive else self._candidate_slots(query, cutoff)
+        if slots is None:
+            slots = np.arange(self._groups)
+            strings, field_codes = self._strings, self._field_codes
+            starts, ends = self._starts[: self._groups], self._ends[: self._groups]
+        else:
+            # Cases of a matching breed are reported on their breed score, without scoring their own strings
+            breed_slots = np.flatnonzero(np.isin(self._breed_codes[: self._groups], np.flatnonzero(breed_scores[:-1])))
+            ranges = [range(self._starts[slot], self._ends[slot]) for slot in slots.tolist()]
+            strings = [self._strings[i] for r in ranges for i in r]
+            field_codes = [self._field_codes[i] for r in ranges for i in r]
+            ends = np.cumsum(self._ends[slots] - self._starts[slots])
+            starts = ends - (self._ends[slots] - self._starts[slots])
+            breed_slots = np.setdiff1d(breed_slots, slots)
+            slots = np.concatenate((slots, breed_slots))
+            starts = np.concatenate((starts, np.full(len(breed_slots), len(strings))))
+            ends = np.concatenate((ends, np.full(len(breed_slots), len(strings))))
+        if not len(slots):
+            return []
+        scores = np.zeros(len(strings) + 1, dtype=np.float32)  # Trailing 0 so that empty trailing groups can be reduced
+        if strings:
+            scores[:-1] = process.cdist([query], strings, scorer=fuzz.WRatio, score_cutoff=cutoff, dtype=np.float32)[0]
+        text_best = np.maximum.reduceat(scores, starts)
+        text_best[starts == ends] = 0
+        breed_best = breed_scores[self._breed_codes[slots]]
+        best = np.maximum(text_best, breed_best)
+        case_ids = self._case_ids[slots]
+        hits = np.flatnonzero((best >= cutoff) & (case_ids >= 0))
+        if limit is not None and 0 < limit < len(hits):
+            # Keep every case tied with the k-th best score, so that the best k are the head of the full ranking
+            kth_best = np.partition(best[hits], len(hits) - limit)[len(hits) - limit]
+            hits = hits[best[hits] >= kth_best]
+        hits = hits[np.lexsort((case_ids[hits], -best[hits]))][:limit].tolist()
+        return [
+            FuzzyHit(
+                int(case_ids[hit]),
+                float(best[hit]),
+                "breed"
+                if breed_best[hit] > text_best[hit] or starts[hit] == ends[hit]
+                else SEARCH_FIELDS[field_codes[starts[hit] + int(np.argmax(scores[starts[hit] : ends[hit]]))]],
+            )
+            for hit in hits
+        ]
+
+
+def _serve_shard(conn: Connection) -> None:
+    """
+    Run one shard of a ShardedFuzzyIndex in a worker process.
+
+    Receives ``(method, args)`` requests on the pipe, calls the method on the shard's FuzzyIndex and sends back
+    ``(True, result)``, or ``(False, exception)`` if the call raised. A ``"build"`` request replaces the index with a
+    new one built from the given entries, a ``"load"`` request replaces it with a snapshot and returns whether the
+    snapshot was valid, and None stops the worker.
+
+    Args:
+    ----
+        conn (Connection): The worker's end of the pipe to the parent process.
+
+    """
+    index = FuzzyIndex()
+    while (request := conn.recv()) is not None:
+        method, args = request
+        try:
+            if method == "build":
+                index, result = FuzzyIndex(*args), None
+            elif method == "load":
+                loaded = FuzzyIndex.load(*args)
+                index, result = (index, False) if loaded is None else (loaded, True)
+            else:
+                result = getattr(index, method)(*args)
+                if method == "entries":
+                    result = list(result)
+        except Exception as exc:  # Any error is passed back to the caller
+            conn.send((False, exc))
+        else:
+            conn.send((True, result))
+    conn.close()
+
+
+class ShardedFuzzyIndex:
+    """
+    Fuzzy search index split into shards that each live in a worker process.
+
+    Case ``case_id`` belongs to shard ``case_id % shards``. Upserts and removals are sent to the owning shard and update
+    its index in place. Queries are sent to every shard at once, so they are scored in parallel on separate cores, and
+    the per-shard top-k lists are merged. Has the same interface as FuzzyIndex, and each shard is saved to and loaded
+    from its own snapshot file.
+    """
+
+    def __init__(self, entries: Iterable[tuple[int, dict[str, str]]] = (), shards: int = 2):
+        """
+        Start the shard worker processes and build their indexes.
+
+        Args:
+        ----
+            entries (Iterable[tuple[int, dict[str, str]]]): Pairs of case ID and searchable strings, as for FuzzyIndex.
+            shards (int): Number of shards, and so of worker processes.
+
+        """
+        context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._conns: list[Connection] = []
+        self._workers = []
+        for _ in range(shards):
+            conn, worker_conn = context.Pipe()
+            worker = context.Process(target=_serve_shard, args=(worker_conn,), daemon=True)
+            worker.start()
+            worker_conn.close()
+            self._conns.append(conn)
+            self._workers.append(worker)
+        partitions = [[] for _ in range(shards)]
+        for case_id, fields in entries:
+            partitions[case_id % shards].append((case_id, fields))
+        self._call_all("build", [(partition,) for partition in partitions])
+
+    @staticmethod
+    def _shard_paths(path: Path, shards: int) -> list[Path]:
+        """Return the snapshot file of each shard of an index saved to ``path``."""
+        return [path.with_name(f"{path.name}.{shard}-of-{shards}") for shard in range(shards)]
+
+    def save(self, path: Path, fingerprint: str) -> None:
+        """Save each shard to its own snapshot file. See FuzzyIndex.save."""
+        paths = self._shard_paths(path, len(self._conns))
+        self._call_all("save", [(shard_path, fingerprint) for shard_path in paths])
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: str, shards: int = 2) -> "ShardedFuzzyIndex | None":
+        """Start the shard worker processes and load their snapshots. See FuzzyIndex.load."""
+        index = cls(shards=shards)
+        if all(index._call_all("load", [(shard_path, fingerprint) for shard_path in cls._shard_paths(path, shards)])):
+            return index
+        index.close()
+        return None
+
+    def _call(self, case_id: int, method: str, *args):
+        """Call an index method on the shard owning a case and return its result."""
+        conn = self._conns[case_id % len(self._conns)]
+        with self._lock:
+            conn.send((method, args))
+            ok, result = conn.recv()
+        if not ok:
+            raise result
+        return result
+
+    def _call_all(self, method: str, args: list[tuple]) -> list:
+        """Call an index method on every shard in parallel, with one tuple of arguments per shard."""
+        with self._lock:
+            for conn, shard_args in zip(self._conns, args, strict=True):
+                conn.send((method, shard_args))
+            replies = [conn.recv() for conn in self._conns]
+        for ok, result in replies:
+            if not ok:
+                raise result
+        return [result for _, result in replies]
+
+    def __len__(self) -> int:
+        """Return the number of cases in the index."""
+        return sum(self._call_all("__len__", [()] * len(self._conns)))
+
+    def __contains__(self, case_id: int) -> bool:
+        """Return True if the case is in the index."""
+        return self._call(case_id, "__contains__", case_id)
+
+    def entries(self) -> Iterator[tuple[int, dict[str, str]]]:
+        """Yield the case ID and searchable strings of every case in the index."""
+        for shard_entries in self._call_all("entries", [()] * len(self._conns)):
+            yield from shard_entries
+
+    def upsert(self, case_id: int, fields: dict[str, str]) -> None:
+        """Add a case to its shard, or replace its strings. See FuzzyIndex.upsert."""
+        self._call(case_id, "upsert", case_id, fields)
+
+    def remove(self, case_id: int) -> None:
+        """Remove a case from its shard, if present. See FuzzyIndex.remove."""
+        self._call(case_id, "remove", case_id)
+
+    def search(
+        self, query: str, min_match_score: float | None = None, limit: int | None = None, exhaustive: bool = False
+    ) -> list[FuzzyHit]:
+        """
+        Search every shard in parallel and merge their best matches. See FuzzyIndex.search.
+
+        Each shard returns the head of its own ranking, in (descending score, ascending case ID) order, so merging them
+        in that order and keeping the first ``limit`` gives the head of the ranking of the whole index.
+        """
+        args = (query, min_match_score, limit, exhaustive)
+        shard_hits = self._call_all("search", [args] * len(self._conns))
+        hits = heapq.merge(*shard_hits, key=lambda hit: (-hit.score, hit.case_id))
+        return list(itertools.islice(hits, limit))
+
+    def close(self) -> None:
+        """Stop the shard worker processes."""
+        with self._lock:
+            for conn in self._conns:
+                conn.send(None)
+                conn.close()
+        for worker in self._workers:
+            worker.join(timeout=WORKER_STOP_TIMEOUT)
+            if worker.is_alive():
+                worker.terminate()
+
+
+class ReadWriteLock:
+    """
+    Lock held by any number of readers at once, or by one writer alone.
+
+    Waiting writers go before new readers, so that a steady stream of readers cannot starve them.
+    """
+
+    def __init__(self):
+        """Initialise an unlocked lock."""
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writers = 0  # Writers waiting for the lock or holding it
+        self._writing = False
+
+    def acquire_read(self) -> None:
+        """Wait until no writer holds or waits for the lock, then take a read hold on it."""
+        with self._condition:
+            self._condition.wait_for(lambda: not self._writers)
+            self._readers += 1
+
+    def release_read(self) -> None:
+        """Release a read hold taken by acquire_read."""
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Hold the lock alone for the body of a with statement."""
+        with self._condition:
+            self._writers += 1
+            self._condition.wait_for(lambda: not self._readers and not self._writing)
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._writers -= 1
+                self._condition.notify_all()
+
+
+class LoadedIndex(NamedTuple):
+    """A newly built or loaded index, with what it was built from."""
+
+    index: "FuzzyIndex | ShardedFuzzyIndex"
+    breed_names: dict[int, str]
+    version: int | None  # Data version read before the index was built (see models.DataVersion)
+
+
+class IndexStatus(NamedTuple):
+    """Readiness and freshness of the fuzzy search index."""
+
+    ready: bool  # True once a valid index is loaded
+    cases: int  # Number of cases in the index
+    generation: int  # Number of times the index has been rebuilt or loaded from a snapshot
+    rebuilt_at: datetime | None  # When the database was read for the current generation
+    rebuild_seconds: float | None  # How long building or loading the current generation took
+    data_version: int | None  # Data version the index is known to be up to date with, or None if it may be stale
+    lag_seconds: float | None  # How long the last write took from commit to being searchable, see FuzzyMatchService
+
+
 class FuzzyMatchService:
-    """Service for fuzzy matching clinical cases."""
+    """
+    Service for fuzzy matching clinical cases.
+
+    The index is rebuilt in a worker thread into a new index object, while the current one keeps serving queries. The
+    new index is then published by a single reference swap, so queries see either the old generation or the new one.
+
+    lag_seconds measures writes made through this process from their commit to the end of applying them. Writes made
+    by other processes are only found by polling, so for those it is an upper bound: the time from the last poll that
+    found the index up to date until the rebuild that picked them up was published.
+
+    The service lock only guards the service's own state. Queries hold the index lock for reading while they score, so
+    any number run at once, and the writes pushed into the index, or closing a replaced index, hold it for writing.
+    """
 
     def __init__(self):
-        """Initialise the fuzzy match service with an empty mapping."""
-        self._map = {}
+        """Initialise the fuzzy match service with an empty index."""
+        self._index = FuzzyIndex()
+        self._breed_names: dict[int, str] = {}
+        self._cache: LRUCache = LRUCache(maxsize=CACHE_SIZE)
+        self._lock = threading.RLock()
+        self._index_lock = ReadWriteLock()  # Held for reading while a query scores, and for writing to change the index
+        self._changes = 0  # Number of changes to the index, so that results scored across a change are not cached
+        self._rebuild_lock = threading.Lock()  # Serialises rebuilds, so they do not supersede each other
+        self._journal: list[tuple[list[RecordChange], DataVersions | None]] | None = None  # Changes made during rebuild
+        self._version: int | None = None  # Data version the index is up to date with, None if unknown
+        self._ready = threading.Event()  # Set once an index built from, or validated against, the database is loaded
+        self._generation = 0
+        self._rebuilt_at: datetime | None = None
+        self._rebuild_seconds: float | None = None
+        self._lag_seconds: float | None = None
+        self._checked_at: float | None = None  # time.time() when the index was last known to be up to date
+
+    @property
+    def ready(self) -> bool:
+        """Return True once a valid index is loaded. Until then, searches would miss cases."""
+        return self._ready.is_set()
+
+    def status(self) -> IndexStatus:
+        """Return the readiness and freshness of the index."""
+        with self._lock:
+            return IndexStatus(
+                ready=self.ready,
+                cases=len(self._index),
+                generation=self._generation,
+                rebuilt_at=self._rebuilt_at,
+                rebuild_seconds=self._rebuild_seconds,
+                data_version=self._version,
+                lag_seconds=self._lag_seconds,
+            )
 
     async def reset(self):
-        """Clear the fuzzy match cache and refresh the mapping."""
-        await self.refresh()
-        self.fuzzy_match_ids.cache_clear()
+        """Clear the fuzzy match cache and rebuild the index."""
+        await self.refresh(force=True)
+
+    @needs_session
+    def _current_version(self, session: Session) -> int | None:
+        """Return the current data version of the database."""
+        return DataVersion.current(session.connection())
+
+    @needs_session
+    def _load(self, session: Session) -> LoadedIndex:
+        """Build a new index and breed name map from the database, and save the index as a snapshot."""
+        version, fingerprint = DataVersion.current_fingerprint(session.connection())
+        breed_names = {breed.id: breed.name for breed in Breed.get_all(session)}
+        entries = (
+            (case.id, case_search_strings(case.name, case.owner, case.notes, breed_names.get(case.breed_id)))
+            for case in Case.get_all(session)
+        )
+        if config.FUZZY_SHARDS > 1:
+            index = ShardedFuzzyIndex(entries, shards=config.FUZZY_SHARDS)
+        else:
+            index = FuzzyIndex(entries)
+        if config.FUZZY_SNAPSHOT_PATH and fingerprint is not None:
+            try:
+                index.save(Path(config.FUZZY_SNAPSHOT_PATH), fingerprint)
+            except OSError:
+                logger.exception("Could not save the fuzzy index snapshot")
+        return LoadedIndex(index, breed_names, version)
 
     @needs_session
-    async def refresh(self, session):
+    def _load_snapshot(self, session: Session) -> LoadedIndex | None:
+        """Load the index saved by the last rebuild and the breed name map, if the database has not changed since."""
+        version, fingerprint = DataVersion.current_fingerprint(session.connection())
+        if not config.FUZZY_SNAPSHOT_PATH or fingerprint is None:
+            return None
+        path = Path(config.FUZZY_SNAPSHOT_PATH)
+        if config.FUZZY_SHARDS > 1:
+            index = ShardedFuzzyIndex.load(path, fingerprint, shards=config.FUZZY_SHARDS)
+        else:
+            index = FuzzyIndex.load(path, fingerprint)
+        if index is None:
+            return None
+        return LoadedIndex(index, {breed.id: breed.name for breed in Breed.get_all(session)}, version)
+
+    def _swap(self, load: Callable[[], LoadedIndex | None]) -> bool:
         """
-        Create a mapping of searchable fields to cases for fuzzy searching.
+        Replace the current index with a newly loaded one.
+
+        Changes committed while ``load`` is reading the database are journaled and replayed onto the new index before
+        it replaces the current one, so no write is lost. If another swap starts, or the service is closed, before
+        ``load`` returns, the new index is discarded.
 
         Args:
         ----
-            session (Session): The database session.
+            load (Callable): Returns the new index, or None if there is nothing to load.
 
         Returns:
         -------
-            dict[int, list[str]]: Mapping from case ID to list of searchable strings.
+            bool: True if the index was replaced.
 
         """
-        cases = Case.get_all(session, greedy_fields=["breed"])
-        field_map = {}
-        for case in cases:
-            strings = []
-            if case.name:
-                strings.append(case.name.lower())
-            if case.owner:
-                strings.append(case.owner.lower())
-            if case.notes:
-                strings.append(case.notes.lower())
-            if case.breed:
-                strings.append(case.breed.name.lower())
-            field_map[case.id] = strings
+        journal = []
+        with self._lock:
+            self._journal = journal
+        rebuilt_at, start = datetime.now(UTC), time.perf_counter()
+        checked_at = time.time()
+        try:
+            loaded = load()
+        except Exception:
+            with self._lock:
+                if self._journal is journal:
+                    self._journal = None
+            raise
+        with self._lock:
+            superseded = self._journal is not journal
+            if not superseded:
+                self._journal = None
+            if loaded is None or superseded:
+                old_index = None if loaded is None else loaded.index
+            else:
+                old_index, self._index, self._breed_names, self._version = self._index, *loaded
+                self._changes += 1
+                for changes, versions in journal:
+                    self._apply(changes, versions)
+                self._cache.clear()
+                self._generation += 1
+                self._rebuilt_at, self._rebuild_seconds = rebuilt_at, time.perf_counter() - start
+                self._checked_at = checked_at
+                self._ready.set()
+        if old_index is not None:
+            with self._index_lock.write():
+                old_index.close()
+        return loaded is not None and not superseded
+
+    def warm_start(self) -> bool:
+        """Load the index from its snapshot file and return True, if the database has not changed since it was saved."""
+        with self._rebuild_lock:
+            return self._swap(self._load_snapshot)
 
-        self._map = field_map
+    def rebuild(self, force: bool = False) -> bool:
+        """
+        Rebuild the search index from the searchable fields of every case, in the calling thread.
+
+        Unless forced, the rebuild is skipped if the data version shows that the index is up to date: either nothing was
+        written since the index was built, or every write since was made by this process and applied incrementally. A
+        rebuild started while another one is running waits for it, and is then skipped if that one brought the index up
+        to date.
+
+        Args:
+        ----
+            force (bool): Rebuild even if the index is up to date.
+
+        Returns:
+        -------
+            bool: True if the index was rebuilt.
+
+        """
+        with self._rebuild_lock:
+            if not force and self._version is not None and self._current_version() == self._version:
+                self._checked_at = time.time()
+                return False
+            last_checked_at = self._checked_at
+            rebuilt = self._swap(self._load)
+            if rebuilt and not force and last_checked_at is not None:
+                with self._lock:
+                    self._lag_seconds = time.time() - last_checked_at
+            return rebuilt
+
+    async def refresh(self, force: bool = False) -> bool:
+        """Rebuild the search index if it is out of date, in a worker thread so that the event loop is not blocked."""
+        return await asyncio.to_thread(self.rebuild, force)
+
+    def close(self) -> None:
+        """Release the current index, stopping its worker processes if it is sharded, and discard any rebuild."""
+        with self._lock:
+            old_index, self._index = self._index, FuzzyIndex()
+            self._changes += 1
+            self._journal = None
+            self._version = None
+            self._cache.clear()
+            self._ready.clear()
+        with self._index_lock.write():
+            old_index.close()
 
     async def refresh_loop(self):
         """
-        Perform a periodic refresh operations in an asynchronous loop.
+        Keep the index reconciled with the database in an asynchronous loop.
 
-        The method repeatedly calls the `refresh` coroutine at an interval defined by
-        the `_refresh_interval` attribute. This loop will continue running indefinitely.
+        Writes made through the API are applied incrementally as they commit. Every POLL_INTERVAL seconds the data
+        version is checked, and the index is rebuilt only if writes were made by other processes or tools. A valid
+        snapshot replaces the first rebuild. This loop runs indefinitely.
         """
+        await asyncio.to_thread(self.warm_start)
         while True:
             await self.refresh()
-            await asyncio.sleep(REFRESH_INTERVAL)
+            await asyncio.sleep(POLL_INTERVAL)
+
+    @needs_session
+    def _breed_name(self, breed_id: int, session: Session) -> str | None:
+        """Return the name of a breed, loading it from the database if it is not yet known."""
+        if breed_id not in self._breed_names:
+            breed = session.get(Breed, breed_id)
+            if breed is None:
+                return None
+            self._breed_names[breed_id] = breed.name
+        return self._breed_names[breed_id]
 
-    @cached(cache=TTLCache(maxsize=CACHE_SIZE, ttl=REFRESH_INTERVAL / 2))
-    def fuzzy_match_ids(self, query: str, min_match_score: int) -> list[int]:
+    def apply_changes(self, changes: list[RecordChange], versions: DataVersions | None = None) -> None:
+        """
+        Push committed case writes into the index.
+
+        Only the affected index entries are replaced, and only cached query results that contained a changed case, or
+        that a new or updated case now matches, are invalidated. If the index was up to date with the data version
+        before the writes, it is now up to date with the version after them, so the next poll does not rebuild it.
+        Unless the transaction also wrote other rows, such as breeds, which the index may show stale: then the index
+        is marked as stale instead, like after a failed write. Errors are logged rather than raised, since the writes
+        are already committed, and leave the index to be rebuilt by the next poll.
+
+        Args:
+        ----
+            changes (list[RecordChange]): Committed case writes, as passed to Case commit listeners.
+            versions (DataVersions | None): Data versions before and after the writes, if known.
+
+        """
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((changes, versions))
+            self._apply(changes, versions)
+            committed = [change.committed_at for change in changes if change.committed_at is not None]
+            if committed:
+                self._lag_seconds = time.time() - min(committed)
+
+    def _apply(self, changes: list[RecordChange], versions: DataVersions | None) -> None:
+        """
+        Apply case writes to the index and invalidate the affected cached results. Must hold the lock.
+
+        If that fails, the error is logged, the cache cleared and the index marked as stale, so that it is rebuilt.
+        """
+        try:
+            upserts = {}
+            for change in changes:
+                if change.data is not None:
+                    data = change.data
+                    breed_name = self._breed_name(data["breed_id"])
+                    upserts[change.id] = case_search_strings(data["name"], data["owner"], data["notes"], breed_name)
+            with self._index_lock.write():
+                self._changes += 1
+                for change in changes:
+                    if change.id in upserts:
+                        self._index.upsert(change.id, upserts[change.id])
+                    else:
+                        self._index.remove(change.id)
+            new_strings = [string for fields in upserts.values() for string in fields.values()]
+            self._invalidate({change.id for change in changes}, new_strings)
+        except Exception:
+            logger.exception("Could not apply case writes to the fuzzy index, it will be rebuilt")
+            self._cache.clear()
+            self._version = None
+            return
+        if versions is None or versions.before is None or versions.after is None:
+            return
+        if versions.after - versions.before > len(changes):  # Rows other than these cases were written too
+            self._breed_names = {}
+            self._version = None
+        elif versions.before == self._version:
+            self._version = versions.after
+
+    def apply_breed_changes(self, changes: list[RecordChange], versions: DataVersions | None = None) -> None:
+        """
+        Mark the index as stale after committed breed writes, so that the next poll rebuilds it.
+
+        Breed names are indexed with every case of the breed, so a renamed breed is only searchable under its new name
+        once the index is rebuilt. The breed names known to the service are dropped too, so that case writes made
+        until then index the new names.
+
+        Args:
+        ----
+            changes (list[RecordChange]): Committed breed writes, as passed to Breed commit listeners.
+            versions (DataVersions | None): Data versions before and after the writes, if known.
+
+        """
+        with self._lock:
+            self._breed_names = {}
+            self._version = None
+
+    def _invalidate(self, changed_ids: set[int], new_strings: list[str]) -> None:
+        """
+        Drop cached results that contain a changed case or that one of the new strings would match.
+
+        Scoring every cached query against every new string is only worth it for small writes: above
+        INVALIDATE_MAX_PAIRS pairs, such as for a bulk write, the whole cache is cleared instead.
+        """
+        if not self._cache:
+            return
+        if len(self._cache) * len(new_strings) > INVALIDATE_MAX_PAIRS:
+            self._cache.clear()
+            return
+        keys = list(self._cache.keys())
+        matched = np.zeros(len(keys), dtype=bool)
+        if new_strings:
+            scores = process.cdist([key[0] for key in keys], new_strings, scorer=fuzz.WRatio, dtype=np.float32)
+            matched = scores.max(axis=1) >= np.array([key[1] or 0 for key in keys])
+        for key, is_matched in zip(keys, matched, strict=True):
+            if is_matched or not changed_ids.isdisjoint(hit.case_id for hit in self._cache[key]):
+                del self._cache[key]
+
+    def fuzzy_match(
+        self, query: str, min_match_score: int | None, limit: int | None = None, offset: int = 0
+    ) -> list[FuzzyHit]:
         """
         Perform a fuzzy search for cases based on the query string.
 
+        Only the best ``offset + limit`` matches are ranked and cached, so broad queries stay cheap.
+
         Args:
         ----
             query (str): String to search for.
-            min_match_score (int): Cutoff matching score below which fuzzy matching does not report a case.
-            session (Session): The database session.
+            min_match_score (int | None): Cutoff matching score below which fuzzy matching does not report a case.
+            limit (int | None): Maximum number of matches to return, or None for all matches.
+            offset (int): Number of best matches to skip.
 
         Returns:
         -------
-            list[int]: The case IDs that best match the query in descending order of match quality.
+            list[FuzzyHit]: The cases that best match the query in descending order of match quality.
 
         """
-        results = [
-            (case_id, process.extractOne(query.lower(), fields, score_cutoff=min_match_score))
-            for case_id, fields in self._map.items()
-        ]
-        results = [r for r in results if r[1] is not None]  # filter out non-matches
-        results = sorted(results, key=lambda r: r[1][1], reverse=True)  # sort by score
-        sorted_ids = [r[0] for r in results]
-
-        return sorted_ids
+        key = (query.lower(), min_match_score, None if limit is None else offset + limit)
+        with self._lock:
+            hits = self._cache.get(key)
+            if hits is None:
+                index, changes = self._index, self._changes
+                self._index_lock.acquire_read()
+        if hits is None:
+            try:
+                hits = index.search(*key)
+            finally:
+                self._index_lock.release_read()
+            with self._lock:
+                if self._changes == changes:
+                    self._cache[key] = hits
+        return hits[offset:] if limit is None else hits[offset : offset + limit]
 
 
-fuzzy_match_service = FuzzyMatchService()
+fuzzy_match_service = FuzzyMatchService()  # Registered as a Case commit listener by services.search when selected
 
 #######################################################################################################################
 # End of file
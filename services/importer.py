@@ -0,0 +1,289 @@
+#######################################################################################################################
+"""
+Chunked, resumable import of clinical cases.
+
+Imports stream the rows of a CSV or newline-delimited JSON file, so memory use does not grow with the size of the file:
+
+- read_rows:
+    Yields the rows of a file one at a time as dictionaries. CSV files need a header line; empty CSV fields are None.
+- BreedResolver:
+    Maps free-text breed names, such as "german-shepherd dog", to breed IDs. The names are matched, ignoring case and
+    punctuation, against the static breed lists in services/static_data/breeds, and the IDs of all those breeds are
+    read in one query when the import starts.
+- import_cases:
+    Validates each row against CaseCreate and inserts the valid rows with Case.bulk_create, committing a chunk of rows
+    at a time. Each commit is a checkpoint: an interrupted import can be resumed from the last committed row.
+
+A row names its breed either with breed_id or with breed_name, optionally with a species for names used by several
+species, so that files written by services.export can be imported again. Rows that fail validation are counted and
+reported, and do not stop the import.
+
+Imports can be run from the command line, from the repository root. The last committed row is saved to a checkpoint
+file after every chunk, and the import resumes from it when run again:
+
+    python -m services.importer cases.csv --chunk-size 5000
+"""
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import argparse
+import csv
+import io
+import json
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from itertools import islice
+from pathlib import Path
+from typing import IO, NamedTuple
+
+from pydantic import ValidationError
+from sqlmodel import Session, select
+
+from backend.api_models import CaseCreate
+from database.core import session as db_session
+from database.core.models import Breed, Case, Species
+from services.breeds import normalise_breed_name
+from services.static_data.breeds import STATIC_BREEDS
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+IMPORT_CHUNK_SIZE = 1000  # Number of rows validated and committed at a time
+IMPORT_FORMATS = ("csv", "jsonl")
+FORMAT_SUFFIXES = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+IMPORT_MEDIA_TYPES = {"text/csv": "csv", "application/x-ndjson": "jsonl", "application/jsonl": "jsonl"}
+MAX_REPORTED_ERRORS = 100  # Number of rejected rows whose errors are kept in the report
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+class RowError(NamedTuple):
+    """Why a row of an imported file was rejected."""
+
+    row: int  # Number of the row in the file, from 1, not counting the CSV header
+    detail: str
+
+
+class ImportReport(NamedTuple):
+    """Progress and throughput of an import."""
+
+    rows: int  # Number of the last row committed, to resume from; rows before start_row are counted
+    imported: int  # Number of cases created
+    rejected: int  # Number of rows that failed validation
+    errors: list[RowError]  # The first MAX_REPORTED_ERRORS rejected rows
+    seconds: float  # Time taken so far
+    rows_per_second: float  # Rows read per second, valid or not
+
+
+class ImportInterruptedError(Exception):
+    """An import failed while writing a chunk. The chunks before it are committed."""
+
+    def __init__(self, report: ImportReport):
+        """Keep the report of the committed chunks, whose rows field is the row to resume from."""
+        super().__init__(f"Import interrupted after row {report.rows}")
+        self.report = report
+
+
+def read_rows(file: IO[bytes], fmt: str) -> Iterator[dict | ValueError]:
+    """
+    Yield the rows of a CSV or newline-delimited JSON file as dictionaries.
+
+    Args:
+    ----
+        file (IO[bytes]): The file, opened in binary mode. It is decoded as UTF-8, with or without a byte order mark.
+        fmt (str): File format, one of IMPORT_FORMATS.
+
+    Yields:
+    ------
+        dict | ValueError: Field values of each row, or the error of a JSON line that is not a JSON object, so that one
+            bad line does not stop the import. Empty CSV fields are None. Blank JSON lines are skipped.
+
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for row in csv.DictReader(text):
+            yield {key: value or None for key, value in row.items()}
+    else:
+        for line in text:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield ValueError(f"Invalid JSON: {e}")
+                continue
+            yield row if isinstance(row, dict) else ValueError("Row is not a JSON object")
+
+
+class BreedResolver:
+    """Resolve the breed of imported rows, with one query for the whole import."""
+
+    def __init__(self, session: Session):
+        """Read the ID of every breed, and match the normalised names of the static breeds to them."""
+        breeds = session.exec(select(Breed.id, Breed.name, Breed.species)).all()
+        self.breed_ids = {breed_id for breed_id, _, _ in breeds}
+        ids = {(species, name): breed_id for breed_id, name, species in breeds}
+        self.names: dict[str, dict[Species, int]] = defaultdict(dict)
+        for species, names in STATIC_BREEDS.items():
+            for name in names:
+                if (species, name) in ids:
+                    self.names[normalise_breed_name(name)][species] = ids[(species, name)]
+
+    def resolve(self, row: dict) -> dict:
+        """
+        Return a row with its breed_id filled in from its breed name and species, if it has no breed_id.
+
+        Raises
+        ------
+            ValueError: The breed ID or name is unknown, or the name is used by several species and none is given.
+
+        """
+        breed_id = row.get("breed_id")
+        if breed_id is not None:
+            if int(breed_id) not in self.breed_ids:
+                raise ValueError(f"breed_id: Breed {breed_id} not found")
+            return row
+        name, species = row.get("breed_name"), row.get("species")
+        if name is None:
+            raise ValueError("breed_id: Give a breed_id or a breed_name")
+        matches = self.names.get(normalise_breed_name(name), {})
+        if species is not None:
+            matches = {key: value for key, value in matches.items() if key.value == species}
+        if len(matches) != 1:
+            raise ValueError(f"breed_name: {'Several species have' if matches else 'Unknown'} breed {name!r}")
+        return {**row, "breed_id": next(iter(matches.values()))}
+
+
+def validate_row(row: dict | ValueError, resolver: BreedResolver) -> dict:
+    """
+    Validate a row against CaseCreate, after resolving its breed.
+
+    Returns
+    -------
+        dict: Column values of the case to create, as passed to Case.bulk_create. CaseCreate has every case column
+            but the ID.
+
+    Raises
+    ------
+        ValueError: The row is invalid. The message summarises every error on one line.
+
+    """
+    if isinstance(row, ValueError):
+        raise row
+    try:
+        case = CaseCreate.model_validate(resolver.resolve(row))
+    except ValidationError as e:
+        raise ValueError(
+            "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+        ) from e
+    except TypeError as e:
+        raise ValueError(str(e)) from e
+    return case.model_dump()
+
+
+def import_cases(
+    file: IO[bytes],
+    fmt: str,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    start_row: int = 0,
+    on_chunk: Callable[[ImportReport], None] | None = None,
+) -> ImportReport:
+    """
+    Import the cases of a CSV or newline-delimited JSON file, a chunk of rows per transaction.
+
+    Args:
+    ----
+        file (IO[bytes]): The file, opened in binary mode.
+        fmt (str): File format, one of IMPORT_FORMATS.
+        chunk_size (int): Number of rows validated and committed at a time.
+        start_row (int): Number of rows at the start of the file to skip, to resume an interrupted import.
+        on_chunk (Callable | None): Called with the progress so far after each chunk is committed.
+
+    Returns:
+    -------
+        ImportReport: The number of rows read, cases created and rows rejected, and the import throughput.
+
+    Raises:
+    ------
+        ImportInterruptedError: Writing a chunk failed. Its report gives the row to resume from.
+
+    """
+    start = time.perf_counter()
+    rows, imported, rejected, errors = start_row, 0, 0, []
+
+    def report() -> ImportReport:
+        seconds = time.perf_counter() - start
+        return ImportReport(rows, imported, rejected, errors, seconds, (rows - start_row) / seconds if seconds else 0)
+
+    with Session(db_session.engine) as session:
+        resolver = BreedResolver(session)
+        numbered = islice(enumerate(read_rows(file, fmt), 1), start_row, None)
+        while chunk := list(islice(numbered, chunk_size)):
+            records = []
+            for number, row in chunk:
+                try:
+                    records.append(validate_row(row, resolver))
+                except ValueError as e:
+                    rejected += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append(RowError(number, str(e)))
+            try:
+                Case.bulk_create(session, records)
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                raise ImportInterruptedError(report()) from e
+            rows, imported = chunk[-1][0], imported + len(records)
+            if on_chunk is not None:
+                on_chunk(report())
+    return report()
+
+
+def main() -> None:
+    """Import a file of cases, resuming from its checkpoint file if there is one."""
+    parser = argparse.ArgumentParser(description="Import clinical cases from a CSV or newline-delimited JSON file.")
+    parser.add_argument("input", type=Path, help="File to import.")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, default=None, help="File format, from the suffix if unset.")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Number of rows per commit.")
+    parser.add_argument("--checkpoint", type=Path, default=None, help="Checkpoint file, INPUT.checkpoint if unset.")
+    args = parser.parse_args()
+    fmt = args.format or FORMAT_SUFFIXES.get(args.input.suffix.lower())
+    if fmt is None:
+        parser.error(f"Cannot tell the format of {args.input}, use --format")
+    checkpoint = args.checkpoint or args.input.with_name(args.input.name + ".checkpoint")
+    start_row = json.loads(checkpoint.read_text())["rows"] if checkpoint.exists() else 0
+    if start_row:
+        print(f"Resuming after row {start_row}")
+
+    def save(report: ImportReport) -> None:
+        partial = checkpoint.with_name(checkpoint.name + ".tmp")
+        partial.write_text(json.dumps({"rows": report.rows}))
+        partial.replace(checkpoint)  # Atomically, so an import killed mid-write keeps the last checkpoint
+        print(
+            f"row {report.rows:,}: {report.imported:,} imported, {report.rejected:,} rejected, "
+            f"{report.rows_per_second:,.0f} rows/s"
+        )
+
+    with args.input.open("rb") as file:
+        report = import_cases(file, fmt, args.chunk_size, start_row, on_chunk=save)
+    checkpoint.unlink(missing_ok=True)
+    for error in report.errors:
+        print(f"row {error.row}: {error.detail}")
+    print(
+        f"{report.rows - start_row:,} rows in {report.seconds:.1f} s ({report.rows_per_second:,.0f} rows/s): "
+        f"{report.imported:,} imported, {report.rejected:,} rejected"
+    )
+
+
+if __name__ == "__main__":
+    main()
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
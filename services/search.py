@@ -0,0 +1,69 @@
+#######################################################################################################################
+"""
+Case search service selection.
+
+Both case search backends answer the same queries through the SearchService interface, and search_service is the one
+selected by Config.SEARCH_BACKEND:
+
+- "fuzzy" (default):
+    services.fuzzy.FuzzyMatchService, an in-memory rapidfuzz index of every case, updated as case writes commit.
+- "fts":
+    services.fts.FtsSearchService, an SQLite FTS5 trigram table kept up to date by triggers, with no copy of the cases
+    in the application process. Suited to running many workers against the same database.
+"""
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+from typing import Protocol
+
+from backend.config import config
+from database.core.models import Breed, Case
+from services.fts import FtsSearchService
+from services.fuzzy import FuzzyHit, IndexStatus, fuzzy_match_service
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+class SearchService(Protocol):
+    """Interface shared by the case search backends."""
+
+    @property
+    def ready(self) -> bool:
+        """Return True once searches report every case."""
+
+    def status(self) -> IndexStatus:
+        """Return the readiness and freshness of the search backend."""
+
+    async def reset(self):
+        """Discard any cached state and rebuild it from the database."""
+
+    async def refresh_loop(self):
+        """Keep the backend up to date with the database, for as long as the application runs."""
+
+    def close(self) -> None:
+        """Release the resources held by the backend."""
+
+    def fuzzy_match(
+        self, query: str, min_match_score: int | None, limit: int | None = None, offset: int = 0
+    ) -> list[FuzzyHit]:
+        """Return the cases that best match the query in descending order of match quality."""
+
+
+if config.SEARCH_BACKEND == "fts":
+    search_service: SearchService = FtsSearchService()
+else:
+    search_service = fuzzy_match_service
+    Case.add_commit_listener(fuzzy_match_service.apply_changes)
+    Breed.add_commit_listener(fuzzy_match_service.apply_breed_changes)
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
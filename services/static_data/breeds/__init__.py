@@ -1,5 +1,9 @@
-from .canine import ensure_dog_breeds
-from .equine import ensure_horse_breeds
-from .feline import ensure_cat_breeds
+from database.core.models import Species
 
-__all__ = ["ensure_cat_breeds", "ensure_dog_breeds", "ensure_horse_breeds"]
+from .canine import DOG_BREEDS, ensure_dog_breeds
+from .equine import HORSE_BREEDS, ensure_horse_breeds
+from .feline import CAT_BREEDS, ensure_cat_breeds
+
+STATIC_BREEDS = {Species.CANINE: DOG_BREEDS, Species.FELINE: CAT_BREEDS, Species.EQUINE: HORSE_BREEDS}
+
+__all__ = ["STATIC_BREEDS", "ensure_cat_breeds", "ensure_dog_breeds", "ensure_horse_breeds"]
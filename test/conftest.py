@@ -9,32 +9,45 @@ Provides fixtures for database session, FastAPI app, test client, and test dog b
 # Imports
 #######################################################################################################################
 
+import time
+from pathlib import Path
+
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import event
 from sqlalchemy.pool import StaticPool
-from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel import Session, SQLModel
 from sqlmodel import Session as SQLModelSession
 
+from backend.config import config
 from database.core.models import Breed, Case, Species
-from database.core.session import _enable_sqlite_foreign_keys
+from database.core.session import create_db_engine
 from main import get_app
+from services.search import search_service
 
 #######################################################################################################################
 # Globals
 #######################################################################################################################
 
+INDEX_READY_TIMEOUT = 10  # Number of seconds to wait for the search index to be built when the test app starts
+
 #######################################################################################################################
 # Body
 #######################################################################################################################
 
 
+@pytest.fixture(autouse=True)
+def fuzzy_snapshot_path(tmp_path, monkeypatch) -> Path:
+    """Save fuzzy index snapshots to a temporary file instead of the development database directory."""
+    path = tmp_path / "fuzzy_index.snapshot"
+    monkeypatch.setattr(config, "FUZZY_SNAPSHOT_PATH", str(path))
+    return path
+
+
 @pytest.fixture
 def session(monkeypatch) -> Session:
     """Create a new in-memory SQLite session for testing."""
-    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
-    event.listen(engine, "connect", _enable_sqlite_foreign_keys)
+    engine = create_db_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
     monkeypatch.setattr("database.core.session.engine", engine)
 
     SQLModel.metadata.create_all(engine)
@@ -51,9 +64,12 @@ def app() -> FastAPI:
 
 @pytest.fixture
 def client(session) -> TestClient:
-    """Return a TestClient using the test session and monkeypatched get_session."""
+    """Return a TestClient using the test session and monkeypatched get_session, once the search index is ready."""
     app = get_app()
     with TestClient(app) as client:
+        deadline = time.monotonic() + INDEX_READY_TIMEOUT
+        while not search_service.ready and time.monotonic() < deadline:  # The index is built in the background
+            time.sleep(0.01)
         yield client
 
 
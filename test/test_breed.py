@@ -7,12 +7,19 @@ Covers:
 - Filtering breeds by species
 - Retrieving breeds by ID and name
 - Handling not found cases
+- Exporting all breeds as CSV
+- Resolving free-text breed names in a batch
+- Suggesting breeds for a partly typed name
+- Caching the breed list with ETags until breeds change
 """
 
 #######################################################################################################################
 # Imports
 #######################################################################################################################
 
+import csv
+import io
+
 from fastapi import status
 from fastapi.testclient import TestClient
 from sqlmodel import SQLModel, select
@@ -85,6 +92,61 @@ class TestBreedAPI:
         resp = client.get(f"{self.base_url}/by_name/NotARealBreed")
         assert resp.status_code == status.HTTP_404_NOT_FOUND
 
+    def test_export_breeds_csv(self, client: TestClient) -> None:
+        """Test GET /api/breed/export?format=csv returns every breed, with species values, as a CSV download."""
+        resp = client.get(f"{self.base_url}/export?format=csv")
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.headers["content-type"].startswith("text/csv")
+        assert resp.headers["content-disposition"] == 'attachment; filename="breeds.csv"'
+        rows = list(csv.DictReader(io.StringIO(resp.text)))
+        assert len(rows) == len(DOG_BREEDS) + len(CAT_BREEDS) + len(HORSE_BREEDS)
+        assert {"name": DOG_BREEDS[0], "species": "Canine"}.items() <= rows[0].items()
+
+    def test_resolve_breeds(self, client: TestClient) -> None:
+        """Test POST /api/breed/resolve returns the closest breed and runner-up of each name, in order."""
+        names = ["german-shepherd DOG", "persain", "german shepherd dog"]
+        resp = client.post(f"{self.base_url}/resolve", json={"names": names})
+        assert resp.status_code == status.HTTP_200_OK
+        data = resp.json()
+        assert [(r["query"], r["name"], r["score"]) for r in data] == [
+            (names[0], "German Shepherd Dog", 100.0),
+            (names[1], "Persian", data[1]["score"]),
+            (names[2], "German Shepherd Dog", 100.0),
+        ]
+        assert data[0]["runner_up"]["name"] != "German Shepherd Dog"
+        resp = client.post(f"{self.base_url}/resolve", json={"names": ["unknown"], "species": "Equine"})
+        breed = client.get(f"{self.base_url}/{resp.json()[0]['breed_id']}").json()
+        assert (breed["name"], breed["species"]) == ("Unknown", "Equine")
+
+    def test_suggest_breeds(self, client: TestClient) -> None:
+        """Test GET /api/breed/suggest completes a name prefix, and falls back to fuzzy matching."""
+        resp = client.get(f"{self.base_url}/suggest", params={"q": "german sh", "species": "Canine"})
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.json() == [
+            {"breed_id": resp.json()[0]["breed_id"], "name": "German Shepherd Dog", "score": 100.0},
+            {"breed_id": resp.json()[1]["breed_id"], "name": "German Shorthaired Pointer", "score": 100.0},
+        ]
+        resp = client.get(f"{self.base_url}/suggest", params={"q": "persain", "limit": 1})
+        assert [b["name"] for b in resp.json()] == ["Persian"]
+        resp = client.get(f"{self.base_url}/suggest", params={"limit": 0})
+        assert resp.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    def test_list_breeds_etag(self, client: TestClient, session: SQLModel) -> None:
+        """Test GET /api/breed/ answers a matching If-None-Match with 304, until a breed is added."""
+        resp = client.get(f"{self.base_url}", params={"species": "Equine"})
+        etag = resp.headers["etag"]
+        assert resp.headers["cache-control"].startswith("public, max-age=")
+        assert etag != client.get(f"{self.base_url}").headers["etag"]
+        resp = client.get(f"{self.base_url}", params={"species": "Equine"}, headers={"If-None-Match": etag})
+        assert resp.status_code == status.HTTP_304_NOT_MODIFIED
+        assert (resp.content, resp.headers["etag"]) == (b"", etag)
+        Breed(name="Zebroid", species="Equine").create(session)
+        session.commit()
+        resp = client.get(f"{self.base_url}", params={"species": "Equine"}, headers={"If-None-Match": etag})
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.json()[-1]["name"] == "Zebroid"
+        assert resp.headers["etag"] != etag
+
 
 #######################################################################################################################
 # End of file
@@ -0,0 +1,120 @@
+#######################################################################################################################
+"""
+Test suite for the in-memory breed catalog.
+
+This module tests services/breeds.py:
+- Normalised breed names
+- Batch resolution of free-text breed names, with repeated names scored once
+- Prefix suggestions, with a fuzzy fallback
+- Looking breeds up by ID
+- Reloading the breeds after they change
+"""
+# ruff: noqa: PLR2004
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+from rapidfuzz import process
+from sqlmodel import Session
+
+from database.core import helpers
+from database.core.models import Breed, Species
+from services import breeds
+from services.breeds import BreedCatalog, normalise_breed_name
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+class TestBreedCatalog:
+    """Test suite for BreedCatalog."""
+
+    def add_breeds(self, session: Session) -> None:
+        """Create and commit a few breeds."""
+        for name, species in (("Labrador Retriever", Species.CANINE), ("Persian", Species.FELINE)):
+            Breed(name=name, species=species).create(session)
+        session.commit()
+
+    def test_normalise_breed_name(self) -> None:
+        """Names are compared in lower case, with runs of spaces and punctuation replaced by a single space."""
+        assert normalise_breed_name("  G. Shepherd-DOG_x ") == "g shepherd dog x"
+
+    def test_resolve(self, session: Session, monkeypatch) -> None:
+        """Each distinct name is scored once, in one cdist call, and results follow the order of the names."""
+        self.add_breeds(session)
+        calls, cdist = [], process.cdist
+
+        def counting_cdist(queries: list[str], *args, **kwargs):
+            calls.append(queries)
+            return cdist(queries, *args, **kwargs)
+
+        monkeypatch.setattr(breeds.process, "cdist", counting_cdist)
+        resolutions = BreedCatalog().resolve(["Lab", "persian", "LAB.", "lab"])
+        assert calls == [["lab", "persian"]]
+        assert [resolution.best.name for resolution in resolutions] == [
+            "Labrador Retriever",
+            "Persian",
+            "Labrador Retriever",
+            "Labrador Retriever",
+        ]
+        assert resolutions[1].best.score == 100.0
+        assert resolutions[1].runner_up.name == "Labrador Retriever"
+
+    def test_resolve_species(self, session: Session) -> None:
+        """Names are only matched against the breeds of the given species, if any."""
+        self.add_breeds(session)
+        catalog = BreedCatalog()
+        [resolution] = catalog.resolve(["lab"], Species.FELINE)
+        assert (resolution.best.name, resolution.runner_up) == ("Persian", None)
+        assert catalog.resolve(["lab"], Species.EQUINE) == [breeds.BreedResolution(None, None)]
+        assert catalog.resolve([]) == []
+
+    def test_suggest(self, session: Session) -> None:
+        """Name prefixes come before later word prefixes, and unmatched queries fall back to fuzzy matching."""
+        for name in ("Shetland Sheepdog", "Anatolian Shepherd Dog", "German Shepherd Dog", "Shiba Inu"):
+            Breed(name=name, species=Species.CANINE).create(session)
+        Breed(name="Shetland Pony", species=Species.EQUINE).create(session)
+        session.commit()
+        catalog = BreedCatalog()
+
+        def names(query: str, species: Species | None = None, limit: int = 10) -> list[str]:
+            return [match.name for match in catalog.suggest(query, species, limit)]
+
+        assert names("She") == ["Shetland Pony", "Shetland Sheepdog", "Anatolian Shepherd Dog", "German Shepherd Dog"]
+        assert names("she", Species.CANINE, limit=2) == ["Shetland Sheepdog", "Anatolian Shepherd Dog"]
+        assert names("shepherd-dog") == ["Anatolian Shepherd Dog", "German Shepherd Dog"]
+        assert names("", Species.EQUINE) == ["Shetland Pony"]
+        [fuzzy] = catalog.suggest("sheba inu", limit=1)
+        assert fuzzy.name == "Shiba Inu"
+        assert fuzzy.score < 100
+
+    def test_get(self, session: Session) -> None:
+        """Breeds are looked up by ID, and an unknown ID reloads the breeds once in case it was added elsewhere."""
+        catalog = BreedCatalog()
+        self.add_breeds(session)
+        first = catalog.snapshot()
+        breed = next(breed for breed in first.breeds if breed.name == "Persian")
+        assert catalog.get(breed.id) is breed
+        assert catalog.snapshot() is first
+        session.add(Breed(name="Arabian", species=Species.EQUINE))  # Not reported to the catalog
+        session.commit()
+        assert catalog.get(first.breeds[-1].id + 1).name == "Arabian"
+        assert catalog.snapshot() is not first
+        assert catalog.get(999) is None
+
+    def test_reload_after_breed_change(self, session: Session, monkeypatch) -> None:
+        """The breeds are read once, and again after a breed is written through the Breed commit listener."""
+        catalog = BreedCatalog()
+        monkeypatch.setitem(helpers._commit_listeners, Breed, [*helpers._commit_listeners[Breed], catalog.invalidate])
+        self.add_breeds(session)
+        first = catalog.snapshot()
+        assert catalog.snapshot() is first
+        Breed(name="Arabian", species=Species.EQUINE).create(session)
+        session.commit()
+        assert [breed.name for breed in catalog.snapshot().breeds] == ["Arabian", "Labrador Retriever", "Persian"]
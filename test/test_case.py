@@ -4,14 +4,18 @@ Test suite for the Case CRUD API endpoints.
 
 This module tests the endpoints in backend/routes/case.py:
 - POST   /case/      (create a case)
-- GET    /case/      (list all cases)
+- GET    /case/      (list all cases, or a ranked page of fuzzy matches)
 - GET    /case/{id}  (get a case by ID)
 - PUT    /case/{id}  (update a case)
 - DELETE /case/{id}  (delete a case)
+- GET    /case/export (stream every case as NDJSON, CSV or Parquet)
+- POST, PATCH, DELETE /case/bulk (create, update or delete a batch of cases)
+- POST   /case/batch (get a batch of cases by ID)
+- POST   /case/import (import the cases of a CSV or newline-delimited JSON file)
 
 It covers normal and edge cases, including:
 - Creating a case (with valid and invalid data)
-- Listing cases (empty and after creation)
+- Listing cases (empty, after creation, filtered, and a page at a time by cursor)
 - Retrieving, updating, and deleting by ID (existing and non-existing)
 - Ensuring required foreign keys (breed) are handled
 """
@@ -20,16 +24,50 @@ It covers normal and edge cases, including:
 # Imports
 #######################################################################################################################
 
+import base64
+import io
+import itertools
+import json
+from datetime import date
+
+import pyarrow.parquet as pq
 from fastapi import status
+from fastapi.responses import JSONResponse
 from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlmodel import Session
 
-from database.core.models import Breed
+from backend.api_models import (
+    DEFAULT_FUZZY_LIMIT,
+    MAX_BULK_ITEMS,
+    NEXT_CURSOR_HEADER,
+    CaseListItem,
+    CaseListQuery,
+    CaseMatch,
+)
+from backend.routes import case as case_routes
+from backend.routes.case import case_filters, case_read
+from database.core import helpers
+from database.core.models import Breed, Case, Sex, Species
 from services.fuzzy import fuzzy_match_service
+from services.search import search_service
 
 #######################################################################################################################
 # Globals
 #######################################################################################################################
 
+FILTER_VALUES = {
+    "species": Species.CANINE,
+    "breed_id": 1,
+    "sex": Sex.MALE,
+    "owner": "TestOwner",
+    "created_from": date(2025, 1, 1),
+    "created_to": date(2025, 12, 31),
+    "born_from": date(2020, 1, 1),
+    "born_to": date(2020, 12, 31),
+}
+
 #######################################################################################################################
 # Body
 #######################################################################################################################
@@ -98,6 +136,101 @@ class TestCaseAPI:
         assert "breed" in data and isinstance(data["breed"], dict)
         assert data["breed"]["id"] == payload["breed_id"]
 
+    def test_case_breed_without_query(self, client: TestClient, session: Session, dog_breed: Breed) -> None:
+        """Test GET /case/ and GET /case/{id} fill in the breed from the breed catalog, with one statement each."""
+        case_id = client.post(f"{self.base_url}", json=case_payload(dog_breed)).json()["id"]
+        client.get(f"{self.base_url}/{case_id}")  # Load the breed catalog
+        statements = []
+        event.listen(session.bind, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        for url in (f"{self.base_url}/{case_id}", f"{self.base_url}?limit=10"):
+            statements.clear()
+            response = client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert len(statements) == 1, statements
+            data = response.json()
+            assert (data[0] if isinstance(data, list) else data)["breed"]["name"] == dog_breed.name
+
+    def test_list_cases_bytes(self, client: TestClient, session: Session, dog_breed: Breed) -> None:
+        """Test GET /case/ encodes rows to the same bytes as a CaseListItem response_model, listing or searching."""
+        payloads = [
+            case_payload(dog_breed),
+            {**case_payload(dog_breed), "name": 'Zoë "Bella" \\ \u2028\x1f 🐕', "owner": None, "notes": None},
+        ]
+        for payload in payloads:
+            client.post(f"{self.base_url}", json=payload)
+        adapter = TypeAdapter(list[CaseListItem])
+        cases = [case_read(case, CaseListItem) for case in Case.get_all(session, sort_field=Case.id)]
+        response = client.get(f"{self.base_url}", params={"limit": 2})
+        assert response.content == JSONResponse(adapter.dump_python(cases, mode="json")).body
+        assert NEXT_CURSOR_HEADER in response.headers
+        response = client.get(f"{self.base_url}", params={"fuzzy_match": "bella", "min_match_score": 0})
+        hits = search_service.fuzzy_match("bella", 0, DEFAULT_FUZZY_LIMIT)
+        cases = [
+            case_read(case, CaseListItem, match=CaseMatch(score=hit.score, field=hit.field))
+            for hit in hits
+            for case in Case.get_all(session, additional_filters=[Case.id == hit.case_id])
+        ]
+        assert cases
+        assert response.content == JSONResponse(adapter.dump_python(cases, mode="json")).body
+
+    def test_list_cases_shapes(self, client: TestClient, dog_breed: Breed) -> None:
+        """Test GET /case/?shape=...: Compact and column shapes hold the same cases, with each breed given once."""
+        for name in ("Bella", "Bello", "Max"):
+            client.post(f"{self.base_url}", json={**case_payload(dog_breed), "name": name})
+        full = client.get(f"{self.base_url}").json()
+        breed = full[0]["breed"]
+        cases = [{key: value for key, value in case.items() if key not in ("breed", "match")} for case in full]
+        compact = client.get(f"{self.base_url}", params={"shape": "compact"}).json()
+        assert compact == {"cases": cases, "breeds": {str(dog_breed.id): breed}}
+        columns = client.get(f"{self.base_url}", params={"shape": "columns"}).json()
+        assert columns["breeds"] == compact["breeds"]
+        assert columns["cases"]["name"] == ["Bella", "Bello", "Max"]
+        assert [dict(zip(columns["cases"], values)) for values in zip(*columns["cases"].values())] == cases
+
+        params = {"fuzzy_match": "bella", "shape": "columns"}
+        searched = client.get(f"{self.base_url}", params=params).json()["cases"]
+        assert searched["name"][0] == "Bella"
+        assert searched["match"][0]["score"] == 100
+        params["shape"] = "compact"
+        assert client.get(f"{self.base_url}", params=params).json()["cases"][0]["match"] == searched["match"][0]
+        empty = client.get(f"{self.base_url}", params={"owner": "Nobody", "shape": "columns"}).json()
+        assert empty == {"cases": {field: [] for field in cases[0]}, "breeds": {}}
+        assert (
+            client.get(f"{self.base_url}", params={"shape": "rows"}).status_code
+            == status.HTTP_422_UNPROCESSABLE_CONTENT
+        )
+
+    def test_sparse_fieldsets(self, client: TestClient, session: Session, dog_breed: Breed) -> None:
+        """Test GET /case/ and /case/{id} with fields and include: only the columns asked for are read and returned."""
+        case_id = client.post(f"{self.base_url}", json=case_payload(dog_breed)).json()["id"]
+        statements = []
+        event.listen(session.bind, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        params = {"fields": "name, owner", "include": ""}
+        assert client.get(f"{self.base_url}/{case_id}", params=params).json() == {
+            "name": "TestCase",
+            "owner": "TestOwner",
+            "id": case_id,
+        }
+        assert "notes" not in statements[-1] and "breed_id" not in statements[-1]
+        assert client.get(f"{self.base_url}", params={**params, "limit": 1, "sort": "create_date"}).json() == [
+            {"name": "TestCase", "owner": "TestOwner", "id": case_id, "match": None}
+        ]
+        assert "notes" not in statements[-1]
+        params = {"fields": "notes", "shape": "columns"}
+        content = client.get(f"{self.base_url}", params=params).json()
+        assert content["cases"] == {"id": [case_id], "notes": ["Healthy"]}
+        assert list(content["breeds"]) == [str(dog_breed.id)]
+        case = client.get(f"{self.base_url}/{case_id}", params={"fields": "sex"}).json()
+        assert case == {
+            "sex": "Male",
+            "id": case_id,
+            "breed": {"id": dog_breed.id, "name": dog_breed.name, "species": "Canine"},
+        }
+        for params in ({"fields": "name,weight"}, {"include": "owner"}):
+            response = client.get(f"{self.base_url}/{case_id}", params=params)
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+            assert "Unknown case" in response.json()["detail"]
+
     def test_get_case_not_found(self, client: TestClient) -> None:
         """Test GET /case/{id}: Retrieve a non-existent case. Expect 404."""
         random_id = 999999  # Use an integer that won't exist
@@ -201,6 +334,338 @@ class TestCaseAPI:
         assert resp.status_code == status.HTTP_200_OK
         assert resp.json() == []
 
+    def test_fuzzy_search_ranked_page(self, client: TestClient, dog_breed: Breed) -> None:
+        """Test GET /case/?fuzzy_match=...&limit=...&offset=...: Returns a ranked page of matches with match details."""
+        for name in ("Belle", "Bellamy", "Bella"):
+            client.post(f"{self.base_url}", json={**case_payload(dog_breed), "name": name})
+
+        resp = client.get(f"{self.base_url}?fuzzy_match=bella&limit=2")
+        assert resp.status_code == status.HTTP_200_OK
+        results = resp.json()
+        assert [c["name"] for c in results] == ["Bella", "Bellamy"]
+        assert results[0]["match"] == {"score": 100.0, "field": "name"}
+        assert results[0]["match"]["score"] >= results[1]["match"]["score"]
+
+        resp = client.get(f"{self.base_url}?fuzzy_match=bella&limit=2&offset=2")
+        assert [c["name"] for c in resp.json()] == ["Belle"]
+
+        resp = client.get(f"{self.base_url}?fuzzy_match=testown")
+        assert {c["match"]["field"] for c in resp.json()} == {"owner"}
+
+    def test_list_cases_page(self, client: TestClient, dog_breed: Breed) -> None:
+        """Test GET /case/?limit=...&offset=...: Lists a page of cases in ID order without match details."""
+        ids = [client.post(f"{self.base_url}", json=case_payload(dog_breed)).json()["id"] for _ in range(3)]
+        resp = client.get(f"{self.base_url}?limit=2&offset=1")
+        assert resp.status_code == status.HTTP_200_OK
+        assert [c["id"] for c in resp.json()] == ids[1:]
+        assert resp.json()[0]["match"] is None
+
+    def test_list_cases_cursor(self, client: TestClient, dog_breed: Breed) -> None:
+        """Test GET /case/?sort=...&limit=...&cursor=...: Walks every sort order a page at a time, NULLs first."""
+        for name, create_date in (("Max", "2025-02-01"), ("Bella", None), ("Bella", "2025-01-01"), ("Rex", None)):
+            client.post(self.base_url, json={**case_payload(dog_breed), "name": name, "create_date": create_date})
+        expected = {"id": [1, 2, 3, 4], "name": [2, 3, 1, 4], "create_date": [2, 4, 3, 1]}
+        for sort, ids in expected.items():
+            params, seen = {"sort": sort, "limit": 2}, []
+            for _ in range(3):
+                resp = client.get(self.base_url, params=params)
+                assert resp.status_code == status.HTTP_200_OK
+                seen += [c["id"] for c in resp.json()]
+                if "X-Next-Cursor" not in resp.headers:
+                    break
+                params["cursor"] = resp.headers["X-Next-Cursor"]
+            assert seen == ids
+            assert resp.json() == []
+
+    def test_list_cases_bad_cursor(self, client: TestClient, dog_breed: Breed) -> None:
+        """Test GET /case/?cursor=...: Malformed cursors, cursors of another sort and fuzzy searches are rejected."""
+        for _ in range(2):
+            client.post(self.base_url, json=case_payload(dog_breed))
+        cursor = client.get(f"{self.base_url}?limit=1").headers["X-Next-Cursor"]
+        assert client.get(f"{self.base_url}?cursor={cursor}").status_code == status.HTTP_200_OK
+        assert client.get(f"{self.base_url}?cursor={cursor}&sort=name").status_code == status.HTTP_400_BAD_REQUEST
+        assert client.get(f"{self.base_url}?cursor=garbage").status_code == status.HTTP_400_BAD_REQUEST
+        resp = client.get(f"{self.base_url}?cursor={cursor}&fuzzy_match=test")
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_list_cases_cursor_values(self, client: TestClient, dog_breed: Breed) -> None:
+        """Test GET /case/?cursor=...: Cursors whose value or ID do not fit the sort field are rejected."""
+        client.post(self.base_url, json=case_payload(dog_breed))
+        for sort, value, id in (
+            ("id", None, {"a": 1}),
+            ("id", 1, "1"),
+            ("id", 1, True),
+            ("id", "1", 1),
+            ("name", None, 1),
+            ("name", ["a"], 1),
+            ("create_date", {"a": 1}, 1),
+        ):
+            cursor = base64.urlsafe_b64encode(json.dumps([sort, value, id]).encode()).decode()
+            resp = client.get(self.base_url, params={"sort": sort, "cursor": cursor})
+            assert resp.status_code == status.HTTP_400_BAD_REQUEST, (sort, value, id)
+            assert resp.json()["detail"] == "Invalid cursor"
+        cursor = base64.urlsafe_b64encode(json.dumps(["create_date", None, 0]).encode()).decode()
+        assert (
+            client.get(self.base_url, params={"sort": "create_date", "cursor": cursor}).status_code
+            == status.HTTP_200_OK
+        )
+
+
+class TestCaseFilters:
+    """Test suite for the structured filters of GET /case."""
+
+    base_url = "/api/case"
+
+    def test_filters(self, client: TestClient, session: Session, dog_breed: Breed) -> None:
+        """Test GET /case/?species=...&sex=...&...: Each filter narrows the listing and filters combine."""
+        cat_breed = Breed(name="TestCat", species=Species.FELINE).create(session)
+        session.commit()
+        payloads = [
+            {"name": "A", "sex": "Male", "create_date": "2025-01-10", "birth_date": "2020-05-01"},
+            {"name": "B", "sex": "Female", "create_date": "2025-03-01", "owner": "Other"},
+            {"name": "C", "sex": "Male", "create_date": "2024-12-31", "breed_id": cat_breed.id},
+        ]
+        for payload in payloads:
+            client.post(self.base_url, json={**case_payload(dog_breed), "birth_date": None, **payload})
+
+        def names(**params) -> list[str]:
+            resp = client.get(self.base_url, params=params)
+            assert resp.status_code == status.HTTP_200_OK
+            return [c["name"] for c in resp.json()]
+
+        assert names(species="Feline") == ["C"]
+        assert names(breed_id=dog_breed.id) == ["A", "B"]
+        assert names(sex="Male") == ["A", "C"]
+        assert names(owner="Other") == ["B"]
+        assert names(created_from="2025-01-01") == ["A", "B"]
+        assert names(created_from="2025-01-01", created_to="2025-02-01") == ["A"]
+        assert names(born_from="2020-01-01", born_to="2020-12-31") == ["A"]
+        assert names(sex="Male", species="Canine", sort="create_date") == ["A"]
+        assert names(created_to="2025-12-31", sort="create_date") == ["C", "A", "B"]
+
+    def test_filters_reject_fuzzy_search(self, client: TestClient) -> None:
+        """Test GET /case/?fuzzy_match=...&sex=...: Fuzzy searches cannot be filtered, and bad values are rejected."""
+        assert client.get(f"{self.base_url}?fuzzy_match=bella&sex=Male").status_code == status.HTTP_400_BAD_REQUEST
+        resp = client.get(f"{self.base_url}?created_from=yesterday")
+        assert resp.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    def test_filters_use_indexes(self, session: Session) -> None:
+        """No combination of filters, sort order and cursor falls back to a full scan of the case or breed table."""
+        statements = []
+        event.listen(session.bind, "before_cursor_execute", lambda *args: statements.append(args[2:4]))
+        for count in range(1, len(FILTER_VALUES) + 1):
+            for names in itertools.combinations(FILTER_VALUES, count):
+                for sort in ("id", "name", "create_date", "birth_date"):
+                    for after in (None, ("2025-01-01", 1)):
+                        query = CaseListQuery(sort=sort, **{name: FILTER_VALUES[name] for name in names})
+                        statements.clear()
+                        Case.get_all(
+                            session,
+                            additional_filters=case_filters(query),
+                            sort_field=getattr(Case, sort),
+                            limit=50,
+                            after=after,
+                        )
+                        statement, parameters = statements[0]
+                        plan = session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                        details = [row[3] for row in plan]
+                        assert not any(detail.startswith(("SCAN case", "SCAN breed")) for detail in details), (
+                            names,
+                            sort,
+                            details,
+                        )
+
+
+class TestCaseBulk:
+    """Test suite for the bulk endpoints of /case."""
+
+    base_url = "/api/case/bulk"
+
+    def test_bulk_create(self, client: TestClient, dog_breed: Breed) -> None:
+        """Test POST /case/bulk: Valid cases are created and each item gets its own result."""
+        payloads = [{**case_payload(dog_breed), "name": f"Bulk{i}"} for i in range(3)]
+        payloads[1]["breed_id"] = 999
+        resp = client.post(self.base_url, json=payloads)
+        assert resp.status_code == status.HTTP_200_OK
+        results = resp.json()
+        assert [r["status"] for r in results] == [201, 422, 201]
+        assert results[1] == {"index": 1, "id": None, "status": 422, "detail": "Breed not found"}
+        assert client.get(f"/api/case/{results[2]['id']}").json()["name"] == "Bulk2"
+        assert (
+            client.post(self.base_url, json=[{"name": "No breed"}]).status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+        )
+
+    def test_bulk_update_and_delete(self, client: TestClient, dog_breed: Breed) -> None:
+        """Test PATCH and DELETE /case/bulk: Only the given fields change, and missing cases are reported."""
+        ids = [r["id"] for r in client.post(self.base_url, json=[case_payload(dog_breed)] * 2).json()]
+        changes = [{"id": ids[0], "name": "Renamed"}, {"id": 999, "name": "X"}, {"id": ids[1], "breed_id": 999}]
+        resp = client.patch(self.base_url, json=changes)
+        assert [r["status"] for r in resp.json()] == [200, 404, 422]
+        updated = client.get(f"/api/case/{ids[0]}").json()
+        assert (updated["name"], updated["owner"]) == ("Renamed", "TestOwner")
+
+        resp = client.request("DELETE", self.base_url, json=[ids[0], 999])
+        assert [(r["id"], r["status"]) for r in resp.json()] == [(ids[0], 204), (999, 404)]
+        assert client.get(f"/api/case/{ids[0]}").status_code == status.HTTP_404_NOT_FOUND
+
+    def test_bulk_update_nulls(self, client: TestClient, dog_breed: Breed) -> None:
+        """Test PATCH /case/bulk: Cases setting a required field to null are rejected alone, the others are updated."""
+        ids = [r["id"] for r in client.post(self.base_url, json=[case_payload(dog_breed)] * 3).json()]
+        changes = [
+            {"id": ids[0], "name": None},
+            {"id": ids[1], "name": "Renamed", "owner": None},
+            {"id": ids[2], "breed_id": None, "sex": None},
+            {"id": 999, "name": None},
+        ]
+        resp = client.patch(self.base_url, json=changes)
+        assert resp.status_code == status.HTTP_200_OK
+        results = resp.json()
+        assert [r["status"] for r in results] == [422, 200, 422, 404]
+        assert results[0]["detail"] == "Cannot be null: name"
+        assert results[2]["detail"] == "Cannot be null: sex, breed_id"
+        assert client.get(f"/api/case/{ids[0]}").json()["name"] == "TestCase"
+        updated = client.get(f"/api/case/{ids[1]}").json()
+        assert (updated["name"], updated["owner"]) == ("Renamed", None)
+
+    def test_bulk_duplicate_ids(self, client: TestClient, dog_breed: Breed) -> None:
+        """Test PATCH and DELETE /case/bulk: Repeats of a case ID in one request are rejected, the first is applied."""
+        ids = [r["id"] for r in client.post(self.base_url, json=[case_payload(dog_breed)] * 2).json()]
+        changes = [{"id": ids[0], "name": "First"}, {"id": ids[0], "name": "Second"}, {"id": ids[1], "owner": "X"}]
+        results = client.patch(self.base_url, json=changes).json()
+        assert [r["status"] for r in results] == [200, 422, 200]
+        assert results[1]["detail"] == "Duplicate case ID"
+        assert client.get(f"/api/case/{ids[0]}").json()["name"] == "First"
+
+        resp = client.request("DELETE", self.base_url, json=[ids[0], ids[0], 999, 999])
+        assert [r["status"] for r in resp.json()] == [204, 422, 404, 422]
+
+    def test_bulk_helpers_chunk(self, session: Session, dog_breed: Breed) -> None:
+        """The bulk helpers and get_by_ids handle batches larger than a chunk, keeping the IDs in record order."""
+        records = [{"name": f"Chunk{i}", "breed_id": dog_breed.id, "sex": Sex.UNKNOWN} for i in range(5)]
+        ids = Case.bulk_create(session, records, chunk_size=2)
+        assert ids == sorted(ids) and len(ids) == 5
+        Case.bulk_update(session, [{"id": id, "owner": f"Owner{id}"} for id in ids], chunk_size=2)
+        assert list(Case.get_by_ids(session, [ids[4], 999, *ids], chunk_size=2)) == [ids[4], *ids[:4]]
+        assert Case.bulk_delete(session, [*ids, 999], chunk_size=2) == set(ids)
+        assert Case.get_all(session) == []
+
+    def test_batch_get(self, client: TestClient, session: Session, dog_breed: Breed) -> None:
+        """Test POST /case/batch: Cases come back in request order, once each, with missing IDs listed, in one query."""
+        ids = [r["id"] for r in client.post(self.base_url, json=[case_payload(dog_breed)] * 3).json()]
+        client.get(f"/api/case/{ids[0]}")  # Load the breed catalog
+        statements = []
+        event.listen(session.bind, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        resp = client.post("/api/case/batch", json=[ids[2], 999, ids[0], ids[2]])
+        assert resp.status_code == status.HTTP_200_OK
+        assert len(statements) == 1, statements
+        data = resp.json()
+        assert [case["id"] for case in data["cases"]] == [ids[2], ids[0]]
+        assert data["missing"] == [999]
+        assert data["cases"][1] == client.get(f"/api/case/{ids[0]}").json()
+        resp = client.post("/api/case/batch", params={"fields": "name", "include": ""}, json=ids[:1])
+        assert resp.json() == {"cases": [{"id": ids[0], "name": "TestCase"}], "missing": []}
+        assert client.post("/api/case/batch", json=[]).json() == {"cases": [], "missing": []}
+        resp = client.post("/api/case/batch", json=list(range(MAX_BULK_ITEMS + 1)))
+        assert resp.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    def test_bulk_updates_search_once(self, client: TestClient, dog_breed: Breed, monkeypatch) -> None:
+        """Each bulk request reaches the commit listeners, and so the search index, as one batch."""
+        batches = []
+        listeners = [*helpers._commit_listeners[Case], lambda changes, versions: batches.append((changes, versions))]
+        monkeypatch.setitem(helpers._commit_listeners, Case, listeners)
+        payloads = [{**case_payload(dog_breed), "name": f"Zebulon{i}"} for i in range(5)]
+        ids = [r["id"] for r in client.post(self.base_url, json=payloads).json()]
+        client.patch(self.base_url, json=[{"id": id, "owner": "Quentin"} for id in ids])
+        client.request("DELETE", self.base_url, json=ids[:3])
+        assert [len(changes) for changes, _ in batches] == [5, 5, 3]
+        assert all(versions is not None and versions.after > versions.before for _, versions in batches)
+        assert batches[1][0][0].data["owner"] == "Quentin"
+        resp = client.get("/api/case?fuzzy_match=zebulon")
+        assert sorted(c["id"] for c in resp.json()) == ids[3:]
+
+
+class TestCaseImport:
+    """Test suite for POST /case/import."""
+
+    base_url = "/api/case/import"
+
+    def test_import(self, client: TestClient) -> None:
+        """Test POST /case/import: A CSV body is imported, with breed names resolved and bad rows reported."""
+        body = "name,breed_name,species\nRex,labrador retriever,\nTom,Persian,Canine\nKit,persian,\n"
+        resp = client.post(self.base_url, content=body, headers={"Content-Type": "text/csv"})
+        assert resp.status_code == status.HTTP_200_OK
+        result = resp.json()
+        assert (result["rows"], result["imported"], result["rejected"]) == (3, 2, 1)
+        assert result["errors"] == [{"row": 2, "detail": "breed_name: Unknown breed 'Persian'"}]
+        names = [(c["name"], c["breed"]["name"]) for c in client.get("/api/case").json()]
+        assert names == [("Rex", "Labrador Retriever"), ("Kit", "Persian")]
+
+    def test_import_jsonl_start_row(self, client: TestClient, dog_breed: Breed) -> None:
+        """Test POST /case/import?format=jsonl&start_row=...: Skipped rows are not imported."""
+        body = "".join(json.dumps({"name": name, "breed_id": dog_breed.id}) + "\n" for name in ("A", "B", "C"))
+        resp = client.post(f"{self.base_url}?format=jsonl&start_row=1", content=body)
+        assert (resp.json()["rows"], resp.json()["imported"]) == (3, 2)
+        assert [c["name"] for c in client.get("/api/case").json()] == ["B", "C"]
+
+    def test_import_spooled_to_disk(self, client: TestClient, dog_breed: Breed, monkeypatch) -> None:
+        """Test POST /case/import: Once the body no longer fits the in-memory spool, it is written in worker threads."""
+        monkeypatch.setattr(case_routes, "IMPORT_SPOOL_SIZE", 64)
+        writes, run_in_threadpool = [], case_routes.run_in_threadpool
+
+        async def spy(func, *args, **kwargs):
+            writes.append(getattr(func, "__name__", None))
+            return await run_in_threadpool(func, *args, **kwargs)
+
+        monkeypatch.setattr(case_routes, "run_in_threadpool", spy)
+        small = json.dumps({"name": "Small", "breed_id": dog_breed.id}) + "\n"
+        assert len(small) <= 64
+        assert client.post(f"{self.base_url}?format=jsonl", content=small).json()["imported"] == 1
+        assert writes == ["import_cases"]
+
+        body = "".join(json.dumps({"name": f"Case{i}", "breed_id": dog_breed.id}) + "\n" for i in range(20))
+        assert client.post(f"{self.base_url}?format=jsonl", content=body).json()["imported"] == 20
+        assert set(writes[1:-1]) == {"write"}
+        assert writes[-1] == "import_cases"
+
+    def test_import_unknown_format(self, client: TestClient) -> None:
+        """Test POST /case/import: A body of unknown format is rejected."""
+        resp = client.post(self.base_url, content="{}", headers={"Content-Type": "application/json"})
+        assert resp.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+
+class TestCaseExport:
+    """Test suite for the GET /case/export endpoint."""
+
+    base_url = "/api/case/export"
+
+    def test_export_empty(self, client: TestClient) -> None:
+        """Test GET /case/export: With no cases, the export is empty."""
+        resp = client.get(self.base_url)
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.text == ""
+
+    def test_export(self, client: TestClient, dog_breed: Breed) -> None:
+        """Test GET /case/export: Streams one JSON object per case, with its breed name, in ID order."""
+        ids = [
+            client.post("/api/case", json={**case_payload(dog_breed), "name": f"Case {i}"}).json()["id"]
+            for i in range(3)
+        ]
+        with client.stream("GET", self.base_url) as resp:
+            assert resp.status_code == status.HTTP_200_OK
+            assert resp.headers["content-type"] == "application/x-ndjson"
+            lines = [json.loads(line) for line in resp.iter_lines()]
+        assert [line["id"] for line in lines] == ids
+        assert lines[0] == {**case_payload(dog_breed), "name": "Case 0", "id": ids[0], "breed_name": dog_breed.name}
+
+    def test_export_parquet(self, client: TestClient, dog_breed: Breed) -> None:
+        """Test GET /case/export?format=parquet: Returns a Parquet file with typed columns and the breed name."""
+        client.post("/api/case", json=case_payload(dog_breed))
+        resp = client.get(f"{self.base_url}?format=parquet")
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.headers["content-disposition"] == 'attachment; filename="cases.parquet"'
+        rows = pq.read_table(io.BytesIO(resp.content)).to_pylist()
+        assert rows == [{**case_payload(dog_breed), "id": 1, "breed_name": dog_breed.name}]
+
 
 #######################################################################################################################
 # End of file
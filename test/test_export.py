@@ -0,0 +1,93 @@
+#######################################################################################################################
+"""
+Test suite for the bulk export service.
+
+This module tests services/export.py:
+- Batched reads of cases and breeds into column buffers
+- Newline-delimited JSON, CSV and Parquet encodings, one chunk per batch
+- The command line entry point
+"""
+# ruff: noqa: PLR2004
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import csv
+import io
+import json
+import sys
+from pathlib import Path
+
+import pyarrow.parquet as pq
+from sqlmodel import Session
+
+from database.core.models import Breed, Case, Sex
+from services import export
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+class TestExport:
+    """Test suite for exports of cases and breeds."""
+
+    def add_cases(self, session: Session, breed: Breed, count: int) -> None:
+        """Create and commit some cases."""
+        for i in range(count):
+            Case(name=f"Case {i}", sex=Sex.FEMALE, breed_id=breed.id).create(session)
+        session.commit()
+
+    def test_read_columns(self, session: Session, dog_breed: Breed) -> None:
+        """Rows are read a batch at a time, one list per column, with enumerations replaced by their values."""
+        self.add_cases(session, dog_breed, 3)
+        query = export.case_export_query()
+        batches = list(export.read_columns(query, batch_size=2))
+        names = [column.name for column in query.selected_columns]
+        assert [len(batch[names.index("id")]) for batch in batches] == [2, 1]
+        assert batches[0][names.index("sex")] == ["Female", "Female"]
+        assert batches[0][names.index("breed_name")] == [dog_breed.name, dog_breed.name]
+
+    def test_ndjson(self, session: Session, dog_breed: Breed) -> None:
+        """Newline-delimited JSON is yielded one batch of lines at a time."""
+        self.add_cases(session, dog_breed, 5)
+        chunks = list(export.export("cases", "ndjson", batch_size=2))
+        assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
+        assert json.loads(chunks[0].splitlines()[0])["name"] == "Case 0"
+
+    def test_csv(self, session: Session, dog_breed: Breed) -> None:
+        """CSV starts with a header line, and empty values are left empty."""
+        self.add_cases(session, dog_breed, 3)
+        rows = list(csv.DictReader(io.StringIO(b"".join(export.export("cases", "csv", batch_size=2)).decode())))
+        assert [row["name"] for row in rows] == ["Case 0", "Case 1", "Case 2"]
+        assert rows[0]["owner"] == ""
+        assert rows[0]["breed_name"] == dog_breed.name
+
+    def test_parquet_row_groups(self, session: Session, dog_breed: Breed) -> None:
+        """Each batch is written, and yielded, as a row group."""
+        self.add_cases(session, dog_breed, 5)
+        chunks = list(export.export("cases", "parquet", batch_size=2))
+        parquet = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+        assert parquet.metadata.num_row_groups == 3
+        assert len(chunks) == 4  # One per row group, then the footer
+        table = parquet.read()
+        assert table.column("id").to_pylist() == [1, 2, 3, 4, 5]
+        assert str(table.schema.field("id").type) == "int64"
+
+    def test_cli(self, session: Session, dog_breed: Breed, tmp_path: Path, monkeypatch) -> None:
+        """The command line entry point writes an export to a file."""
+        self.add_cases(session, dog_breed, 2)
+        path = tmp_path / "breeds.parquet"
+        monkeypatch.setattr(sys, "argv", ["export", "breeds", "--format", "parquet", "--output", str(path)])
+        export.main()
+        assert pq.read_table(path).column("name").to_pylist() == [dog_breed.name]
+
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
@@ -0,0 +1,125 @@
+#######################################################################################################################
+"""
+Test suite for the full-text search service.
+
+This module tests services/fts.py:
+- The case_search table, created from the existing cases when the service starts
+- The case_search table kept in step with case and breed writes by triggers
+- Ranked fuzzy matches, including queries shorter than a trigram
+- Fuzzy searches through the API with the "fts" backend selected
+"""
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlmodel import Session, text
+
+from database.core.models import CASE_SEARCH_TABLE, Breed, Case
+from services.fts import FtsSearchService
+from services.fuzzy import FuzzyHit
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+def ids(hits: list[FuzzyHit]) -> list[int]:
+    """Return the case IDs of a list of fuzzy hits."""
+    return [hit.case_id for hit in hits]
+
+
+@pytest.fixture
+def service(session: Session) -> FtsSearchService:
+    """Return an FTS search service, started on the test database."""
+    service = FtsSearchService()
+    service.create_table()
+    return service
+
+
+class TestFtsSearchService:
+    """Test suite for searches answered by the case_search FTS5 table."""
+
+    def test_table_created_on_start(self, session: Session, dog_breed: Breed) -> None:
+        """The search table only exists once the service starts, and is then filled from the existing cases."""
+        exists = text("SELECT count(*) FROM sqlite_master WHERE name = :name")
+        case = Case(name="Bella", breed_id=dog_breed.id).create(session)
+        assert session.connection().execute(exists, {"name": CASE_SEARCH_TABLE}).scalar() == 0
+        service = FtsSearchService()
+        assert not service.ready
+        assert not service.status().ready
+        assert service.create_table()
+        assert service.ready
+        assert service.fuzzy_match(dog_breed.name.lower(), 90) == [FuzzyHit(case.id, 100.0, "breed")]
+        assert service.status().cases == 1
+        assert not FtsSearchService().create_table()
+
+    def test_writes_are_searchable(self, service: FtsSearchService, session: Session, dog_breed: Breed) -> None:
+        """Created, updated and deleted cases, and renamed breeds, are reflected by the triggers straight away."""
+        case = Case(name="Bella", owner="Alice", breed_id=dog_breed.id).create(session)
+        assert ids(service.fuzzy_match("bella", 60)) == [case.id]
+        assert service.fuzzy_match("alice", 60)[0].field == "owner"
+
+        case.update(session, {"name": "Rex"})
+        assert service.fuzzy_match("bella", 60) == []
+        assert ids(service.fuzzy_match("rex", 60)) == [case.id]
+
+        session.connection().execute(text("UPDATE breed SET name = 'Beagle' WHERE id = :id"), {"id": dog_breed.id})
+        assert service.fuzzy_match("beagle", 60) == [FuzzyHit(case.id, 100.0, "breed")]
+
+        case.delete(session)
+        assert service.fuzzy_match("rex", 60) == []
+        assert service.status().cases == 0
+
+    def test_search_orders_by_score(self, service: FtsSearchService, session: Session, dog_breed: Breed) -> None:
+        """The best matches come first, ties in case ID order, and the page is cut after ranking."""
+        for name in ("Bellamy", "Bella", "Max", "Bella"):
+            Case(name=name, breed_id=dog_breed.id).create(session)
+        assert ids(service.fuzzy_match("bella", 60)) == [2, 4, 1]
+        assert ids(service.fuzzy_match("bella", 60, limit=2, offset=1)) == [4, 1]
+
+    def test_short_query(self, service: FtsSearchService, session: Session, dog_breed: Breed) -> None:
+        """A query shorter than a trigram matches the cases containing it."""
+        Case(name="Max", breed_id=dog_breed.id).create(session)
+        Case(name="Rex", breed_id=dog_breed.id).create(session)
+        assert ids(service.fuzzy_match("ma", 50)) == [1]
+
+    def test_status(self, service: FtsSearchService, session: Session, dog_breed: Breed) -> None:
+        """Once created, the search table is always ready and up to date."""
+        Case(name="Bella", breed_id=dog_breed.id).create(session)
+        index_status = service.status()
+        assert index_status.ready
+        assert index_status.cases == 1
+        assert index_status.lag_seconds == 0
+
+
+class TestFtsBackend:
+    """Test suite for the case API with the fts search backend selected."""
+
+    base_url = "/api/case"
+
+    @pytest.fixture(autouse=True)
+    def fts_backend(self, service: FtsSearchService, monkeypatch) -> None:
+        """Route searches to the FTS5 backend."""
+        monkeypatch.setattr("backend.routes.case.search_service", service)
+
+    def test_fuzzy_search(self, client: TestClient, dog_breed: Breed) -> None:
+        """Fuzzy searches through the API report the best matches with their score and field."""
+        for name in ("Bella", "Bellamy", "Max"):
+            client.post(self.base_url, json={"name": name, "owner": "Bob", "breed_id": dog_breed.id})
+        resp = client.get(f"{self.base_url}?fuzzy_match=bella")
+        assert resp.status_code == status.HTTP_200_OK
+        body = resp.json()
+        assert [c["name"] for c in body] == ["Bella", "Bellamy"]
+        assert body[0]["match"] == {"score": 100.0, "field": "name"}
+
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
@@ -0,0 +1,469 @@
+#######################################################################################################################
+"""
+Test suite for the fuzzy matching service.
+
+This module tests services/fuzzy.py:
+- FuzzyIndex scoring, upserts, removals and compaction
+- ShardedFuzzyIndex parity with the in-process index
+- Index snapshots and warm starts
+- Rebuilds in a worker thread, skipped while the data version shows the index is up to date
+- Incremental index maintenance driven by case writes through the API
+- Invalidation of cached query results
+- Searches scored outside the service lock, and case writes that fail to apply
+"""
+# ruff: noqa: PLR2004
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import asyncio
+import random
+import threading
+import time
+from pathlib import Path
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from rapidfuzz.process import cdist
+from sqlmodel import Session, text
+
+from backend.config import config
+from database.core import helpers
+from database.core.models import Breed, Case, DataVersion
+from services import fuzzy
+from services.fuzzy import (
+    FuzzyHit,
+    FuzzyIndex,
+    FuzzyMatchService,
+    LoadedIndex,
+    ShardedFuzzyIndex,
+    fuzzy_match_service,
+)
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+SNAPSHOT_ENTRIES = [(1, {"name": "bellamy", "owner": "alice"}), (2, {"owner": "bella"}), (3, {"notes": "né"})]
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+def ids(hits: list[FuzzyHit]) -> list[int]:
+    """Return the case IDs of a list of fuzzy hits."""
+    return [hit.case_id for hit in hits]
+
+
+class TestFuzzyIndex:
+    """Test suite for the flattened fuzzy search index."""
+
+    def test_search_orders_by_score(self) -> None:
+        """The best matching case comes first and non-matching cases are not reported."""
+        index = FuzzyIndex(
+            [(1, {"name": "bellamy", "owner": "alice"}), (2, {"owner": "bella"}), (3, {"name": "max", "owner": "bob"})]
+        )
+        hits = index.search("bella", 60)
+        assert [hit.case_id for hit in hits] == [2, 1]
+        assert [hit.field for hit in hits] == ["owner", "name"]
+        assert hits[0].score == 100
+
+    def test_limit(self) -> None:
+        """A limit keeps only the best matches."""
+        index = FuzzyIndex([(1, {"name": "bellamy"}), (2, {"name": "bella"}), (3, {"name": "bell"})])
+        assert ids(index.search("bella", 60, limit=1)) == [2]
+
+    def test_limit_with_ties(self) -> None:
+        """Cases tied on score are ranked by case ID, so every limit gives the head of the same ranking."""
+        index = FuzzyIndex((case_id, {"name": "bella"}) for case_id in random.Random(0).sample(range(2000), 2000))
+        full = index.search("bella", 60)
+        assert ids(full) == list(range(2000))
+        for limit in (1, 50, 100, 1999):
+            assert index.search("bella", 60, limit=limit) == full[:limit]
+
+    def test_upsert_and_remove(self) -> None:
+        """Upserts replace a case's strings and removals drop it."""
+        index = FuzzyIndex([(1, {"name": "bella"}), (2, {"name": "max"})])
+        index.upsert(1, {"name": "rex", "breed": "beagle"})
+        index.upsert(3, {"notes": "bella"})
+        assert ids(index.search("bella", 60)) == [3]
+        index.remove(3)
+        assert index.search("bella", 60) == []
+        assert len(index) == 2
+        assert dict(index.entries()) == {1: {"name": "rex", "breed": "beagle"}, 2: {"name": "max"}}
+
+    def test_ngram_prefilter(self, monkeypatch) -> None:
+        """Once enabled, only cases sharing n-grams with the query are scored, and short queries are fully scanned."""
+        entries = [(i, {"name": f"case{i:03d}"}) for i in range(200)]
+        entries += [(1000, {"name": "bellamy"}), (1001, {"name": "bella"})]
+        index = FuzzyIndex(entries)
+        scored = []
+        monkeypatch.setattr(
+            fuzzy.process, "cdist", lambda q, choices, **kw: scored.append(len(choices)) or cdist(q, choices, **kw)
+        )
+        assert ids(index.search("bella", 60)) == [1001, 1000]
+        assert scored == [len(entries)]
+        monkeypatch.setattr(config, "FUZZY_MIN_GRAM_OVERLAP", 0.2)
+        assert ids(index.search("bella", 60)) == [1001, 1000]
+        assert scored[-1] == 2
+        index.search("be", 60)
+        assert scored[-1] == len(entries)
+
+    def test_breeds_scored_once(self, monkeypatch) -> None:
+        """Each distinct breed name is scored once per query, and its score is shared by every case of that breed."""
+        entries = [(i, {"name": f"case{i:03d}", "breed": "labrador retriever"}) for i in range(100)]
+        entries += [(100, {"name": "labrador", "breed": "beagle"}), (101, {"breed": "labrador"})]
+        index = FuzzyIndex(entries)
+        scored = []
+        monkeypatch.setattr(
+            fuzzy.process, "cdist", lambda q, choices, **kw: scored.append(len(choices)) or cdist(q, choices, **kw)
+        )
+        monkeypatch.setattr(config, "FUZZY_MIN_GRAM_OVERLAP", 0.2)
+        hits = index.search("labrador", 60, exhaustive=True)
+        assert scored == [3, len(entries) - 1]
+        assert ids(hits[:2]) == [100, 101]
+        assert [hit.field for hit in hits[:3]] == ["name", "breed", "breed"]
+        assert len(hits) == len(entries)
+        assert ids(index.search("labrador", 60)) == ids(hits)
+
+    def test_ngram_prefilter_sees_upserts(self, monkeypatch) -> None:
+        """Cases upserted after the index was built are candidates, and removed or replaced ones are not reported."""
+        monkeypatch.setattr(config, "FUZZY_MIN_GRAM_OVERLAP", 0.2)
+        index = FuzzyIndex((i, {"name": f"case{i:03d}"}) for i in range(200))
+        index.upsert(500, {"name": "bella"})
+        index.upsert(5, {"name": "bellamy"})
+        index.upsert(5, {"name": "rex"})
+        assert ids(index.search("bella", 60)) == [500]
+        index.remove(500)
+        assert index.search("bella", 60) == []
+
+    def test_compaction(self, monkeypatch) -> None:
+        """Removed cases are dropped from the flat arrays once enough of them accumulate."""
+        monkeypatch.setattr(fuzzy, "COMPACT_MIN_DEAD", 2)
+        index = FuzzyIndex((i, {"name": f"case{i}"}) for i in range(10))
+        for i in range(4):
+            index.remove(i)
+        assert index._groups < 10
+        assert sorted(case_id for case_id, _ in index.entries()) == list(range(4, 10))
+        assert ids(index.search("case9", 90)) == [9]
+
+
+class TestShardedFuzzyIndex:
+    """Test suite for the fuzzy search index sharded across worker processes."""
+
+    def test_matches_single_index(self) -> None:
+        """Sharded searches, upserts and removals behave like the in-process index."""
+        entries = [(i, {"name": f"case{i:03d}"}) for i in range(100)]
+        entries += [(1000, {"name": "bellamy"}), (1001, {"name": "bella"}), (1002, {"owner": "belle"})]
+        single = FuzzyIndex(entries)
+        sharded = ShardedFuzzyIndex(entries, shards=2)
+        try:
+            assert sharded.search("bella", 60) == single.search("bella", 60)
+            assert sharded.search("bella", 60, limit=2) == single.search("bella", 60, limit=2)
+            sharded.upsert(1003, {"name": "bella"})
+            sharded.remove(1000)
+            assert ids(sharded.search("bella", 60)) == [1001, 1003, 1002]
+            assert len(sharded) == len(entries)
+            assert 1000 not in sharded
+            assert dict(sharded.entries())[1003] == {"name": "bella"}
+            tied = [(i, {"owner": "zed"}) for i in range(2000, 2300)]
+            for case_id, fields in tied:
+                sharded.upsert(case_id, fields)
+            assert ids(sharded.search("zed", 60, limit=50)) == list(range(2000, 2050))
+        finally:
+            sharded.close()
+
+
+class TestSnapshots:
+    """Test suite for saving the index to snapshot files and loading it back."""
+
+    def test_save_and_load(self, tmp_path: Path) -> None:
+        """A loaded snapshot searches like the saved index and can still be updated."""
+        index = FuzzyIndex(SNAPSHOT_ENTRIES)
+        index.remove(3)
+        index.save(tmp_path / "index", "fingerprint")
+        loaded = FuzzyIndex.load(tmp_path / "index", "fingerprint")
+        assert loaded.search("bella", 60) == index.search("bella", 60)
+        assert list(loaded.entries()) == list(index.entries())
+        loaded.upsert(4, {"name": "bella"})
+        loaded.remove(2)
+        assert ids(loaded.search("bella", 60)) == [4, 1]
+
+    def test_invalid_snapshots_are_not_loaded(self, tmp_path: Path) -> None:
+        """Snapshots that are missing, corrupt or built from other database contents are rejected."""
+        FuzzyIndex(SNAPSHOT_ENTRIES).save(tmp_path / "index", "fingerprint")
+        assert FuzzyIndex.load(tmp_path / "index", "other fingerprint") is None
+        assert FuzzyIndex.load(tmp_path / "missing", "fingerprint") is None
+        (tmp_path / "index").write_bytes(b"FZIX garbage")
+        assert FuzzyIndex.load(tmp_path / "index", "fingerprint") is None
+
+    def test_sharded_save_and_load(self, tmp_path: Path) -> None:
+        """Each shard is saved to its own snapshot and loaded back in its worker process."""
+        index = ShardedFuzzyIndex(SNAPSHOT_ENTRIES, shards=2)
+        try:
+            index.save(tmp_path / "index", "fingerprint")
+            expected = index.search("bella", 60)
+        finally:
+            index.close()
+        assert ShardedFuzzyIndex.load(tmp_path / "index", "fingerprint", shards=3) is None
+        loaded = ShardedFuzzyIndex.load(tmp_path / "index", "fingerprint", shards=2)
+        try:
+            assert loaded.search("bella", 60) == expected
+        finally:
+            loaded.close()
+
+    def test_warm_start(self, session: Session, dog_breed: Breed, fuzzy_snapshot_path: Path) -> None:
+        """A new service starts from the snapshot of the last rebuild, unless the database has changed since."""
+        Case(name="Bella", breed_id=dog_breed.id).create(session)
+        asyncio.run(fuzzy_match_service.refresh(force=True))
+        assert fuzzy_snapshot_path.exists()
+
+        service = FuzzyMatchService()
+        assert not service.ready
+        assert service.warm_start()
+        assert service.ready
+        assert len(service.fuzzy_match("bella", 60)) == 1
+
+        Case(name="Bellamy", breed_id=dog_breed.id).create(session)
+        assert not FuzzyMatchService().warm_start()
+
+    def test_other_database_at_same_version(
+        self, session: Session, dog_breed: Breed, fuzzy_snapshot_path: Path
+    ) -> None:
+        """A snapshot is not loaded for another database, or another history, that reached the same data version."""
+        Case(name="Bella", breed_id=dog_breed.id).create(session)
+        asyncio.run(fuzzy_match_service.refresh(force=True))
+        version = DataVersion.current(session.connection())
+        assert FuzzyMatchService().warm_start()
+
+        # A write_id of its own, as a recreated database or a restored backup written to since would have
+        session.exec(text("UPDATE data_version SET write_id = 'other' WHERE id = 1"))
+        session.commit()
+        assert DataVersion.current(session.connection()) == version
+        assert not FuzzyMatchService().warm_start()
+
+
+class TestRebuilds:
+    """Test suite for full rebuilds of the index."""
+
+    async def test_rebuild_runs_off_event_loop(self, session: Session, monkeypatch) -> None:
+        """The database is read in a worker thread, and the new index is published as a new generation."""
+        load, threads = fuzzy_match_service._load, []
+        monkeypatch.setattr(fuzzy_match_service, "_load", lambda: threads.append(threading.get_ident()) or load())
+        generation = fuzzy_match_service.status().generation
+        assert await fuzzy_match_service.refresh(force=True)
+        assert threads and threads[0] != threading.get_ident()
+        assert fuzzy_match_service.status().generation == generation + 1
+        assert fuzzy_match_service.status().rebuild_seconds is not None
+
+    def test_superseded_rebuild_is_discarded(self) -> None:
+        """A rebuild that finishes after the service was closed does not replace the index."""
+        service = FuzzyMatchService()
+
+        def load() -> LoadedIndex:
+            service.close()
+            return LoadedIndex(FuzzyIndex([(1, {"name": "bella"})]), {}, 1)
+
+        assert not service._swap(load)
+        assert not service.ready
+        assert service.status().cases == 0
+
+
+class TestPaging:
+    """Test suite for pages of fuzzy matches."""
+
+    def test_pages_of_tied_matches(self) -> None:
+        """Consecutive pages of cases tied on score follow on from each other without overlapping."""
+        entries = [(case_id, {"name": "bella"}) for case_id in random.Random(0).sample(range(2000), 2000)]
+        service = FuzzyMatchService()
+        service._swap(lambda: LoadedIndex(FuzzyIndex(entries), {}, None))
+        first, second = service.fuzzy_match("bella", 60, 50, 0), service.fuzzy_match("bella", 60, 50, 50)
+        assert not set(ids(first)) & set(ids(second))
+        assert ids(first + second) == list(range(100))
+        assert service.fuzzy_match("bella", 60, 100) == first + second
+
+
+class TestConcurrency:
+    """Test suite for searches running alongside each other and alongside writes."""
+
+    def test_search_does_not_hold_the_service_lock(self) -> None:
+        """A search is scored outside the service lock, and is not cached if the index changed while it was scored."""
+        service = FuzzyMatchService()
+        service._swap(lambda: LoadedIndex(FuzzyIndex([(1, {"name": "bella"})]), {}, None))
+        scoring, release = threading.Event(), threading.Event()
+        search = service._index.search
+
+        def slow_search(query: str, *args) -> list[FuzzyHit]:
+            if query == "bella":
+                scoring.set()
+                release.wait(5)
+            return search(query, *args)
+
+        service._index.search = slow_search
+        thread = threading.Thread(target=service.fuzzy_match, args=("bella", 60))
+        thread.start()
+        assert scoring.wait(5)
+        assert ids(service.fuzzy_match("maximus", 60)) == []  # Another search runs meanwhile
+        service._lock.acquire()  # Writes to the service's state are not blocked by the search either
+        service._changes += 1
+        service._lock.release()
+        release.set()
+        thread.join(5)
+        assert ("bella", 60, None) not in service._cache
+        assert ids(service.fuzzy_match("bella", 60)) == [1]
+        assert ("bella", 60, None) in service._cache
+
+
+class TestChangeDetection:
+    """Test suite for skipping rebuilds when the database has not changed."""
+
+    def test_data_version_counts_writes(self, session: Session, dog_breed: Breed) -> None:
+        """Every write to the case and breed tables bumps the data version, including raw SQL writes."""
+        version = DataVersion.current(session.connection())
+        case = Case(name="Bella", breed_id=dog_breed.id).create(session)
+        case.update(session, {"name": "Rex"})
+        session.connection().execute(text("UPDATE breed SET name = 'Beagle' WHERE id = :id"), {"id": dog_breed.id})
+        case.delete(session)
+        assert DataVersion.current(session.connection()) == version + 4
+
+    def test_own_writes_do_not_trigger_rebuild(self, client: TestClient, dog_breed: Breed) -> None:
+        """Writes made through the API keep the index up to date with the data version, so no rebuild is needed."""
+        fuzzy_match_service.rebuild()
+        assert not fuzzy_match_service.rebuild()
+        client.post("/api/case", json={"name": "Bella", "breed_id": dog_breed.id})
+        assert not fuzzy_match_service.rebuild()
+        assert ids(fuzzy_match_service.fuzzy_match("bella", 60)) != []
+
+    def test_other_writes_trigger_rebuild(self, client: TestClient, session: Session, dog_breed: Breed) -> None:
+        """Writes made behind the service's back, e.g. by another process, are picked up by the next rebuild."""
+        fuzzy_match_service.rebuild()
+        session.connection().execute(
+            text("INSERT INTO \"case\" (name, sex, breed_id) VALUES ('Bella', 'UNKNOWN', :id)"), {"id": dog_breed.id}
+        )
+        assert fuzzy_match_service.fuzzy_match("bella", 60) == []
+        assert fuzzy_match_service.rebuild()
+        assert len(fuzzy_match_service.fuzzy_match("bella", 60)) == 1
+
+    def test_other_writes_lag(self, client: TestClient, session: Session, dog_breed: Breed) -> None:
+        """The lag of writes found by polling is measured from the last poll that found the index up to date."""
+        fuzzy_match_service.rebuild()
+        assert not fuzzy_match_service.rebuild()
+        time.sleep(0.05)
+        session.connection().execute(
+            text("INSERT INTO \"case\" (name, sex, breed_id) VALUES ('Bella', 'UNKNOWN', :id)"), {"id": dog_breed.id}
+        )
+        assert fuzzy_match_service.rebuild()
+        assert fuzzy_match_service.status().lag_seconds >= 0.05
+
+    def test_breed_writes_trigger_rebuild(self, session: Session, dog_breed: Breed) -> None:
+        """A renamed breed is searchable under its new name after the next rebuild, and its old name is forgotten."""
+        Case(name="Bella", breed_id=dog_breed.id).create(session)
+        session.commit()
+        fuzzy_match_service.rebuild()
+        dog_breed.update(session, {"name": "Weimaraner"})
+        session.commit()
+        assert fuzzy_match_service.status().data_version is None
+        assert fuzzy_match_service._breed_names == {}
+        assert fuzzy_match_service.rebuild()
+        assert [hit.field for hit in fuzzy_match_service.fuzzy_match("weimaraner", 90)] == ["breed"]
+
+    def test_other_writes_with_case_writes(self, session: Session, dog_breed: Breed) -> None:
+        """Case writes committed with writes the service was not told about, e.g. in raw SQL, do not hide them."""
+        Case(name="Bella", breed_id=dog_breed.id).create(session)
+        session.commit()
+        fuzzy_match_service.rebuild()
+        Case(name="Rex", breed_id=dog_breed.id).create(session)
+        session.connection().execute(text("UPDATE breed SET name = 'Weimaraner' WHERE id = :id"), {"id": dog_breed.id})
+        session.commit()
+        assert fuzzy_match_service.status().data_version is None
+        assert fuzzy_match_service.rebuild()
+        assert len(fuzzy_match_service.fuzzy_match("weimaraner", 90)) == 2
+
+
+class TestIncrementalUpdates:
+    """Test suite for index maintenance driven by case writes."""
+
+    base_url = "/api/case"
+
+    def search(self, client: TestClient, query: str) -> set[str]:
+        """Return the names of the cases matching a fuzzy query."""
+        resp = client.get(f"{self.base_url}?fuzzy_match={query}")
+        assert resp.status_code == status.HTTP_200_OK
+        return {c["name"] for c in resp.json()}
+
+    def test_writes_are_searchable_without_refresh(self, client: TestClient, dog_breed: Breed) -> None:
+        """Created, updated and deleted cases are reflected in search results immediately."""
+        resp = client.post(self.base_url, json={"name": "Bella", "breed_id": dog_breed.id})
+        assert resp.status_code == status.HTTP_201_CREATED
+        case_id = resp.json()["id"]
+        assert self.search(client, "bella") == {"Bella"}
+        assert self.search(client, dog_breed.name) == {"Bella"}
+
+        client.put(f"{self.base_url}/{case_id}", json={"name": "Rex"})
+        assert self.search(client, "bella") == set()
+        assert self.search(client, "rex") == {"Rex"}
+
+        client.delete(f"{self.base_url}/{case_id}")
+        assert self.search(client, "rex") == set()
+
+    def test_only_affected_results_are_invalidated(self, client: TestClient, dog_breed: Breed) -> None:
+        """A write drops the cached results it affects and keeps the others."""
+        client.post(self.base_url, json={"name": "Bella", "breed_id": dog_breed.id})
+        client.post(self.base_url, json={"name": "Maximus", "breed_id": dog_breed.id})
+        self.search(client, "bella")
+        self.search(client, "maximus")
+
+        client.post(self.base_url, json={"name": "Bellamy", "breed_id": dog_breed.id})
+        cached = {key[0] for key in fuzzy_match_service._cache.keys()}
+        assert cached == {"maximus"}
+        assert self.search(client, "bella") == {"Bella", "Bellamy"}
+
+    def test_large_writes_clear_the_cache(self, client: TestClient, dog_breed: Breed, monkeypatch) -> None:
+        """A write with more new strings than are worth scoring against every cached query clears the cache."""
+        client.post(self.base_url, json={"name": "Maximus", "breed_id": dog_breed.id})
+        self.search(client, "maximus")
+        monkeypatch.setattr(fuzzy, "INVALIDATE_MAX_PAIRS", 1)
+        client.post(self.base_url, json={"name": "Bella", "breed_id": dog_breed.id})
+        assert not fuzzy_match_service._cache
+        assert self.search(client, "maximus") == {"Maximus"}
+
+    def test_failed_writes_mark_the_index_stale(self, client: TestClient, dog_breed: Breed, monkeypatch) -> None:
+        """A committed write that cannot be applied to the index is logged, and the index is rebuilt instead."""
+        fuzzy_match_service.rebuild()
+
+        def fail(*args) -> None:
+            raise RuntimeError("Breed lookup failed")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(fuzzy_match_service, "_breed_name", fail)
+            resp = client.post(self.base_url, json={"name": "Bella", "breed_id": dog_breed.id})
+        assert resp.status_code == status.HTTP_201_CREATED
+        assert fuzzy_match_service.status().data_version is None
+        assert fuzzy_match_service.rebuild()
+        assert self.search(client, "bella") == {"Bella"}
+
+    def test_lag_is_measured_from_commit(self, client: TestClient, dog_breed: Breed, monkeypatch) -> None:
+        """The write lag counts the time between the commit and the index listener, such as other listeners."""
+        committed = []
+
+        def slow_listener(changes, versions) -> None:
+            committed.extend(change.committed_at for change in changes)
+            time.sleep(0.05)
+
+        monkeypatch.setitem(helpers._commit_listeners, Case, [slow_listener, *helpers._commit_listeners[Case]])
+        client.post(self.base_url, json={"name": "Bella", "breed_id": dog_breed.id})
+        assert committed and committed[0] <= time.time()
+        assert fuzzy_match_service.status().lag_seconds >= 0.05
+
+    def test_rolled_back_writes_are_not_applied(self, client: TestClient, session: Session, dog_breed: Breed) -> None:
+        """A write whose transaction is rolled back leaves the index untouched."""
+        with Session(session.bind) as other_session:
+            Case(name="Ghost", breed_id=dog_breed.id).create(other_session)
+            other_session.rollback()
+        assert fuzzy_match_service.fuzzy_match("ghost", 60) == []
+
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
@@ -0,0 +1,130 @@
+#######################################################################################################################
+"""
+Test suite for the case import service.
+
+This module tests services/importer.py:
+- Streaming CSV and newline-delimited JSON rows
+- Resolving free-text breed names against the static breed lists
+- Chunked commits, rejected rows, resuming from a start row and the command line checkpoint file
+"""
+# ruff: noqa: PLR2004
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from sqlmodel import Session, select
+
+from database.core.models import Breed, Case, Species
+from services import importer
+from services.static_data.breeds import ensure_cat_breeds, ensure_dog_breeds
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+def breed_id(session: Session, name: str, species: Species) -> int:
+    """Return the ID of a breed."""
+    return session.exec(select(Breed.id).where(Breed.name == name, Breed.species == species)).one()
+
+
+def jsonl(rows: list[dict]) -> io.BytesIO:
+    """Return an in-memory newline-delimited JSON file of some rows."""
+    return io.BytesIO("".join(json.dumps(row) + "\n" for row in rows).encode())
+
+
+class TestImporter:
+    """Test suite for imports of cases."""
+
+    @pytest.fixture(autouse=True)
+    def static_breeds(self, session: Session) -> None:
+        """Add the static dog and cat breeds."""
+        ensure_dog_breeds(session=session)
+        ensure_cat_breeds(session=session)
+        session.commit()
+
+    def test_read_rows(self) -> None:
+        """CSV rows have None for empty fields, and bad JSON lines are yielded as errors."""
+        rows = list(importer.read_rows(io.BytesIO(b"\xef\xbb\xbfname,owner\nRex,\n"), "csv"))
+        assert rows == [{"name": "Rex", "owner": None}]
+        rows = list(importer.read_rows(io.BytesIO(b'{"name": "Rex"}\n\n[1]\n{bad\n'), "jsonl"))
+        assert rows[0] == {"name": "Rex"}
+        assert [str(row).split(":")[0] for row in rows[1:]] == ["Row is not a JSON object", "Invalid JSON"]
+
+    def test_breed_resolver(self, session: Session) -> None:
+        """Breed names are matched ignoring case and punctuation, and names shared by species need a species."""
+        resolver = importer.BreedResolver(session)
+        shepherd = breed_id(session, "German Shepherd Dog", Species.CANINE)
+        assert resolver.resolve({"breed_name": "german-shepherd  DOG"})["breed_id"] == shepherd
+        unknown = breed_id(session, "Unknown", Species.FELINE)
+        assert resolver.resolve({"breed_name": "unknown", "species": "Feline"})["breed_id"] == unknown
+        for row in ({"breed_name": "unknown"}, {"breed_name": "Labradoodle Deluxe"}, {"breed_id": 99999}, {}):
+            with pytest.raises(ValueError):
+                resolver.resolve(row)
+
+    def test_import_csv(self, session: Session) -> None:
+        """Valid rows are committed a chunk at a time, and invalid rows are counted and reported."""
+        file = io.BytesIO(
+            b"name,owner,sex,breed_name,species,breed_id\n"
+            b"Rex,Alice,Male,Labrador Retriever,,\n"
+            b",Bob,Male,Labrador Retriever,,\n"
+            b"Tom,Carol,Tomcat,Persian,Feline,\n"
+            b"Kit,Dave,Female,Persian,Feline,\n"
+        )
+        chunks = []
+        report = importer.import_cases(file, "csv", chunk_size=3, on_chunk=chunks.append)
+        assert (report.rows, report.imported, report.rejected) == (4, 2, 2)
+        assert [error.row for error in report.errors] == [2, 3]
+        assert "sex" in report.errors[1].detail
+        assert [(chunk.rows, chunk.imported) for chunk in chunks] == [(3, 1), (4, 2)]
+        assert report.rows_per_second > 0
+        cases = Case.get_all(session, sort_field=Case.id)
+        assert [(case.name, case.breed.name) for case in cases] == [("Rex", "Labrador Retriever"), ("Kit", "Persian")]
+
+    def test_import_resumes(self, session: Session, monkeypatch) -> None:
+        """Rows before start_row are skipped, and a failed chunk reports the row to resume from."""
+        rows = [{"name": f"Case {i}", "breed_name": "Beagle"} for i in range(1, 6)]
+        report = importer.import_cases(jsonl(rows), "jsonl", chunk_size=2, start_row=3)
+        assert (report.rows, report.imported) == (5, 2)
+        assert [case.name for case in Case.get_all(session, sort_field=Case.id)] == ["Case 4", "Case 5"]
+
+        bulk_create, calls = Case.bulk_create, []
+
+        def failing_bulk_create(session: Session, records: list[dict]) -> list[int]:
+            calls.append(records)
+            if len(calls) == 3:
+                raise RuntimeError("Disk full")
+            return bulk_create(session, records)
+
+        monkeypatch.setattr(Case, "bulk_create", failing_bulk_create)
+        with pytest.raises(importer.ImportInterruptedError) as error:
+            importer.import_cases(jsonl(rows), "jsonl", chunk_size=2)
+        assert error.value.report.rows == 4
+
+    def test_main(self, session: Session, tmp_path: Path, monkeypatch, capsys) -> None:
+        """The command line resumes after the row in the checkpoint file, and removes the file when done."""
+        path = tmp_path / "cases.jsonl"
+        path.write_bytes(jsonl([{"name": f"Case {i}", "breed_name": "Beagle"} for i in range(1, 4)]).getvalue())
+        checkpoint = tmp_path / "cases.jsonl.checkpoint"
+        checkpoint.write_text(json.dumps({"rows": 1}))
+        monkeypatch.setattr(sys, "argv", ["importer", str(path), "--chunk-size", "1"])
+        importer.main()
+        assert not checkpoint.exists()
+        assert "Resuming after row 1" in capsys.readouterr().out
+        assert [case.name for case in Case.get_all(session, sort_field=Case.id)] == ["Case 2", "Case 3"]
+
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
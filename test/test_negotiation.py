@@ -0,0 +1,109 @@
+#######################################################################################################################
+"""
+Test suite for MessagePack content negotiation.
+
+This module tests backend/negotiation.py through the API:
+- Choosing MessagePack or JSON from the Accept header
+- MessagePack responses encoded from the response models, and from the case list and reference data responses
+- MessagePack request bodies for single and bulk case writes
+- Errors, which stay JSON
+"""
+# ruff: noqa: PLR2004
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+import msgpack
+import pytest
+from fastapi import Request, status
+from fastapi.testclient import TestClient
+
+from backend.negotiation import MSGPACK_MEDIA_TYPE, accepts_msgpack
+from database.core.models import Breed
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+MSGPACK = {"Accept": MSGPACK_MEDIA_TYPE}
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+def packed(content) -> dict:
+    """Return the keyword arguments of a client request sending content as a MessagePack body."""
+    return {"content": msgpack.packb(content), "headers": {**MSGPACK, "Content-Type": MSGPACK_MEDIA_TYPE}}
+
+
+class TestNegotiation:
+    """Test suite for MessagePack requests and responses."""
+
+    @pytest.mark.parametrize(
+        ("accept", "expected"),
+        [
+            ("", False),
+            ("*/*", False),
+            ("application/json", False),
+            ("application/msgpack", True),
+            ("application/x-msgpack, application/json;q=0.9", True),
+            ("application/json, application/msgpack;q=0.5", False),
+            ("application/msgpack;q=0, */*", False),
+            ("application/msgpack;q=bad", False),
+        ],
+    )
+    def test_accepts_msgpack(self, accept: str, expected: bool) -> None:
+        """MessagePack is chosen when the Accept header prefers it to JSON, or likes them equally."""
+        request = Request({"type": "http", "headers": [(b"accept", accept.encode())]})
+        assert accepts_msgpack(request) is expected
+
+    def test_case_round_trip(self, client: TestClient, dog_breed: Breed) -> None:
+        """Cases are created, updated and read with MessagePack bodies, with the same content as JSON."""
+        payload = {"name": "Rex", "owner": "Alice", "breed_id": dog_breed.id, "sex": "Male"}
+        response = client.post("/api/case", **packed(payload))
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+        case = msgpack.unpackb(response.content)
+        assert case["breed"]["name"] == dog_breed.name
+        response = client.put(f"/api/case/{case['id']}", **packed({"owner": "Bob"}))
+        assert msgpack.unpackb(response.content)["owner"] == "Bob"
+        response = client.get(f"/api/case/{case['id']}", headers=MSGPACK)
+        assert msgpack.unpackb(response.content) == client.get(f"/api/case/{case['id']}").json()
+        assert response.headers["vary"] == "Accept"
+
+    def test_bulk_and_list(self, client: TestClient, dog_breed: Breed) -> None:
+        """Bulk payloads are read from MessagePack, and case lists are answered in it in every shape."""
+        cases = [{"name": f"Case {i}", "breed_id": dog_breed.id} for i in range(3)]
+        response = client.post("/api/case/bulk", **packed(cases))
+        assert [result["status"] for result in msgpack.unpackb(response.content)] == [201] * 3
+        for shape in ("full", "compact", "columns"):
+            params = {"shape": shape, "limit": 2}
+            response = client.get("/api/case", params=params, headers=MSGPACK)
+            assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+            assert msgpack.unpackb(response.content) == client.get("/api/case", params=params).json()
+            assert "x-next-cursor" in response.headers
+
+    def test_reference_data(self, client: TestClient) -> None:
+        """Reference data has a MessagePack encoding with its own ETag."""
+        json_response = client.get("/api/breed", params={"species": "Feline"})
+        response = client.get("/api/breed", params={"species": "Feline"}, headers=MSGPACK)
+        assert msgpack.unpackb(response.content) == json_response.json()
+        assert response.headers["etag"] != json_response.headers["etag"]
+        headers = {**MSGPACK, "If-None-Match": response.headers["etag"]}
+        assert client.get("/api/breed", params={"species": "Feline"}, headers=headers).status_code == 304
+        assert msgpack.unpackb(client.get("/api/sex", headers=MSGPACK).content) == client.get("/api/sex").json()
+
+    def test_errors(self, client: TestClient) -> None:
+        """Invalid MessagePack bodies are rejected with 400, and validation errors are JSON."""
+        response = client.post("/api/case", content=b"\xc1", headers={"Content-Type": MSGPACK_MEDIA_TYPE})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = client.post("/api/case", **packed({"owner": "Alice"}))
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+        assert response.json()["detail"][0]["loc"] == ["body", "name"]
+
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
@@ -0,0 +1,60 @@
+#######################################################################################################################
+"""
+Test suite for the search API endpoints.
+
+This module tests the /api/search endpoints:
+- Readiness and freshness reporting of the fuzzy search index
+- Fuzzy searches while the index is not ready
+"""
+
+#######################################################################################################################
+# Imports
+#######################################################################################################################
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from database.core.models import Breed
+from services.fuzzy import fuzzy_match_service
+
+#######################################################################################################################
+# Globals
+#######################################################################################################################
+
+#######################################################################################################################
+# Body
+#######################################################################################################################
+
+
+class TestSearchStatus:
+    """Test suite for the search status endpoint."""
+
+    base_url = "/api/search/status"
+
+    def test_ready(self, client: TestClient, dog_breed: Breed) -> None:
+        """The index is reported ready once it has been built, with the duration of the rebuild and the write lag."""
+        client.post("/api/case", json={"name": "Bella", "breed_id": dog_breed.id})
+        resp = client.get(self.base_url)
+        assert resp.status_code == status.HTTP_200_OK
+        body = resp.json()
+        assert body["ready"] is True
+        assert body["cases"] == 1
+        assert body["generation"] >= 1
+        assert body["rebuilt_at"] is not None
+        assert body["rebuild_seconds"] >= 0
+        assert body["lag_seconds"] >= 0
+
+    def test_not_ready(self, client: TestClient) -> None:
+        """Until an index is loaded, the status and fuzzy searches respond with 503."""
+        fuzzy_match_service.close()
+        resp = client.get(self.base_url)
+        assert resp.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert resp.json()["ready"] is False
+        assert resp.json()["cases"] == 0
+        resp = client.get("/api/case?fuzzy_match=bella")
+        assert resp.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+#######################################################################################################################
+# End of file
+#######################################################################################################################
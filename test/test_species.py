@@ -7,6 +7,7 @@ This module tests the endpoint in backend/routes/species.py:
 
 It covers normal and edge cases, including:
 - Listing all available species
+- Revalidating the cached list with If-None-Match
 """
 
 #######################################################################################################################
@@ -37,6 +38,16 @@ class TestSpeciesAPI:
         assert set(data) == set(expected)
         assert len(data) == len(expected)
 
+    def test_get_species_not_modified(self, client: TestClient) -> None:
+        """Test GET /api/species/ with the ETag of the last response in If-None-Match. Expect 304 and no body."""
+        etag = client.get(f"{self.base_url}").headers["etag"]
+        response = client.get(f"{self.base_url}", headers={"If-None-Match": f'W/{etag}, "other"'})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        response = client.get(f"{self.base_url}", headers={"If-None-Match": '"other"'})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"] == etag
+
 
 #######################################################################################################################
 # End of file